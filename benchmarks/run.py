@@ -0,0 +1,320 @@
+#! /usr/bin/env python
+"""
+Offline benchmarks for planning, ASF search, STAC creation and CLI startup
+
+ASF/CMR searches are answered by a local HTTP stand-in, and the burst map is a local parquet
+copy, so runs are repeatable without network access. By default both are synthetic (see
+synthetic.py), recorded responses and the real burst map can be used with --fixtures. Every
+benchmark starts from an empty fufiters cache. Wall time is the best/median of --repeat
+runs, peak memory comes from one extra run under tracemalloc. Startup benchmarks time
+`python -m fufiters` in fresh interpreters and list heavy modules loaded by the CLI.
+
+Run offline on synthetic fixtures, or record real ones once (requires network) and replay them:
+    python benchmarks/run.py -o benchmarks/results/main.json
+    python benchmarks/run.py --compare benchmarks/results/main.json
+    python benchmarks/run.py --record
+    python benchmarks/run.py --fixtures benchmarks/fixtures
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import asf_search as asf
+
+import stand_in
+import synthetic
+from fufiters import asyncsearch, bursts, burstdb, planning, slcs, stac
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+BURST_ID = '012_023790_IW1'
+POINT = synthetic.POINT
+YEARS = {1: ('2020-01-01', '2021-03-01'), 8: ('2017-01-01', '2025-03-01')}
+# Should only be imported by subcommands that use them
+HEAVY_MODULES = ['asf_search', 'geopandas', 'pandas', 'pyarrow', 'rasterio', 'pystac', 'shapely']
+
+
+def neighbour_bursts(burst_id, n):
+    """n bursts on the same relative orbit closest along track to burst_id"""
+    relorb, number, _ = burstdb.parse_burst_id(burst_id)
+    gf = burstdb.load()
+    gf = gf[gf.relative_orbit_number == relorb]
+    order = (gf.burst_id - number).abs().sort_values(kind='stable').index
+    gf = burstdb.add_burst_names(gf.loc[order[:n]].copy())
+    return gf.sort_values(by=['burst_id', 'subswath_name']).burstID.to_list()
+
+
+@contextlib.contextmanager
+def cold_cache(fixtures):
+    """Empty fufiters cache containing only the local burst map"""
+    tmp = tempfile.mkdtemp(prefix='fufiters-bench-')
+    previous = os.environ.get('FUFITERS_CACHE')
+    os.environ['FUFITERS_CACHE'] = tmp
+    os.makedirs(f'{tmp}/burstdb')
+    os.symlink(fixtures / burstdb.BURST_MAP_FILE, f'{tmp}/burstdb/{burstdb.BURST_MAP_FILE}')
+    burstdb.load.cache_clear()
+    try:
+        yield tmp
+    finally:
+        if previous is None:
+            del os.environ['FUFITERS_CACHE']
+        else:
+            os.environ['FUFITERS_CACHE'] = previous
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def measure(name, fn, fixtures, server, repeat=3, setup=None, **params):
+    """Time fn() repeat times plus one traced run for peak memory, each with a cold cache"""
+    def run(traced=False):
+        with cold_cache(fixtures), contextlib.redirect_stdout(io.StringIO()):
+            args = setup() if setup else ()
+            if traced:
+                tracemalloc.start()
+            start = time.perf_counter()
+            fn(*args)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if traced else None
+            if traced:
+                tracemalloc.stop()
+        return elapsed, peak
+
+    requests = server.requests
+    try:
+        seconds = [run()[0] for _ in range(repeat)]
+    except Exception as e:
+        print(f'{name:<28} {json.dumps(params):<32} failed: {e!r}')
+        return dict(name=name, params=params, error=repr(e))
+    requests = (server.requests - requests) // repeat
+    _, peak = run(traced=True)
+    result = dict(name=name, params=params, runs=repeat,
+                  seconds_min=round(min(seconds), 4),
+                  seconds_median=round(statistics.median(seconds), 4),
+                  peak_mb=round(peak / 1024**2, 2),
+                  requests=requests)
+    print(f"{name:<28} {json.dumps(params):<32} {result['seconds_median']:>9.3f} s "
+          f"{result['peak_mb']:>9.1f} MB {requests:>5} requests")
+    return result
+
+
+def plan(burst_ids, years):
+    """Same steps as scripts/getBurstPairs.py for every year in the window"""
+    start, end = YEARS[years]
+    gfb = planning.get_bursts(burst_ids=burst_ids)
+    gf = planning.find_acquisitions(start=start, end=end, bursts=gfb)
+    first = int(start[:4])
+    for year in range(first, first + years):
+        planning.plan_pairs(gf, year=year, npairs=3)
+
+
+def python_env():
+    """Environment for subprocesses that can import fufiters from this checkout"""
+    return dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get('PYTHONPATH')])))
+
+
+def startup(command, repeat=5):
+    """Wall time of a fresh interpreter running command (a list of python arguments)"""
+    params = dict(command=' '.join(command))
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, *command], env=python_env(), capture_output=True, text=True)
+        seconds.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            print(f"{'startup':<28} {params['command']:<32} failed: {proc.stderr.strip()[-200:]}")
+            return dict(name='startup', params=params, error=proc.stderr.strip()[-200:])
+    result = dict(name='startup', params=params, runs=repeat,
+                  seconds_min=round(min(seconds), 4),
+                  seconds_median=round(statistics.median(seconds), 4))
+    print(f"{'startup':<28} {params['command']:<32} {result['seconds_median']:>9.3f} s")
+    return result
+
+
+def heavy_imports():
+    """HEAVY_MODULES loaded by importing fufiters.cli"""
+    code = f'import sys, fufiters.cli; print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    out = subprocess.run([sys.executable, '-c', code], env=python_env(), capture_output=True, text=True).stdout.strip()
+    loaded = out.split(',') if out else []
+    print(f"{'startup':<28} {'heavy modules in fufiters.cli':<32} {', '.join(loaded) or 'none':>9}")
+    return loaded
+
+
+def startup_benchmarks(repeat):
+    results = [startup(['-c', 'pass'], repeat),
+               startup(['-c', 'import fufiters.cli'], repeat),
+               startup(['-m', 'fufiters', '--help'], repeat)]
+    # Module commands (stac, catalog) import their module before parsing arguments
+    for command in ['find-bursts', 'find-slcs', 'plan-pairs', 'random-pair', 'stac', 'catalog']:
+        results.append(startup(['-m', 'fufiters', command, '--help'], repeat))
+    return results
+
+
+def benchmarks(fixtures, server, repeat, workdir, burst_id=BURST_ID, point=POINT):
+    with cold_cache(fixtures):
+        neighbours = neighbour_bursts(burst_id, 100)
+
+    results = []
+    for nbursts in [1, 10, 100]:
+        for years in YEARS:
+            results.append(measure('plan_pairs', lambda b=neighbours[:nbursts], y=years: plan(b, y),
+                                   fixtures, server, repeat, bursts=nbursts, years=years))
+
+    for years, (start, end) in YEARS.items():
+        results.append(measure('slcs.search_for_slcs',
+                               lambda gfb, s=start, e=end: slcs.search_for_slcs(gfb, s, e),
+                               fixtures, server, repeat,
+                               setup=lambda: (slcs.get_burst_metadata(burst_id),), years=years))
+
+    # Burst metadata and SLC stack for every burst, all requests in flight at once
+    for nbursts in [1, 10]:
+        for years, (start, end) in YEARS.items():
+            results.append(measure('asyncsearch.inventory',
+                                   lambda b=neighbours[:nbursts], s=start, e=end: asyncsearch.inventory(b, s, e),
+                                   fixtures, server, repeat, bursts=nbursts, years=years))
+
+    results.append(measure('bursts.find_bursts', lambda: bursts.find_bursts(*point),
+                           fixtures, server, repeat, point=point))
+    results.append(measure('bursts.find_bursts_local', lambda: bursts.find_bursts_local(*point),
+                           fixtures, server, repeat, point=point))
+
+    job = synthetic.make_job_folder(f'{workdir}/job', burst_id)
+
+    def hyp32stac():
+        cwd = os.getcwd()
+        os.chdir(job)
+        try:
+            stac.hyp32stac()
+        finally:
+            os.chdir(cwd)
+
+    results.append(measure('hyp3isce2stac', hyp32stac, fixtures, server, repeat, products=1))
+
+    folders = synthetic.make_store(f'{workdir}/store', burst_id, nproducts=20)
+    products = [(folder, burst_id) for folder in folders]
+    results.append(measure('stac.bulk', lambda: stac.bulk(products, tempfile.mkdtemp(dir=workdir), workers=8),
+                           fixtures, server, repeat, products=len(products), workers=8))
+    return results
+
+
+def record(fixtures):
+    """Copy the burst map into fixtures (network access needed for searches in record mode)"""
+    path = fixtures / burstdb.BURST_MAP_FILE
+    if not path.exists():
+        burstdb.build(path=path)
+
+
+def synthetic_fixtures(fixtures):
+    """Write the synthetic burst map into fixtures, CMR responses are generated by the stand-in"""
+    os.makedirs(fixtures, exist_ok=True)
+    synthetic.burst_map().to_parquet(fixtures / burstdb.BURST_MAP_FILE, row_group_size=burstdb.ROW_GROUP_SIZE)
+    return fixtures
+
+
+def compare(results, baseline, threshold, fixtures='synthetic'):
+    """Print median time and peak memory ratios to a baseline, returns number of regressions"""
+    with open(baseline) as f:
+        data = json.load(f)
+    if data.get('fixtures', fixtures) != fixtures:
+        print(f"WARNING: baseline ran on {data['fixtures']} fixtures, this run on {fixtures}")
+    base = {(r['name'], json.dumps(r['params'])): r for r in data['results']}
+    regressions = 0
+    print(f"\n{'benchmark':<28} {'params':<32} {'time':>7} {'memory':>7}")
+    for r in results:
+        b = base.get((r['name'], json.dumps(r['params'])))
+        if b is None or 'error' in r or 'error' in b:
+            continue
+        time_ratio = r['seconds_median'] / max(b['seconds_median'], 1e-9)
+        # Startup benchmarks run in a subprocess without memory tracing
+        mem_ratio = r['peak_mb'] / max(b['peak_mb'], 1e-9) if 'peak_mb' in r else 0
+        flag = ' <-- regression' if max(time_ratio, mem_ratio) > threshold else ''
+        regressions += bool(flag)
+        memory = f'{mem_ratio:>6.2f}x' if mem_ratio else f"{'-':>7}"
+        print(f"{r['name']:<28} {json.dumps(r['params']):<32} {time_ratio:>6.2f}x {memory}{flag}")
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for fufiters planning, search and STAC")
+    parser.add_argument("-f", "--fixtures", type=Path, default=None,
+                        help=f"Recorded responses and burst map (default synthetic, {FIXTURES} with --record)")
+    parser.add_argument("-b", "--burst", default=BURST_ID, help="Burst to plan around (recordings are per burst)")
+    parser.add_argument("-p", "--point", nargs=2, type=float, default=POINT, metavar=('LON', 'LAT'),
+                        help="Point for burst ID searches")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument("-o", "--output", default=None, help="Results JSON (default benchmarks/results/{git}.json)")
+    parser.add_argument("--record", default=False, action="store_true",
+                        help="Forward unrecorded requests to CMR and save them (needs network)")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Ratio to baseline flagged as regression")
+    parser.add_argument("--startup-only", default=False, action="store_true",
+                        help="Only run CLI startup benchmarks (no fixtures needed)")
+    args = parser.parse_args()
+
+    results = startup_benchmarks(max(args.repeat, 5))
+    heavy = heavy_imports()
+
+    if args.record:
+        args.fixtures = args.fixtures or FIXTURES
+        record(args.fixtures)
+        args.repeat = 1
+    if args.fixtures and not (args.fixtures / burstdb.BURST_MAP_FILE).exists():
+        sys.exit(f'No burst map in {args.fixtures}, run with --record first')
+
+    if not args.startup_only:
+        # Failed searches would otherwise be reported to ASF
+        asf.REPORT_ERRORS = False
+        with tempfile.TemporaryDirectory() as workdir:
+            if args.fixtures:
+                server = stand_in.StandIn(args.fixtures / 'cmr', record=args.record)
+                fixtures = args.fixtures
+            else:
+                server = stand_in.StandIn(respond=synthetic.cmr_response)
+                fixtures = synthetic_fixtures(Path(workdir) / 'fixtures')
+            with server, stand_in.redirect(server.url):
+                results += benchmarks(fixtures, server, args.repeat, workdir, args.burst, tuple(args.point))
+            if server.misses:
+                print(f'WARNING: {server.misses} requests had no recorded response, run with --record')
+
+    revision = git_revision()
+    output = args.output or ROOT / 'benchmarks' / 'results' / f'{revision or "results"}.json'
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(dict(git=revision, created=time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                       python=platform.python_version(), machine=platform.machine(),
+                       asf_search=asf.__version__, fixtures=str(args.fixtures or 'synthetic'),
+                       heavy_imports=heavy, results=results), f, indent=2)
+    print('Results saved to', output)
+
+    if heavy:
+        print('WARNING: fufiters.cli imports', ', '.join(heavy), 'at startup')
+    failed = [r['name'] for r in results if 'error' in r]
+    if failed:
+        print('ERROR: failed benchmarks:', ', '.join(dict.fromkeys(failed)))
+    regressions = compare(results, args.compare, args.threshold, str(args.fixtures or 'synthetic')) if args.compare else 0
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Local HTTP stand-in for NASA CMR, serving recorded search responses
+
+asf_search always queries https://cmr.earthdata.nasa.gov, so redirect() reroutes requests
+for that host to the stand-in. Responses are stored one JSON file per request, keyed by
+method, path, body and CMR-Search-After (paging) header. In record mode requests that have
+no recording are forwarded to the real host and saved. Without recordings, a respond function
+(e.g. synthetic.cmr_response) can generate responses instead.
+
+Example:
+    with StandIn('benchmarks/fixtures/cmr') as server, redirect(server.url):
+        results = asf.search(...)
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from aiohttp import ClientSession
+from requests.adapters import HTTPAdapter
+
+CMR_HOSTS = ('cmr.earthdata.nasa.gov',)
+# Response headers asf_search reads
+KEEP_HEADERS = ('Content-Type', 'CMR-Hits', 'CMR-Search-After')
+HOST_HEADER = 'X-Stand-In-Host'
+
+
+def request_key(method, path, body, search_after=None):
+    """Recording file name for a request"""
+    digest = hashlib.sha1()
+    for part in [method, path, body, search_after or '']:
+        digest.update(part if isinstance(part, bytes) else part.encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def _respond(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length) if length else b''
+        search_after = self.headers.get('CMR-Search-After')
+        key = request_key(self.command, self.path, body, search_after)
+        path = os.path.join(self.server.directory, f'{key}.json') if self.server.directory else None
+
+        if path and os.path.exists(path):
+            with open(path) as f:
+                recording = json.load(f)
+        elif self.server.record:
+            recording = self._forward(body)
+            tmp = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(recording, f)
+            os.replace(tmp, path)
+        elif self.server.respond:
+            recording = self.server.respond(self.command, self.path, body, search_after)
+        else:
+            self.server.misses += 1
+            recording = dict(status=404, headers={'Content-Type': 'application/json'},
+                             body=json.dumps({'errors': [f'No recorded response for {self.path}']}))
+        self.server.requests += 1
+
+        data = recording['body'].encode()
+        self.send_response(recording['status'])
+        for name, value in recording['headers'].items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _forward(self, body):
+        host = self.headers.get(HOST_HEADER, CMR_HOSTS[0])
+        headers = {name: value for name, value in self.headers.items()
+                   if name.lower() not in ('host', 'content-length', HOST_HEADER.lower())}
+        request = urllib.request.Request(f'https://{host}{self.path}', data=body or None,
+                                         headers=headers, method=self.command)
+        try:
+            with urllib.request.urlopen(request, timeout=120) as response:
+                status, response_headers, data = response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            status, response_headers, data = e.code, e.headers, e.read()
+        return dict(status=status,
+                    headers={name: response_headers[name] for name in KEEP_HEADERS if name in response_headers},
+                    body=data.decode())
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandIn:
+    """Threaded local server for recordings in directory (record=True forwards and saves misses)
+
+    respond(method, path, body, search_after) returns a recording for requests without one.
+    """
+
+    def __init__(self, directory=None, record=False, respond=None):
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.directory = directory
+        self.server.record = record
+        self.server.respond = respond
+        self.server.requests = 0
+        self.server.misses = 0
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    @property
+    def misses(self):
+        return self.server.misses
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@contextlib.contextmanager
+def redirect(url, hosts=CMR_HOSTS):
+    """Send requests (requests and aiohttp libraries) for hosts to url instead"""
+    send = HTTPAdapter.send
+    request = ClientSession._request
+
+    def _send(self, prepared, **kwargs):
+        parts = urllib.parse.urlsplit(prepared.url)
+        if parts.hostname in hosts:
+            prepared.headers[HOST_HEADER] = parts.netloc
+            prepared.url = urllib.parse.urlunsplit(urllib.parse.urlsplit(url)[:2] + parts[2:])
+        return send(self, prepared, **kwargs)
+
+    def _request(self, method, str_or_url, **kwargs):
+        parts = urllib.parse.urlsplit(str(str_or_url))
+        if parts.hostname in hosts:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), HOST_HEADER: parts.netloc}
+            str_or_url = urllib.parse.urlunsplit(urllib.parse.urlsplit(url)[:2] + parts[2:])
+        return request(self, method, str_or_url, **kwargs)
+
+    HTTPAdapter.send = _send
+    ClientSession._request = _request
+    try:
+        yield
+    finally:
+        HTTPAdapter.send = send
+        ClientSession._request = request
@@ -0,0 +1,297 @@
+"""
+Synthetic inputs for benchmarks and tests: hyp3-isce2 product folders with small COGs, a
+burst map and CMR search responses
+
+cmr_response() answers the asf_search queries fufiters sends (SLC stacks on a relative
+orbit, burst metadata by name and burst map searches at a point) from burst_map() and a
+regular acquisition calendar, so benchmarks can run without recorded fixtures.
+
+Example:
+    burst_map().to_parquet('burst_map_IW_sorted.parquet')
+    with StandIn(respond=cmr_response) as server, redirect(server.url):
+        results = asf.search(...)
+"""
+import functools
+import json
+import os
+import urllib.parse
+import zlib
+
+import numpy as np
+import pandas as pd
+import rasterio
+from rasterio.transform import from_origin
+
+SUFFIXES = ['_conncomp', '_corr', '_dem', '_lv_phi', '_lv_theta', '_unw_phase', '_wrapped_phase',
+            '_azi_off', '_rng_off']
+MANIFEST = '''<?xml version="1.0" encoding="UTF-8"?>
+<xfdu:XFDU xmlns:xfdu="urn:ccsds:schema:xfdu:1" xmlns:safe="http://www.esa.int/safe/sentinel-1.0">
+  <metadataSection><metadataObject><metadataWrap><xmlData><safe:orbitReference>
+    <safe:relativeOrbitNumber type="start">{relorb}</safe:relativeOrbitNumber>
+    <safe:relativeOrbitNumber type="stop">{relorb}</safe:relativeOrbitNumber>
+  </safe:orbitReference></xmlData></metadataWrap></metadataObject></metadataSection>
+</xfdu:XFDU>
+'''
+# Step loggers in the order topsApp runs them, with minutes spent
+LOG_STEPS = [('runPreprocessor', 1), ('runTopo', 4), ('runGeo2rdr', 2), ('runFineResamp', 2),
+             ('runESD', 1), ('runFilter', 1), ('runUnwrap', 5), ('runGeocode', 2)]
+
+
+def make_product(folder, burst_id, reference, secondary, size=256, seed=0):
+    """Write a product folder like S1_023790_IW1_20230621_20230703_VV_INT80 with small COGs"""
+    name = os.path.basename(folder)
+    os.makedirs(folder, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    for suffix in SUFFIXES:
+        dtype = 'uint8' if suffix == '_conncomp' else 'float32'
+        data = (rng.random((size, size)) * 10).astype(dtype)
+        profile = dict(driver='COG', height=size, width=size, count=1, dtype=dtype, crs='EPSG:32645',
+                       transform=from_origin(400000, 3100000, 80, 80), nodata=0, blocksize=256,
+                       overview_resampling='average')
+        with rasterio.open(f'{folder}/{name}{suffix}.tif', 'w', **profile) as dst:
+            dst.write(data, 1)
+
+    with open(f'{folder}/{name}.txt', 'w') as f:
+        f.write(f'Reference Granule: S1_{burst_id[4:]}_{reference}_VV_7C85-BURST\n'
+                f'Secondary Granule: S1_{burst_id[4:]}_{secondary}_VV_5D11-BURST\n'
+                f'Reference Pass Direction: ASCENDING\n'
+                f'Baseline: {rng.normal() * 50:.2f}\n'
+                f'DEM source: GLO-30\n')
+    return folder
+
+
+def make_log(path, start='2024-02-14 18:00:00'):
+    """Write an isce.log with one line per processing step"""
+    time = pd.Timestamp(start)
+    with open(path, 'w') as f:
+        for step, minutes in LOG_STEPS:
+            f.write(f'{time:%Y-%m-%d %H:%M:%S},000 - isce.topsinsar.{step} - INFO - {step}\n')
+            time += pd.Timedelta(minutes=minutes)
+        f.write(f'{time:%Y-%m-%d %H:%M:%S},000 - isce.topsinsar.runGeocode - INFO - done\n')
+
+
+def make_job_folder(root, burst_id='012_023790_IW1', size=256):
+    """Current directory of a processing job: product folder, SAFE manifest and isce.log"""
+    product = f'S1_{burst_id[4:]}_20230621_20230703_VV_INT80_6983'
+    make_product(f'{root}/{product}', burst_id, '20230621T121402', '20230703T121403', size)
+    safe = f'{root}/S1A_IW_SLC__1SDV_20230621T121402_20230621T121429_049063_05E65B_1C27.SAFE'
+    os.makedirs(safe, exist_ok=True)
+    with open(f'{safe}/manifest.safe', 'w') as f:
+        f.write(MANIFEST.format(relorb=int(burst_id[:3])))
+    make_log(f'{root}/isce.log')
+    return root
+
+
+def make_store(root, burst_id='012_023790_IW1', nproducts=20, size=256):
+    """Product store layout {root}/insar/{burstId}/{YYYYMMDD_YYYYMMDD}/{product} with 12-day pairs"""
+    dates = pd.date_range('2019-01-01', periods=nproducts + 1, freq='12D')
+    folders = []
+    for i, (ref, sec) in enumerate(zip(dates[:-1], dates[1:])):
+        product = f'S1_{burst_id[4:]}_{ref:%Y%m%d}_{sec:%Y%m%d}_VV_INT80'
+        folder = f'{root}/insar/{burst_id}/{ref:%Y%m%d}_{sec:%Y%m%d}/{product}'
+        make_product(folder, burst_id, f'{ref:%Y%m%d}T121402', f'{sec:%Y%m%d}T121403', size, seed=i)
+        make_log(f'{folder}/isce.log')
+        folders.append(folder)
+    return folders
+
+
+# Relative orbits crossing POINT: pass direction and the ESA burst_id of the IW1 burst over it
+POINT = (86.925, 27.988)
+ORBITS = {12: ('ASCENDING', 23790), 121: ('DESCENDING', 259876)}
+BURSTS_PER_ORBIT = 301
+BURST_STEP = 0.185
+SWATH_STEP = 0.8
+# SLC frames cover 14 bursts and overlap by one, so every burst lies within a frame
+FRAME_BURSTS = 14
+BURST_MAP_COLLECTION = 'C2450786986-ASF'
+# First acquisition, repeat cycle and (for S1B) end of each platform on every orbit
+PLATFORMS = {'S1A': ('2014-10-03', 12, '2026-01-01'), 'S1B': ('2016-10-10', 12, '2021-12-23')}
+ORBIT_TIMES = {'ASCENDING': '00:11:04', 'DESCENDING': '12:14:40'}
+
+
+def burst_map(point=POINT, orbits=ORBITS, nbursts=BURSTS_PER_ORBIT):
+    """Burst map in the burstdb layout: nbursts x 3 subswaths per relative orbit, sorted, with bbox columns"""
+    import geopandas as gpd
+    import shapely
+    from fufiters import burstdb
+
+    lon, lat = point
+    rows = []
+    for relorb, (orbit_pass, center) in sorted(orbits.items()):
+        # Ascending orbits move north, descending orbits move south and look the other way
+        sign = 1 if orbit_pass == 'ASCENDING' else -1
+        for offset in range(-(nbursts // 2), nbursts // 2 + 1):
+            y = lat + sign * offset * BURST_STEP
+            for i, subswath in enumerate(['IW1', 'IW2', 'IW3']):
+                x = lon + sign * i * SWATH_STEP
+                rows.append(dict(burst_id=center + offset, subswath_name=subswath, relative_orbit_number=relorb,
+                                 orbit_pass=orbit_pass, geometry=shapely.box(x - 0.45, y - 0.1, x + 0.5, y + 0.1)))
+    gf = gpd.GeoDataFrame(rows, crs=4326)
+    gf[burstdb.BBOX_COLUMNS] = shapely.bounds(gf.geometry.values)
+    return gf
+
+
+def acquisition_dates(start=None, end=None):
+    """(platform, date) of every acquisition on an orbit between start and end"""
+    dates = []
+    for platform, (first, cycle, last) in PLATFORMS.items():
+        for date in pd.date_range(first, last, freq=f'{cycle}D'):
+            if (start is None or date >= start - pd.Timedelta(days=1)) and (end is None or date <= end):
+                dates.append((platform, date))
+    return dates
+
+
+def slc_frames(gfb):
+    """Frame footprints (index, shapely box) along the track of one relative orbit's bursts"""
+    import shapely
+
+    ids = np.sort(gfb.burst_id.unique())
+    frames = []
+    for j, first in enumerate(range(0, len(ids), FRAME_BURSTS - 1)):
+        rows = gfb[gfb.burst_id.isin(ids[first:first + FRAME_BURSTS])]
+        frames.append((j, shapely.box(*shapely.total_bounds(rows.geometry.values))))
+    return frames
+
+
+def _umm_polygon(geometry):
+    import shapely
+
+    points = [dict(Longitude=x, Latitude=y) for x, y in shapely.get_coordinates(geometry.exterior)]
+    return {'HorizontalSpatialDomain': {'Geometry': {'GPolygons': [{'Boundary': {'Points': points}}]}}}
+
+
+def _attributes(**values):
+    return [dict(Name=name, Values=[str(value)]) for name, value in values.items()]
+
+
+def slc_item(platform, relorb, orbit_pass, frame, geometry, date):
+    """UMM-G item for a synthetic IW SLC frame"""
+    start = pd.Timestamp(f'{date:%Y-%m-%d} {ORBIT_TIMES[orbit_pass]}') + pd.Timedelta(seconds=25 * frame)
+    stop = start + pd.Timedelta(seconds=27)
+    cycle = (date - pd.Timestamp(PLATFORMS[platform][0])).days // 12
+    absorb = 175 * cycle + (relorb + 101) % 175 + 1
+    name = (f'{platform}_IW_SLC__1SDV_{start:%Y%m%dT%H%M%S}_{stop:%Y%m%dT%H%M%S}_{absorb:06d}_'
+            f'{(absorb * 31) % 0xFFFFFF:06X}_{zlib.crc32(str(start).encode()) & 0xFFFF:04X}')
+    center = geometry.centroid
+    return {
+        'meta': {'concept-type': 'granule', 'concept-id': f'G{zlib.crc32(name.encode()):010d}-ASF',
+                 'native-id': f'{name}-SLC', 'provider-id': 'ASF'},
+        'umm': {
+            'GranuleUR': f'{name}-SLC',
+            'CollectionReference': {'ShortName': f'SENTINEL-1{platform[-1]}_SLC', 'Version': '1'},
+            'TemporalExtent': {'RangeDateTime': {'BeginningDateTime': f'{start:%Y-%m-%dT%H:%M:%S.000Z}',
+                                                 'EndingDateTime': f'{stop:%Y-%m-%dT%H:%M:%S.000Z}'}},
+            'SpatialExtent': _umm_polygon(geometry),
+            'DataGranule': {'Identifiers': [{'IdentifierType': 'ProducerGranuleId', 'Identifier': name}]},
+            'AdditionalAttributes': _attributes(
+                ASCENDING_DESCENDING=orbit_pass, PATH_NUMBER=relorb, FRAME_NUMBER=frame, PROCESSING_TYPE='SLC',
+                BEAM_MODE='IW', BEAM_MODE_TYPE='IW', POLARIZATION='VV+VH', ASF_PLATFORM=f'Sentinel-1{platform[-1]}',
+                CENTER_LAT=round(center.y, 4), CENTER_LON=round(center.x, 4), GROUP_ID=f'{platform}_{start:%Y%m%dT%H%M%S}'),
+            'Platforms': [{'ShortName': f'SENTINEL-1{platform[-1]}'}],
+            'RelatedUrls': [{'Type': 'GET DATA', 'URL': f'https://datapool.asf.alaska.edu/SLC/S{platform[-1]}/{name}.zip'}],
+        },
+    }
+
+
+def burst_item(burst):
+    """UMM-G item for a burst map granule (S1_{burstID}-BURSTMAP)"""
+    name = f'S1_{burst.burstID}-BURSTMAP'
+    center = burst.geometry.centroid
+    return {
+        'meta': {'concept-type': 'granule', 'concept-id': f'G{zlib.crc32(name.encode()):010d}-ASF',
+                 'native-id': name, 'provider-id': 'ASF'},
+        'umm': {
+            'GranuleUR': name,
+            'TemporalExtent': {'RangeDateTime': {'BeginningDateTime': '2014-04-03T00:00:00.000Z',
+                                                 'EndingDateTime': '2014-04-03T00:00:00.000Z'}},
+            'SpatialExtent': _umm_polygon(burst.geometry),
+            'DataGranule': {'Identifiers': [{'IdentifierType': 'ProducerGranuleId', 'Identifier': name}]},
+            'AdditionalAttributes': _attributes(
+                ASCENDING_DESCENDING=burst.orbit_pass, PATH_NUMBER=burst.relative_orbit_number,
+                BEAM_MODE='IW', POLARIZATION='VV', CENTER_LAT=round(center.y, 4), CENTER_LON=round(center.x, 4)),
+            'Platforms': [{'ShortName': 'SENTINEL-1'}],
+        },
+    }
+
+
+def _search_geometry(params):
+    """CMR spatial parameter as a shapely geometry (None if the query has none)"""
+    import shapely
+
+    if 'point' in params:
+        return shapely.Point(*map(float, params['point'][0].split(',')))
+    if 'bounding_box' in params:
+        return shapely.box(*map(float, params['bounding_box'][0].split(',')))
+    if 'polygon' in params:
+        return shapely.Polygon(np.reshape(list(map(float, params['polygon'][0].split(','))), (-1, 2)))
+    if 'line' in params:
+        return shapely.LineString(np.reshape(list(map(float, params['line'][0].split(','))), (-1, 2)))
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_burst_map():
+    from fufiters import burstdb
+
+    return burstdb.add_burst_names(burst_map())
+
+
+@functools.lru_cache(maxsize=64)
+def _search_items(query):
+    return search_items({name: list(values) for name, values in query})
+
+
+def search_items(params):
+    """UMM-G items matching CMR query parameters ({name: [values]}), newest first"""
+    gf = _cached_burst_map()
+    geometry = _search_geometry(params)
+    if 'readable_granule_name[]' in params:
+        names = {name.removeprefix('S1_').removesuffix('-BURSTMAP') for name in params['readable_granule_name[]']}
+        return [burst_item(burst) for burst in gf[gf.burstID.isin(names)].itertuples()]
+    if BURST_MAP_COLLECTION in params.get('echo_collection_id[]', []):
+        bursts = gf if geometry is None else gf[gf.intersects(geometry)]
+        return [burst_item(burst) for burst in bursts.itertuples()]
+
+    attributes = dict(value.split(',')[1:] for value in params.get('attribute[]', []))
+    relorbs = [int(attributes['PATH_NUMBER'])] if 'PATH_NUMBER' in attributes else sorted(ORBITS)
+    start, end = (params.get('temporal', [',,'])[0].split(',') + ['', ''])[:2]
+    dates = acquisition_dates(pd.Timestamp(start).tz_localize(None) if start else None,
+                              pd.Timestamp(end).tz_localize(None) if end else None)
+    items = []
+    for relorb in relorbs:
+        if relorb not in ORBITS:
+            continue
+        orbit_pass = ORBITS[relorb][0]
+        frames = [(j, frame) for j, frame in slc_frames(gf[gf.relative_orbit_number == relorb])
+                  if geometry is None or frame.intersects(geometry)]
+        for platform, date in dates:
+            items.extend(slc_item(platform, relorb, orbit_pass, j, frame, date) for j, frame in frames)
+    if start or end:
+        items = [item for item in items
+                 if (not start or item['umm']['TemporalExtent']['RangeDateTime']['EndingDateTime'] >= start[:19])
+                 and (not end or item['umm']['TemporalExtent']['RangeDateTime']['BeginningDateTime'] <= end[:19])]
+    items.sort(key=lambda item: item['umm']['GranuleUR'])
+    items.sort(key=lambda item: item['umm']['TemporalExtent']['RangeDateTime']['EndingDateTime'], reverse=True)
+    return items
+
+
+def cmr_response(method, path, body, search_after=None):
+    """Recorded-response dict (status, headers, body) for a CMR granule search, paged with CMR-Search-After"""
+    query = urllib.parse.urlsplit(path).query
+    data = body.decode() if isinstance(body, bytes) else body
+    params = {}
+    for name, value in urllib.parse.parse_qsl('&'.join(filter(None, [query, data]))):
+        params.setdefault(name, []).append(value)
+    if not urllib.parse.urlsplit(path).path.startswith('/search/granules'):
+        return dict(status=404, headers={'Content-Type': 'application/json'},
+                    body=json.dumps({'errors': [f'Not a granule search: {path}']}))
+
+    # Pages of one search share the generated items
+    items = _search_items(tuple(sorted((name, tuple(values)) for name, values in params.items())))
+    offset = int(search_after or 0)
+    size = int(params.get('page_size', [10])[0])
+    page = items[offset:offset + size]
+    headers = {'Content-Type': 'application/json', 'CMR-Hits': str(len(items))}
+    if offset + size < len(items):
+        headers['CMR-Search-After'] = str(offset + size)
+    return dict(status=200, headers=headers, body=json.dumps(dict(hits=len(items), took=1, items=page)))
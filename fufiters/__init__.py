@@ -0,0 +1,4 @@
+"""
+fufiters: planning and cataloging tools for Sentinel-1 burst InSAR and pixel-offset workflows
+"""
+__version__ = "0.1.0"
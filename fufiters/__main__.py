@@ -0,0 +1,3 @@
+from fufiters.cli import main
+
+main()
@@ -0,0 +1,169 @@
+"""
+Jobs that choose work for GitHub Actions workflows
+
+plan_pairs() searches ASF and builds the matrix of burst pairs for the timeseries
+workflows (plus a DEM tile and orbit prefetch manifest), forward_pairs() only the pairs
+completed by acquisitions since the last run, random_pair() picks one pair for the
+nightly test. Results are written as KEY=value lines to the GITHUB_OUTPUT file (or
+printed when there is none).
+
+Example:
+    outputs = actions.plan_pairs(['012_023790_IW1'], polarization='VV', year=2020, npairs=3)
+    actions.write_outputs(outputs, os.environ.get('GITHUB_OUTPUT'))
+"""
+import os
+
+
+def write_outputs(outputs, path=None):
+    """Append KEY=value lines for a workflow step output file"""
+    lines = [f'{key}={value}' for key, value in outputs.items()]
+    if path is None:
+        print('\n'.join(lines))
+        return
+    with open(path, 'a') as f:
+        for line in lines:
+            print(line, file=f)
+
+
+def plan_pairs(burst_ids=None, aoi=None, polarization='VV', year=None, npairs=3, offsets_dt=None,
+               looks=None, inventory=None, force=(), pairs_per_job=None, max_jobs=None):
+    """Matrix job outputs for n+1..n+npairs InSAR pairs of a year, or offset pairs offsets_dt years apart"""
+    from fufiters import pairs, planning, store
+
+    # If we're doing offset pairs DT is set in workflow (could also read GitHub context vars)
+    if offsets_dt:
+        start, end = "2017-01-01", None
+        year = npairs = None
+    else:
+        start = f"{year}-01-01"
+        end = f"{year+1}-03-01" #march to ensure we get some overlapping coverage for each year
+
+    # Get bursts from local burst map (downloaded once, then cached)
+    gfb = planning.get_bursts(burst_ids=burst_ids, aoi=aoi)
+    print(gfb.loc[:, ['burstID', 'relative_orbit_number', 'orbit_pass']])
+
+    # Search for SLCs, one cached search per relative orbit
+    # For case of frame overlap, ensure SLCs contain full burst
+    gf = planning.find_acquisitions(start=start, end=end, bursts=gfb)
+
+    print('Number of Acquisitions: ', len(gf))
+    burstIDs = list(dict.fromkeys(gf.sceneName))
+    print('\n'.join(burstIDs))
+
+    table = planning.plan_pairs(gf, year=year, npairs=npairs, dt=offsets_dt)
+    if inventory:
+        existing = store.load_inventory(inventory, table.burstId.unique(), kind='offsets' if offsets_dt else 'insar')
+        table = store.drop_existing(table, existing, polarization=polarization, looks=looks, force=force)
+
+    for burst_id, group in table.groupby('burstId'):
+        print(burst_id)
+        pairs.summarize(group, (gf.burstID == burst_id).sum())
+
+    outputs = dict(BURST_IDS=burstIDs)
+    outputs.update(job_outputs(gfb, table, looks, pairs_per_job, max_jobs=max_jobs))
+    return outputs
+
+
+def job_outputs(gfb, table, looks=None, pairs_per_job=None, burst_id=False, max_jobs=None):
+    """Matrix, prefetch manifest and optional packed matrices for a pair table"""
+    from fufiters import packing, pairs, prefetch
+
+    # Save JSON for GitHub Actions Matrix Job
+    matrixJSON = pairs.to_matrix(table, burst_id)
+    print(f'Number of Interferograms: {len(table)}')
+    print(matrixJSON)
+    outputs = dict(MATRIX_PARAMS_COMBINATIONS=matrixJSON, NUM_PAIRS=len(table))
+
+    # DEM tiles and orbit windows shared by all pair jobs
+    manifest = prefetch.manifest(gfb, table)
+    print(f"Prefetch: {len(manifest['dem_tiles'])} DEM tiles, {len(manifest['orbits'])} orbit windows")
+    outputs['PREFETCH_MANIFEST'] = prefetch.to_json(manifest)
+
+    if pairs_per_job:
+        jobs = packing.pack(table, max_pairs_per_job=int(pairs_per_job),
+                            max_jobs=int(max_jobs) if max_jobs else None, looks=looks or '20x4')
+        packing.report(table, jobs)
+        chunks = packing.to_matrix_chunks(jobs)
+        outputs['NUM_PACKED_MATRICES'] = len(chunks)
+        for i, chunk in enumerate(chunks):
+            outputs[f'PACKED_MATRIX_{i}'] = chunk
+
+    return outputs
+
+
+def forward_pairs(burst_ids=None, aoi=None, polarization='VV', npairs=3, offsets_dt=None, looks=None,
+                  inventory=None, force=(), pairs_per_job=None, watermarks=None, since=None, max_jobs=None):
+    """Matrix job outputs for the pairs completed by acquisitions after each burst's watermark
+
+    Returns the outputs and the advanced watermarks, save those with forward.save() once
+    the outputs are written.
+    """
+    from fufiters import forward, planning, store
+
+    gfb = planning.get_bursts(burst_ids=burst_ids, aoi=aoi)
+    print(gfb.loc[:, ['burstID', 'relative_orbit_number', 'orbit_pass']])
+
+    table, state = forward.plan(gfb, forward.load(watermarks), npairs=npairs, dt=offsets_dt, since=since)
+    if inventory and len(table):
+        existing = store.load_inventory(inventory, table.burstId.unique(), kind='offsets' if offsets_dt else 'insar')
+        table = store.drop_existing(table, existing, polarization=polarization, looks=looks, force=force)
+
+    # SLCs of the new pairs
+    outputs = dict(BURST_IDS=list(dict.fromkeys([*table.reference, *table.secondary])))
+    # Matrix entries always carry their burst, the set of bursts with new pairs changes every run
+    outputs.update(job_outputs(gfb, table, looks, pairs_per_job, burst_id=True, max_jobs=max_jobs))
+    return outputs, state
+
+
+def random_pair(aoi='nepal.geojson', stratify='track', recent='2 months ago', attempts=10, seed=None):
+    """Reference, secondary, burst and polarization of a random burst pair in an AOI
+
+    Only bursts with at least 2 acquisitions since recent (in one polarization) are used,
+    others are replaced by another random burst, up to attempts bursts.
+    """
+    import asf_search as asf
+    import numpy as np
+    import pandas as pd
+    from fufiters import aoi as aois
+    from fufiters import searchcache
+
+    print(os.getcwd())
+
+    # Bursts covering the AOI are computed once from the local burst map and cached,
+    # so the only ASF queries are for the stacks of random bursts (evenly across tracks)
+    bursts = aois.coverage(aoi)
+    rng = np.random.default_rng(seed)
+    recent_start = searchcache._to_datetime(recent)
+    asf.constants.INTERNAL.CMR_TIMEOUT = 120
+
+    tried = set()
+    for _ in range(attempts):
+        remaining = bursts[~bursts.burstID.isin(tried)]
+        if len(remaining) == 0:
+            break
+        random_burst = aois.sample(remaining, stratify=stratify, seed=rng).burstID.values[0]
+        tried.add(random_burst)
+
+        # Get burst stack (cached, only new acquisitions are requested from CMR)
+        acquisitions = searchcache.search(platform=[asf.PLATFORM.SENTINEL1],
+                                          processingLevel=asf.PRODUCT_TYPE.BURST,
+                                          fullBurstID=random_burst
+                                          )
+        if len(acquisitions) == 0:
+            print(f'{random_burst}: no acquisitions, trying another burst')
+            continue
+        times = pd.to_datetime(acquisitions.startTime, utc=True)
+        counts = acquisitions[times >= recent_start].polarization.value_counts()
+        polarizations = counts.index[counts >= 2]
+        if len(polarizations) == 0:
+            print(f'{random_burst}: fewer than 2 acquisitions since {recent_start:%Y-%m-%d}, trying another burst')
+            continue
+
+        random_pol = str(rng.choice(polarizations))
+        pair = acquisitions[acquisitions.polarization == random_pol].sample(2, random_state=rng)
+        # Original SLC names
+        reference, secondary = pair.additionalUrls.apply(lambda x: x[0].split('/')[3])
+        return dict(REFERENCE=reference, SECONDARY=secondary, BURSTID=random_burst, POLARIZATION=random_pol)
+
+    raise RuntimeError(f'No burst with 2 acquisitions since {recent_start:%Y-%m-%d} among {len(tried)} '
+                       f'random bursts in {aoi}')
\ No newline at end of file
@@ -0,0 +1,135 @@
+"""
+Sentinel-1 IW bursts covering an area of interest, computed offline from the burst map
+
+Detailed AOI polygons (e.g. nepal.geojson, ~58k vertices) are simplified within a small
+buffer so no edge bursts are lost, cut into tiles for tight spatial index queries, and
+candidates are checked exactly against the original polygon. Results are cached by a
+hash of the AOI so repeated runs only read a small parquet file.
+
+Example:
+    gf = aoi.coverage('nepal.geojson')
+    burst = aoi.sample(gf, stratify='track')
+    python -m fufiters.aoi nepal.geojson --sample 3 --stratify track
+"""
+import argparse
+import hashlib
+
+from fufiters import burstdb
+from fufiters.config import get_cache_dir
+
+# Simplification tolerance and tile size (degrees)
+TOLERANCE = 0.01
+TILE_SIZE = 1.0
+COLUMNS = ['burstID', 'relative_orbit_number', 'burst_id', 'subswath_name', 'orbit_pass', 'geometry']
+STRATA = {'track': ['relative_orbit_number'],
+          'subswath': ['subswath_name'],
+          'track-subswath': ['relative_orbit_number', 'subswath_name']}
+
+
+def read_aoi(aoi):
+    """Single shapely geometry from a vector file path or geometry"""
+    import geopandas as gpd
+    import shapely
+
+    if isinstance(aoi, str):
+        return shapely.make_valid(gpd.read_file(aoi).to_crs(4326).union_all())
+    return aoi
+
+
+def aoi_hash(aoi, tolerance=TOLERANCE, tile_size=TILE_SIZE):
+    """Cache key from the AOI (file bytes or geometry WKB), settings and burst map version"""
+    import shapely
+
+    digest = hashlib.sha1()
+    if isinstance(aoi, str):
+        with open(aoi, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    else:
+        digest.update(shapely.to_wkb(aoi))
+    stat = burstdb.get_path().stat()
+    digest.update(f'{tolerance}:{tile_size}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+    return digest.hexdigest()[:16]
+
+
+def tiles(geom, tolerance=TOLERANCE, tile_size=TILE_SIZE):
+    """Simplified AOI (a superset of the original) cut into tile_size degree pieces"""
+    import numpy as np
+    import shapely
+
+    simple = geom.buffer(tolerance).simplify(tolerance / 2)
+    xmin, ymin, xmax, ymax = simple.bounds
+    xs = np.arange(np.floor(xmin / tile_size) * tile_size, xmax, tile_size)
+    ys = np.arange(np.floor(ymin / tile_size) * tile_size, ymax, tile_size)
+    x, y = [a.ravel() for a in np.meshgrid(xs, ys)]
+    pieces = shapely.intersection(simple, shapely.box(x, y, x + tile_size, y + tile_size))
+    return pieces[~shapely.is_empty(pieces)]
+
+
+def compute_coverage(geom, tolerance=TOLERANCE, tile_size=TILE_SIZE):
+    """All IW bursts intersecting geom"""
+    import numpy as np
+    import shapely
+
+    gf = burstdb.load()
+    _, idx = gf.sindex.query(tiles(geom, tolerance, tile_size), predicate='intersects')
+    candidates = gf.iloc[np.unique(idx)]
+    # Exact test against the original polygon
+    shapely.prepare(geom)
+    keep = shapely.intersects(geom, candidates.geometry.values)
+    gf = burstdb.add_burst_names(candidates[keep].copy())
+    return gf.loc[:, COLUMNS].reset_index(drop=True)
+
+
+def coverage(aoi, tolerance=TOLERANCE, tile_size=TILE_SIZE, use_cache=True):
+    """Cached compute_coverage for a vector file path or geometry"""
+    import geopandas as gpd
+
+    path = get_cache_dir('aoi') / f'{aoi_hash(aoi, tolerance, tile_size)}.parquet'
+    if use_cache and path.exists():
+        return gpd.read_parquet(path)
+
+    gf = compute_coverage(read_aoi(aoi), tolerance, tile_size)
+    gf.to_parquet(path)
+    print(f'{len(gf)} bursts on {gf.relative_orbit_number.nunique()} tracks cover the AOI')
+    return gf
+
+
+def sample(gf, n=1, stratify=None, seed=None):
+    """Random bursts, optionally stratified ('track', 'subswath' or 'track-subswath')
+
+    Stratified sampling first picks strata uniformly, so tracks that only clip the AOI
+    are as likely as tracks crossing all of it
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    if stratify is None:
+        return gf.iloc[rng.choice(len(gf), size=n, replace=n > len(gf))].reset_index(drop=True)
+
+    groups = list(gf.groupby(STRATA[stratify]).indices.values())
+    chosen = rng.choice(len(groups), size=n, replace=n > len(groups))
+    return gf.iloc[[rng.choice(groups[i]) for i in chosen]].reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sentinel-1 IW bursts covering an AOI")
+    parser.add_argument("aoi", help="Vector file with AOI polygon(s) (e.g. nepal.geojson)")
+    parser.add_argument("-n", "--sample", type=int, default=None, help="Print n random bursts")
+    parser.add_argument("-s", "--stratify", choices=list(STRATA), default=None, help="Sample evenly across strata")
+    parser.add_argument("-o", "--output", default=None, help="Save bursts (.parquet or .geojson)")
+    args = parser.parse_args(argv)
+
+    gf = coverage(args.aoi)
+    print(gf.groupby(['relative_orbit_number', 'orbit_pass']).size().rename('bursts').to_string())
+    if args.sample:
+        print(sample(gf, args.sample, args.stratify).loc[:, ['burstID', 'orbit_pass']].to_string())
+    if args.output:
+        if args.output.endswith('.parquet'):
+            gf.to_parquet(args.output)
+        else:
+            gf.to_file(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""
+Streaming ASF search into Arrow tables
+
+Long date ranges are split into windows that are searched concurrently. Each CMR page is
+converted straight into a typed Arrow table (WKB geometry plus only the columns planning
+needs) as it arrives, instead of materializing all results, then a GeoJSON dict, then a
+GeoDataFrame. Pages can be written to Parquet one row group at a time, so memory stays
+flat however long the stack is, and a stack directory grows by adding part files.
+
+Example:
+    gf = arrowsearch.search(platform=['SENTINEL-1A', 'SENTINEL-1B'], processingLevel='SLC',
+                            relativeOrbit=12, intersectsWith='POINT(86.9 27.9)', start='2017-01-01')
+    arrowsearch.search_to_parquet('stacks/012', relativeOrbit=12, ...)
+"""
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import json
+import operator
+import os
+import queue
+import threading
+import uuid
+
+import geopandas as gpd
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import shapely
+
+# Sentinel-1A launch
+MISSION_START = '2014-04-03'
+WINDOW = pd.Timedelta(days=365)
+WORKERS = 4
+# Pages waiting to be written (bounds memory when CMR is faster than the consumer)
+MAX_PENDING_PAGES = 8
+
+SCHEMA = pa.schema([
+    ('sceneName', pa.string()),
+    ('fileID', pa.string()),
+    ('startTime', pa.timestamp('us', tz='UTC')),
+    ('stopTime', pa.timestamp('us', tz='UTC')),
+    ('pathNumber', pa.int16()),
+    ('frameNumber', pa.int32()),
+    ('flightDirection', pa.string()),
+    ('beamModeType', pa.string()),
+    ('polarization', pa.string()),
+    ('platform', pa.string()),
+    ('processingLevel', pa.string()),
+    ('url', pa.string()),
+    ('geometry', pa.binary()),
+])
+GEO_METADATA = {
+    'version': '1.0.0',
+    'primary_column': 'geometry',
+    'columns': {'geometry': {'encoding': 'WKB', 'geometry_types': ['Polygon']}},
+}
+SCHEMA = SCHEMA.with_metadata({b'geo': json.dumps(GEO_METADATA).encode()})
+
+
+def date_windows(start=None, end=None, window=WINDOW):
+    """Split [start, end] into consecutive windows sharing their boundaries"""
+    from fufiters.searchcache import _to_datetime
+
+    start = _to_datetime(start or MISSION_START)
+    end = _to_datetime(end) or pd.Timestamp.now(tz='UTC')
+    edges = list(pd.date_range(start, end, freq=window))
+    if edges[-1] < end:
+        edges.append(end)
+    if len(edges) == 1:
+        edges.append(end)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def page_to_table(page):
+    """Typed Arrow table from a page of ASFProducts (no GeoJSON)"""
+    columns = {}
+    for field in SCHEMA:
+        if field.name == 'geometry':
+            continue
+        values = [product.properties.get(field.name) for product in page]
+        if pa.types.is_timestamp(field.type):
+            values = pd.to_datetime(pd.Series(values, dtype=object), utc=True, format='ISO8601')
+        columns[field.name] = pa.array(values, type=field.type, from_pandas=True)
+    geometry = [shapely.geometry.shape(product.geometry) for product in page]
+    columns['geometry'] = pa.array(shapely.to_wkb(geometry), type=pa.binary())
+    return pa.Table.from_pydict(columns, schema=SCHEMA)
+
+
+def _put(pages, item, stop):
+    """Put item on the bounded queue, giving up once the consumer has stopped"""
+    while not stop.is_set():
+        try:
+            pages.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+
+def _search_window(pages, start, end, query, stop):
+    import asf_search as asf
+
+    # Own session per thread, search_generator sets paging headers on it
+    opts = asf.ASFSearchOptions(session=asf.ASFSession())
+    for page in asf.search_generator(opts=opts, start=start.isoformat(), end=end.isoformat(), **query):
+        if stop.is_set():
+            return
+        if len(page):
+            _put(pages, page_to_table(page), stop)
+
+
+class _Failed:
+    """Search error of a worker thread, raised by the consumer as soon as it arrives"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def iter_pages(start=None, end=None, window=WINDOW, workers=WORKERS, **query):
+    """Arrow tables, one per CMR page, from concurrent searches of each date window
+
+    Pages arrive in completion order, duplicates at window boundaries are removed.
+    Closing the generator early stops the remaining searches.
+    """
+    pages = queue.Queue(maxsize=MAX_PENDING_PAGES)
+    stop = threading.Event()
+    done = object()
+    seen = set()
+
+    def worker(start, end):
+        try:
+            _search_window(pages, start, end, query, stop)
+        except Exception as e:
+            _put(pages, _Failed(e), stop)
+        finally:
+            _put(pages, done, stop)
+
+    windows = date_windows(start, end, window)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = [executor.submit(worker, s, e) for s, e in windows]
+    try:
+        remaining = len(windows)
+        while remaining:
+            table = pages.get()
+            if table is done:
+                remaining -= 1
+                continue
+            if isinstance(table, _Failed):
+                raise table.error
+            ids = table.column('fileID').to_pylist()
+            keep = [i not in seen for i in ids]
+            seen.update(ids)
+            yield table.filter(pa.array(keep)) if not all(keep) else table
+    finally:
+        # Consumer finished, failed or closed the generator: release workers waiting on a full queue
+        stop.set()
+        for future in futures:
+            future.cancel()
+        while True:
+            try:
+                pages.get_nowait()
+            except queue.Empty:
+                break
+        executor.shutdown(wait=True)
+
+
+def to_geodataframe(table):
+    """GeoDataFrame from an Arrow table with WKB geometry, newest first like ASF"""
+    df = table.to_pandas()
+    geometry = gpd.GeoSeries.from_wkb(df.pop('geometry'), crs=4326)
+    gf = gpd.GeoDataFrame(df, geometry=geometry)
+    return gf.sort_values(by='startTime', ascending=False, ignore_index=True)
+
+
+def search(start=None, end=None, window=WINDOW, workers=WORKERS, **query):
+    """Drop-in for asf.search(...) returning a GeoDataFrame with SCHEMA columns"""
+    tables = list(iter_pages(start, end, window, workers, **query))
+    return to_geodataframe(pa.concat_tables(tables) if tables else SCHEMA.empty_table())
+
+
+def search_to_parquet(path, start=None, end=None, window=WINDOW, workers=WORKERS, **query):
+    """Stream search results into a new part file of the stack directory at path
+
+    Each page is written as it arrives, so memory is bounded by pages in flight
+    """
+    os.makedirs(path, exist_ok=True)
+    name = f'part-{uuid.uuid4().hex[:12]}.parquet'
+    file = os.path.join(path, name)
+    # Hidden until complete so readers never see a partial file
+    tmp = os.path.join(path, f'.{name}.tmp')
+    rows = 0
+    with pq.ParquetWriter(tmp, SCHEMA, compression='zstd') as writer:
+        for table in iter_pages(start, end, window, workers, **query):
+            writer.write_table(table)
+            rows += table.num_rows
+    if rows:
+        os.replace(tmp, file)
+        print(f'Wrote {rows} results to {file}')
+    else:
+        os.remove(tmp)
+    return rows
+
+
+def read_parquet(path, columns=None, start=None, end=None):
+    """Read a stack directory written by search_to_parquet, one row per fileID, newest first"""
+    from fufiters.searchcache import _to_datetime
+
+    dataset = ds.dataset(path, format='parquet', schema=SCHEMA)
+    expr = []
+    if start is not None:
+        expr.append(ds.field('startTime') >= pa.scalar(_to_datetime(start), SCHEMA.field('startTime').type))
+    if end is not None:
+        expr.append(ds.field('startTime') <= pa.scalar(_to_datetime(end), SCHEMA.field('startTime').type))
+    if columns is not None:
+        columns = list(dict.fromkeys(['fileID', 'startTime', 'geometry'] + list(columns)))
+    table = dataset.to_table(columns=columns, filter=functools.reduce(operator.and_, expr) if expr else None)
+    gf = to_geodataframe(table)
+    return gf.drop_duplicates(subset='fileID', ignore_index=True)
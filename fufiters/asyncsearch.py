@@ -0,0 +1,151 @@
+"""
+Concurrent SLC inventory for many bursts with asyncio and aiohttp
+
+asf_search translates each query into CMR keywords (so results match asf.search), but
+the requests themselves are sent concurrently with aiohttp: a semaphore bounds requests
+in flight, each request has its own timeout, and failures (timeouts, connection errors,
+HTTP 429/5xx) are retried with exponential backoff. For every burst the burst metadata
+and then its SLC stack are requested, all bursts at once.
+
+Example:
+    stacks, stats = asyncsearch.inventory(['012_023790_IW1', '012_023791_IW1'], start='2020-01-01')
+"""
+import asyncio
+import random
+
+import geopandas as gpd
+import pandas as pd
+
+# Requests in flight at once, per-request timeout (seconds) and attempts per request
+MAX_CONCURRENT = 8
+TIMEOUT = 60
+RETRIES = 4
+BACKOFF = 2.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class SearchError(Exception):
+    pass
+
+
+def _cmr_queries(**query):
+    """CMR URL and translated keyword lists for an asf.search query"""
+    import asf_search as asf
+    from asf_search.CMR import build_subqueries, translate_opts
+    from asf_search.search.search_generator import preprocess_opts
+
+    opts = asf.ASFSearchOptions(**query)
+    preprocess_opts(opts)
+    url = f'https://{opts.host}{asf.INTERNAL.CMR_GRANULE_PATH}'
+    return url, [translate_opts(subquery) for subquery in build_subqueries(opts)]
+
+
+async def _post(session, semaphore, url, data, headers):
+    """POST with bounded concurrency, per-request timeout and retry with backoff"""
+    import aiohttp
+
+    for attempt in range(RETRIES):
+        try:
+            async with semaphore:
+                async with session.post(url, data=data, headers=headers) as response:
+                    if response.status in RETRY_STATUS:
+                        raise SearchError(f'HTTP {response.status} from {url}')
+                    if response.status >= 400:
+                        # Bad query, retrying will not help
+                        raise ValueError(f'HTTP {response.status}: {await response.text()}')
+                    return await response.json(), response.headers.get('CMR-Search-After')
+        except (SearchError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt == RETRIES - 1:
+                raise SearchError(f'{url} failed after {RETRIES} attempts: {e!r}') from e
+            await asyncio.sleep(BACKOFF * 2**attempt * (1 + random.random()))
+
+
+async def search(session, semaphore, **query):
+    """asf.search(**query) as a GeoDataFrame using an aiohttp session"""
+    import asf_search as asf
+    from asf_search.search.search_generator import as_ASFProduct
+
+    url, subqueries = _cmr_queries(**query)
+    products = []
+    for data in subqueries:
+        search_after, count = None, 0
+        while True:
+            headers = {'CMR-Search-After': search_after} if search_after else {}
+            page, search_after = await _post(session, semaphore, url, data, headers)
+            products.extend(as_ASFProduct(item, session=None) for item in page['items'])
+            count += len(page['items'])
+            if not search_after or not page['items'] or count >= page['hits']:
+                break
+
+    geojson = asf.ASFSearchResults(products).geojson()
+    if not geojson['features']:
+        return gpd.GeoDataFrame(geometry=[], crs=4326)
+    gf = gpd.GeoDataFrame.from_features(geojson, crs=4326)
+    return gf.sort_values(by='startTime', ascending=False, ignore_index=True)
+
+
+async def burst_stack(session, semaphore, burst_id, start=None, end=None):
+    """Burst metadata and SLCs covering the burst centre on its relative orbit"""
+    import asf_search as asf
+
+    gfB = await search(session, semaphore, granule_list=[f'S1_{burst_id}-BURSTMAP'])
+    if len(gfB) == 0:
+        raise SearchError(f'No burst metadata for {burst_id}')
+    burst = gfB.iloc[0]
+    gf = await search(session, semaphore,
+                      platform=[asf.PLATFORM.SENTINEL1],
+                      processingLevel='SLC',
+                      beamMode=asf.BEAMMODE.IW,
+                      relativeOrbit=int(burst.pathNumber),
+                      intersectsWith=f"POINT({burst.centerLon} {burst.centerLat})",
+                      start=start,
+                      end=end,
+                      )
+    gf['burstID'] = burst_id
+    return gf
+
+
+async def gather_stacks(burst_ids, start=None, end=None, max_concurrent=MAX_CONCURRENT, timeout=TIMEOUT):
+    """SLC stacks for all bursts concurrently, {burst_id: GeoDataFrame or exception}"""
+    import aiohttp
+    import asf_search as asf
+
+    semaphore = asyncio.Semaphore(max_concurrent)
+    # Same client headers asf_search sends to CMR
+    headers = dict(asf.ASFSession().headers)
+    async with aiohttp.ClientSession(headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        tasks = [burst_stack(session, semaphore, burst_id, start, end) for burst_id in burst_ids]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    return dict(zip(burst_ids, results))
+
+
+def stack_stats(gf):
+    """Count, timespan, revisit (min, mode, max days) and platforms of an SLC stack"""
+    if len(gf) == 0:
+        return dict(count=0)
+    times = pd.to_datetime(gf.startTime).sort_values()
+    revisit = times.diff().dt.round('1D').dt.days.dropna().astype('i2')
+    return dict(
+        count=len(gf),
+        first=times.iloc[0].strftime('%Y-%m-%d'),
+        last=times.iloc[-1].strftime('%Y-%m-%d'),
+        revisit_min=int(revisit.min()) if len(revisit) else None,
+        revisit_mode=int(revisit.mode()[0]) if len(revisit) else None,
+        revisit_max=int(revisit.max()) if len(revisit) else None,
+        polarizations=','.join(sorted(gf.polarization.unique())),
+        platforms=','.join(sorted(gf.platform.unique())),
+    )
+
+
+def inventory(burst_ids, start=None, end=None, max_concurrent=MAX_CONCURRENT, timeout=TIMEOUT):
+    """SLC stacks and a statistics table (one row per burst) for many bursts"""
+    results = asyncio.run(gather_stacks(burst_ids, start, end, max_concurrent, timeout))
+    stacks, rows = {}, []
+    for burst_id, result in results.items():
+        if isinstance(result, Exception):
+            print(f'{burst_id}: search failed ({result})')
+            rows.append(dict(burstID=burst_id, count=None, error=str(result)))
+            continue
+        stacks[burst_id] = result
+        rows.append(dict(burstID=burst_id, **stack_stats(result)))
+    return stacks, pd.DataFrame(rows).set_index('burstID')
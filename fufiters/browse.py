@@ -0,0 +1,108 @@
+"""
+Browse images and thumbnails of product COGs from their overviews
+
+Each COG is read once with a decimated read, so GDAL uses the coarsest overview that still
+has at least BROWSE_SIZE pixels on the long side instead of decoding the full resolution
+image (remote files only fetch those overview tiles). The browse image and thumbnail are
+colorized from that one read, nodata is transparent, and assets are processed
+concurrently. PNG or WebP files are written next to the COGs.
+
+Example:
+    images = browse.make_browse_many({'unwrapped': 'S1_..._unw_phase.tif', 'corr': 'S1_..._corr.tif'})
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import warnings
+
+import numpy as np
+import rasterio
+from rasterio.enums import Resampling
+
+from fufiters.rasterinfo import GDAL_ENV
+
+# Long side in pixels
+BROWSE_SIZE = 1024
+THUMBNAIL_SIZE = 256
+FORMATS = {'png': ('PNG', 'image/png', {}), 'webp': ('WEBP', 'image/webp', {'QUALITY': 80})}
+# Color ramps as anchor colors (linearly interpolated)
+COLORMAPS = {
+    'gray': [(0, 0, 0), (255, 255, 255)],
+    'diverging': [(33, 102, 172), (247, 247, 247), (178, 24, 43)],
+    'cyclic': [(255, 0, 0), (255, 255, 0), (0, 255, 0), (0, 255, 255), (0, 0, 255), (255, 0, 255), (255, 0, 0)],
+}
+# Colormap and value range per asset ('percentile' stretches 2-98%)
+STYLES = {
+    'unwrapped': ('diverging', 'percentile'),
+    'wrapped': ('cyclic', (-np.pi, np.pi)),
+    'corr': ('gray', (0, 1)),
+    'azimuth_offsets': ('diverging', 'percentile'),
+    'range_offsets': ('diverging', 'percentile'),
+}
+
+
+def read_overview(href, size=BROWSE_SIZE):
+    """First band decimated to at most size pixels on the long side, nodata masked"""
+    with rasterio.Env(**GDAL_ENV), rasterio.open(href) as src:
+        scale = max(src.width, src.height) / size
+        if scale <= 1:
+            return src.read(1, masked=True)
+        out_shape = (max(1, round(src.height / scale)), max(1, round(src.width / scale)))
+        return src.read(1, out_shape=out_shape, masked=True, resampling=Resampling.nearest)
+
+
+def colorize(data, colormap, value_range):
+    """RGBA uint8 image (4, rows, cols), masked and non-finite pixels transparent"""
+    values = np.ma.masked_invalid(data.astype('float32'))
+    if value_range == 'percentile':
+        valid = values.compressed()
+        vmin, vmax = np.percentile(valid, [2, 98]) if valid.size else (0, 1)
+    else:
+        vmin, vmax = value_range
+    scaled = np.clip((values.filled(vmin) - vmin) / max(vmax - vmin, 1e-12), 0, 1)
+    anchors = np.array(COLORMAPS[colormap], dtype='float32')
+    positions = np.linspace(0, 1, len(anchors))
+    rgba = np.empty((4, *scaled.shape), dtype='uint8')
+    for band in range(3):
+        rgba[band] = np.interp(scaled, positions, anchors[:, band]).round()
+    rgba[3] = np.where(np.ma.getmaskarray(values), 0, 255)
+    return rgba
+
+
+def downsample(rgba, size):
+    """Strided decimation to at most size pixels on the long side"""
+    step = int(np.ceil(max(rgba.shape[1:]) / size))
+    return rgba[:, ::step, ::step]
+
+
+def write_image(rgba, path, fmt='png'):
+    driver, _, options = FORMATS[fmt]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', rasterio.errors.NotGeoreferencedWarning)
+        with rasterio.open(path, 'w', driver=driver, width=rgba.shape[2], height=rgba.shape[1],
+                           count=4, dtype='uint8', **options) as dst:
+            dst.write(rgba)
+    return path
+
+
+def make_browse(name, href, dest=None, fmt='png', browse_size=BROWSE_SIZE, thumbnail_size=THUMBNAIL_SIZE):
+    """Write {stem}_browse and {stem}_thumb images for one asset, returns their paths"""
+    colormap, value_range = STYLES[name]
+    stem = os.path.splitext(os.path.basename(href))[0]
+    dest = dest or os.path.dirname(href)
+    rgba = colorize(read_overview(href, browse_size), colormap, value_range)
+    return dict(browse=write_image(rgba, f'{dest}/{stem}_browse.{fmt}', fmt),
+                thumbnail=write_image(downsample(rgba, thumbnail_size), f'{dest}/{stem}_thumb.{fmt}', fmt))
+
+
+def make_browse_many(hrefs, dest=None, fmt='png', workers=len(STYLES)):
+    """Browse images for {asset name: href} concurrently, assets without a file are skipped"""
+    def run(name, href):
+        try:
+            return make_browse(name, href, dest, fmt)
+        except rasterio.errors.RasterioIOError:
+            return None
+
+    hrefs = {name: href for name, href in hrefs.items() if name in STYLES}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda kv: run(*kv), hrefs.items())
+        return {name: paths for name, paths in zip(hrefs, results) if paths is not None}
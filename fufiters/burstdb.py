@@ -0,0 +1,122 @@
+"""
+Local, indexed copy of the ESA Sentinel-1 IW burst map
+
+The burst map from https://github.com/relativeorbit/s1burstids is downloaded once,
+re-sorted by relative orbit and burst_id, given flat bbox columns, and written to
+the local cache as GeoParquet with small row groups. Single burst and point lookups
+read only the row groups whose statistics match, polygon queries use an in-memory
+STRtree over the full table.
+
+Example:
+    from fufiters import burstdb
+    gfb = burstdb.lookup(23790, 'IW1')
+    gf = burstdb.bursts_at_point(86.925, 27.988)
+"""
+import functools
+import os
+
+from fufiters.config import get_cache_dir
+
+BURST_MAP_URL = 'https://github.com/relativeorbit/s1burstids/raw/main/burst_map_IW_000001_375887_brotli.parquet'
+BURST_MAP_FILE = 'burst_map_IW_sorted.parquet'
+# ~3 subswaths x 256 burst_ids, or about 1/8 of a relative orbit per row group
+ROW_GROUP_SIZE = 768
+BBOX_COLUMNS = ['xmin', 'ymin', 'xmax', 'ymax']
+
+
+def parse_burst_id(full_burst_id):
+    """Split standard name (e.g. 012_023790_IW1) into (relative orbit, burst_id, subswath)"""
+    relorb, burst_id, subswath = full_burst_id.split('_')
+    return int(relorb), int(burst_id), subswath
+
+
+def add_burst_names(gf):
+    """Add standard burst name column (PATH_ID_SWATH) to a burst map subset"""
+    gf['burstID'] = (gf.relative_orbit_number.astype(str).str.zfill(3) + '_'
+                     + gf.burst_id.astype(str).str.zfill(6) + '_'
+                     + gf.subswath_name)
+    return gf
+
+
+def get_path():
+    """Path of the local burst map, downloading and indexing it if needed"""
+    path = get_cache_dir('burstdb') / BURST_MAP_FILE
+    if not path.exists():
+        build(path=path)
+    return path
+
+
+def build(url=BURST_MAP_URL, path=None):
+    """Download burst map and write a sorted, row-grouped GeoParquet copy with bbox columns"""
+    import geopandas as gpd
+    import shapely
+    import fsspec
+
+    if path is None:
+        path = get_cache_dir('burstdb') / BURST_MAP_FILE
+    print(f'Building local burst map from {url}...')
+    with fsspec.open(url) as file:
+        gf = gpd.read_parquet(file)
+
+    gf = gf.sort_values(by=['relative_orbit_number', 'burst_id', 'subswath_name'], ignore_index=True)
+    gf[BBOX_COLUMNS] = shapely.bounds(gf.geometry.values)
+
+    # Write to temporary file first so concurrent jobs never read a partial file
+    tmp = f'{path}.{os.getpid()}.tmp'
+    gf.to_parquet(tmp, compression='zstd', row_group_size=ROW_GROUP_SIZE)
+    os.replace(tmp, path)
+    print('Saved', path, len(gf), 'bursts')
+
+    return path
+
+
+@functools.lru_cache(maxsize=1)
+def load():
+    """Load full burst map into memory (STRtree is built lazily on first spatial query)"""
+    import geopandas as gpd
+
+    return gpd.read_parquet(get_path())
+
+
+def _is_loaded():
+    return load.cache_info().currsize > 0
+
+
+def lookup(burst_id, subswath):
+    """Get burst map row(s) for an ESA burst_id and subswath (e.g. 23790, 'IW1')"""
+    import geopandas as gpd
+
+    burst_id = int(burst_id)
+    if _is_loaded():
+        gf = load()
+        gf = gf[(gf.burst_id == burst_id) & (gf.subswath_name == subswath)]
+    else:
+        # Row-group statistics on sorted burst_id mean only one row group is decoded
+        gf = gpd.read_parquet(get_path(),
+                              filters=[('burst_id', '=', burst_id),
+                                       ('subswath_name', '=', subswath)])
+    return add_burst_names(gf.reset_index(drop=True))
+
+
+def bursts_at_point(lon, lat):
+    """Get all IW bursts whose footprint covers a point"""
+    import geopandas as gpd
+    import shapely
+
+    point = shapely.Point(lon, lat)
+    if _is_loaded():
+        return bursts_in_polygon(point)
+
+    gf = gpd.read_parquet(get_path(),
+                          filters=[('xmin', '<=', lon), ('xmax', '>=', lon),
+                                   ('ymin', '<=', lat), ('ymax', '>=', lat)])
+    gf = gf[gf.intersects(point)]
+    return add_burst_names(gf.reset_index(drop=True))
+
+
+def bursts_in_polygon(geom):
+    """Get all IW bursts that intersect a shapely geometry"""
+    gf = load()
+    idx = gf.sindex.query(geom, predicate='intersects')
+    gf = gf.iloc[sorted(idx)].copy()
+    return add_burst_names(gf.reset_index(drop=True))
@@ -0,0 +1,93 @@
+"""
+Find Sentinel-1 burstIDs that cover a point
+
+The local burst map is used by default, find_bursts() searches ASF instead.
+
+Example:
+    gf = bursts.find_bursts_local(-73.604, -49.669)
+"""
+
+
+def find_bursts(lon, lat):
+    """Find ESA Sentinel-1 burstIDs that cover a point"""
+    from fufiters import searchcache
+
+    print('Searching ASF...')
+    gf = searchcache.search(
+        collections="C2450786986-ASF",
+        # NOTE: collection doesn't expose beamMode, so need to filter results instead
+        # beamMode=asf.BEAMMODE.IW,
+        intersectsWith=f"POINT({lon} {lat})",
+    )
+
+    gf = gf[gf.fileID.str.contains("_IW")].reset_index(drop=True)
+    # Standard Name (PATH_ID_SWATH)
+    gf["burstID"] = gf.fileID.str[3:-9]
+    gf = gf.dropna(axis='columns')
+    gf = gf.drop(columns='s3Urls')
+    print(f'Found {len(gf)} bursts covering ({lon}, {lat}):')
+    print(gf.loc[:, ["burstID", "flightDirection"]])
+
+    return gf
+
+
+def find_bursts_local(lon, lat):
+    """Find ESA Sentinel-1 burstIDs that cover a point using the local burst map"""
+    from fufiters import burstdb
+
+    gf = burstdb.bursts_at_point(lon, lat)
+    gf = gf.rename(columns={'orbit_pass': 'flightDirection'})
+    print(f'Found {len(gf)} bursts covering ({lon}, {lat}):')
+    print(gf.loc[:, ["burstID", "flightDirection"]])
+
+    return gf
+
+
+def slippy_map(gf, lon, lat):
+    """Plot geopandas polygons using folium and open in browser"""
+    print('Generating web map...')
+    # Interactive map from CLI
+    import webbrowser
+    import folium
+    from folium.plugins import MiniMap
+    from fufiters import maps
+    path = '/tmp/map.html'
+    gf = maps.simplify(maps.slim(gf, ['burstID', 'flightDirection']))
+    m = gf.explore(column='burstID', popup=True, tiles='Esri.WorldImagery', categorical=True, cmap='Accent',
+                   legend=len(gf) <= maps.MAX_LEGEND)
+    folium.Marker(location=[lat, lon]).add_to(m)
+    MiniMap(position="topright", zoom_level_fixed=1).add_to(m)
+    m.save(path)
+    print('map saved to', path)
+    webbrowser.open(f'file://{path}')
+
+
+def static_map(gf, lon, lat):
+    """Plot geopandas polygons using matplotlib"""
+    print('Generating matplotlib plot...')
+    import matplotlib.pyplot as plt
+    import contextily as cx
+    from fufiters import maps
+
+    # Figure is ~1100 pixels wide at the default 100 dpi
+    gf = maps.simplify(maps.slim(gf, ['burstID']), width=1100)
+    fig, ax = plt.subplots(figsize=(11,8.5))
+    gf.plot(ax=ax, column="burstID", facecolor="none", linewidth=4 if len(gf) <= maps.MAX_LEGEND else 0.5,
+            cmap='Accent', legend=len(gf) <= maps.MAX_LEGEND)
+    ax.plot(lon, lat, "k*", markersize=10)
+
+    # Zoom out more compared to autoscaling defaults for more context
+    percent_buffer = .25
+    xmin,ymin,xmax,ymax = gf.total_bounds
+    xbuf = (xmax - xmin) * percent_buffer
+    ybuf = (ymax - ymin) * percent_buffer
+    ax.set_xlim(xmin - xbuf, xmax + xbuf)
+    ax.set_ylim(ymin - ybuf, ymax + ybuf)
+    # Automatically chosen zoom can be a bit coarse, zoom=9 seems good, or zoom_adjust=1
+    cx.add_basemap(ax, source=cx.providers.Esri.WorldImagery, crs='EPSG:4326', zoom_adjust=1)  # WorldTerrain
+
+    ax.set_xlabel("Longitude")
+    ax.set_ylabel("Latitude")
+    ax.set_title(f"Sentinel-1 Bursts Intersecting ({lon}, {lat})")
+    plt.savefig('/tmp/footprints.png')
+    plt.show()
@@ -0,0 +1,220 @@
+"""
+Partitioned stac-geoparquet inventory of fufiters products
+
+STAC Items are flattened following stac-geoparquet conventions (properties as top-level
+columns, geometry as WKB, assets and links as JSON) and written as hive partitions
+burstId=.../year=.../ sorted by datetime. Queries combine partition pruning (burst, year)
+with row-group statistics (datetime, bbox, baseline), so answering a question reads a few
+small row groups instead of listing objects.
+
+Example:
+    python -m fufiters.catalog add inventory catalog/collection.json
+    python -m fufiters.catalog query inventory --bbox 86.9 27.8 87.0 27.9 --dt 12 --polarization VV \\
+        --start 2019-01-01 --end 2021-12-31
+"""
+import argparse
+import functools
+import json
+import operator
+import uuid
+
+GEO_METADATA = {
+    'version': '1.0.0',
+    'primary_column': 'geometry',
+    'columns': {'geometry': {'encoding': 'WKB', 'geometry_types': ['Polygon']}},
+}
+# Properties from the Item that become typed columns (everything else goes in 'properties')
+COLUMNS = ['id', 'collection', 'burstId', 'year', 'datetime', 'start_datetime', 'end_datetime',
+           'dt_days', 'product', 'polarization', 'perpendicularBaseline', 'passDirection',
+           'xmin', 'ymin', 'xmax', 'ymax', 'geometry', 'assets', 'links', 'properties', 'updated']
+
+
+def product_type(item):
+    """'offsets' or 'insar' from the asset hrefs (store layout {root}/{kind}/{burstId}/...)"""
+    href = next(iter(item['assets'].values()))['href']
+    return 'offsets' if '/offsets/' in href else 'insar'
+
+
+def items_to_table(items):
+    """Flatten STAC Item dicts into an Arrow table"""
+    import pandas as pd
+    import pyarrow as pa
+    import shapely
+
+    rows = []
+    for item in items:
+        item = item if isinstance(item, dict) else item.to_dict()
+        props = dict(item['properties'])
+        start = pd.Timestamp(props.pop('start_datetime'))
+        end = pd.Timestamp(props.pop('end_datetime'))
+        xmin, ymin, xmax, ymax = item['bbox']
+        rows.append(dict(
+            id=item['id'],
+            collection=item.get('collection'),
+            burstId=props.pop('burstId'),
+            year=start.year,
+            datetime=pd.Timestamp(props.pop('datetime', None) or start),
+            start_datetime=start,
+            end_datetime=end,
+            dt_days=int(round((end - start) / pd.Timedelta(days=1))),
+            product=product_type(item),
+            # S1_023790_IW1_20230621_20230703_VV_INT80
+            polarization=item['id'].split('_')[5],
+            perpendicularBaseline=float(props.pop('perpendicularBaseline')),
+            passDirection=props.pop('passDirection', None),
+            xmin=xmin, ymin=ymin, xmax=xmax, ymax=ymax,
+            geometry=shapely.to_wkb(shapely.geometry.shape(item['geometry'])),
+            assets=json.dumps(item['assets']),
+            links=json.dumps(item.get('links', [])),
+            properties=json.dumps(props),
+        ))
+
+    df = pd.DataFrame(rows, columns=COLUMNS)
+    # Re-added products are de-duplicated at query time, latest write wins
+    df['updated'] = pd.Timestamp.now(tz='UTC')
+    for col in ['datetime', 'start_datetime', 'end_datetime']:
+        df[col] = pd.to_datetime(df[col], utc=True)
+    df = df.sort_values(by=['burstId', 'datetime'], ignore_index=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'geo'] = json.dumps(GEO_METADATA).encode()
+    return table.replace_schema_metadata(metadata)
+
+
+def write(path, items, row_group_size=1024):
+    """Append Items to the inventory at path (local or fsspec URL)"""
+    import pyarrow.dataset as ds
+
+    table = items_to_table(items)
+    if table.num_rows == 0:
+        return 0
+    ds.write_dataset(table, path, format='parquet',
+                     partitioning=['burstId', 'year'], partitioning_flavor='hive',
+                     basename_template=f'part-{uuid.uuid4().hex[:12]}-{{i}}.parquet',
+                     existing_data_behavior='overwrite_or_ignore',
+                     max_rows_per_group=row_group_size, min_rows_per_group=min(row_group_size, table.num_rows))
+    print(f'Wrote {table.num_rows} items to {path}')
+    return table.num_rows
+
+
+def _filter(burst=None, bbox=None, start=None, end=None, baseline=None, product=None,
+            polarization=None, dt_days=None):
+    """Arrow dataset filter expression (None matches everything)"""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    expr = []
+    if burst is not None:
+        bursts = [burst] if isinstance(burst, str) else list(burst)
+        expr.append(ds.field('burstId').isin(bursts))
+    if start is not None:
+        # Partitions are by reference year, pairs from earlier years can end after start
+        start = pd.Timestamp(start, tz='UTC')
+        expr.append(ds.field('end_datetime') >= pa.scalar(start, pa.timestamp('ns', 'UTC')))
+    if end is not None:
+        end = pd.Timestamp(end, tz='UTC')
+        expr.append(ds.field('year') <= end.year)
+        expr.append(ds.field('start_datetime') <= pa.scalar(end, pa.timestamp('ns', 'UTC')))
+    if bbox is not None:
+        xmin, ymin, xmax, ymax = bbox
+        expr += [ds.field('xmin') <= xmax, ds.field('xmax') >= xmin,
+                 ds.field('ymin') <= ymax, ds.field('ymax') >= ymin]
+    if baseline is not None:
+        expr += [ds.field('perpendicularBaseline') >= baseline[0],
+                 ds.field('perpendicularBaseline') <= baseline[1]]
+    if product is not None:
+        expr.append(ds.field('product') == product)
+    if polarization is not None:
+        expr.append(ds.field('polarization') == polarization)
+    if dt_days is not None:
+        expr.append(ds.field('dt_days') == int(dt_days))
+
+    if not expr:
+        return None
+    return functools.reduce(operator.and_, expr)
+
+
+def query(path, columns=None, **criteria):
+    """Query the inventory, returns a GeoDataFrame (one row per product, latest write wins)
+
+    criteria: burst, bbox, start, end, baseline=(min, max), product, polarization, dt_days
+    """
+    import geopandas as gpd
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(path, format='parquet', partitioning='hive')
+    if columns is not None:
+        columns = list(dict.fromkeys(['id', 'geometry', 'updated'] + list(columns)))
+    df = dataset.to_table(columns=columns, filter=_filter(**criteria)).to_pandas()
+    df = df.sort_values(by='updated', kind='stable').drop_duplicates(subset='id', keep='last')
+    df = df.sort_index().reset_index(drop=True)
+    geometry = gpd.GeoSeries.from_wkb(df.pop('geometry'), crs=4326)
+    return gpd.GeoDataFrame(df, geometry=geometry)
+
+
+def to_items(gf):
+    """Reconstruct STAC Item dicts from query results"""
+    import shapely
+
+    items = []
+    for row in gf.itertuples():
+        props = json.loads(row.properties)
+        props.update(start_datetime=row.start_datetime.isoformat().replace('+00:00', 'Z'),
+                     end_datetime=row.end_datetime.isoformat().replace('+00:00', 'Z'),
+                     datetime=row.datetime.isoformat().replace('+00:00', 'Z'),
+                     burstId=row.burstId, passDirection=row.passDirection,
+                     perpendicularBaseline=row.perpendicularBaseline)
+        items.append(dict(type='Feature', stac_version='1.0.0', id=row.id, collection=row.collection,
+                          geometry=shapely.geometry.mapping(row.geometry),
+                          bbox=[row.xmin, row.ymin, row.xmax, row.ymax],
+                          properties=props, assets=json.loads(row.assets), links=json.loads(row.links)))
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Partitioned stac-geoparquet inventory of fufiters products")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add = subparsers.add_parser('add', help='Add STAC Items (Collection or Item JSON files) to inventory')
+    add.add_argument('inventory', help='Inventory directory (local or s3://)')
+    add.add_argument('files', nargs='+', help='collection.json or Item JSON files')
+
+    q = subparsers.add_parser('query', help='Query inventory')
+    q.add_argument('inventory', help='Inventory directory (local or s3://)')
+    q.add_argument('--burst', nargs='+', help='Burst IDs (e.g. 012_023790_IW1)')
+    q.add_argument('--bbox', nargs=4, type=float, metavar=('XMIN', 'YMIN', 'XMAX', 'YMAX'))
+    q.add_argument('--start', help='Pairs ending after (e.g. 2019-01-01)')
+    q.add_argument('--end', help='Pairs starting before (e.g. 2021-12-31)')
+    q.add_argument('--baseline', nargs=2, type=float, metavar=('MIN', 'MAX'), help='Perpendicular baseline range (m)')
+    q.add_argument('--product', choices=['insar', 'offsets'])
+    q.add_argument('--polarization')
+    q.add_argument('--dt', type=int, help='Temporal baseline in days')
+    q.add_argument('-o', '--output', help='Save results (.parquet, .geojson or .csv)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'add':
+        import pystac
+        items = []
+        for file in args.files:
+            obj = pystac.read_file(file)
+            items.extend(obj.get_items() if isinstance(obj, pystac.Catalog) else [obj])
+        write(args.inventory, items)
+        return
+
+    gf = query(args.inventory, burst=args.burst, bbox=args.bbox, start=args.start, end=args.end,
+               baseline=args.baseline, product=args.product, polarization=args.polarization,
+               dt_days=args.dt)
+    print(f'{len(gf)} products')
+    print(gf.loc[:, ['id', 'burstId', 'start_datetime', 'end_datetime', 'perpendicularBaseline']].to_string())
+    if args.output:
+        if args.output.endswith('.parquet'):
+            gf.to_parquet(args.output)
+        elif args.output.endswith('.csv'):
+            gf.drop(columns='geometry').to_csv(args.output, index=False)
+        else:
+            gf.to_file(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+fufiters command line interface
+
+Only argparse is imported at startup, each subcommand imports the modules it needs
+(asf_search, geopandas, rasterio, ...) after its arguments are parsed, so --help and
+argument errors return immediately.
+
+Example:
+    fufiters find-bursts 86.925 27.988
+    fufiters find-slcs 012_023790_IW1 -s 2020-01-01
+    fufiters plan-pairs --burst 012_023790_IW1 --year 2020 --npairs 3
+    fufiters stac s3://fufiters/insar/012_023790_IW1 --dest catalog
+"""
+import argparse
+import importlib
+import os
+import sys
+
+from fufiters import __version__
+
+# Subcommands handled by the main() of a fufiters module
+MODULE_COMMANDS = {
+    'stac': ('fufiters.stac', 'Create STAC Items/Collection for product folders (no paths: current directory)'),
+    'catalog': ('fufiters.catalog', 'Add to or query the stac-geoparquet product inventory'),
+    'aoi': ('fufiters.aoi', 'Bursts covering an AOI polygon'),
+    'report': ('fufiters.report', 'Stack completeness and revisit gaps for many bursts'),
+    'timing': ('fufiters.timing', 'ISCE2 step timings from STAC Items'),
+    'datacube': ('fufiters.datacube', 'Build or extend a Zarr time series cube for one burst from STAC Items'),
+    'upload': ('fufiters.manifest', 'Upload new or changed files of a product folder (content-hash manifest)'),
+    'prefetch': ('fufiters.prefetch', 'List or download DEM tiles from a plan-pairs prefetch manifest'),
+    'watermarks': ('fufiters.forward', 'Show, reset or update plan-pairs --forward watermarks'),
+    'cog': ('fufiters.cog', 'Convert product rasters to COGs, validate layout and benchmark reads'),
+    'run': ('fufiters.runner', 'Run a plan-pairs matrix locally on a bounded process pool'),
+    'mosaic': ('fufiters.mosaic', 'Per-date regional VRT mosaics or MosaicJSON of burst products'),
+}
+
+
+def find_bursts(args):
+    from fufiters import bursts
+
+    if args.asf:
+        gf = bursts.find_bursts(args.lon, args.lat)
+    else:
+        gf = bursts.find_bursts_local(args.lon, args.lat)
+
+    if args.show_plot:
+        #bursts.static_map(gf, args.lon, args.lat)
+        bursts.slippy_map(gf, args.lon, args.lat)
+
+
+def find_slcs(args):
+    from fufiters import slcs
+
+    if len(args.burstID) > 1:
+        import pandas as pd
+        from fufiters import asyncsearch
+        stacks, stats = asyncsearch.inventory(args.burstID, args.start, args.end,
+                                              max_concurrent=args.max_concurrent, timeout=args.timeout)
+        print(stats.to_string())
+        if args.geojson and stacks:
+            gf = pd.concat(stacks.values(), ignore_index=True)
+            gf.drop(columns='s3Urls', errors='ignore').to_file('/tmp/SLCs.geojson', driver='GeoJSON')
+        return
+
+    burstID = args.burstID[0]
+    gfB = slcs.get_burst_metadata(burstID)
+    gf = slcs.search_for_slcs(gfB, args.start, args.end)
+
+    # Dump entire list of SLCs
+    print('------------------------------------')
+    print('\n'.join(gf.sceneName.to_list()))
+
+    if args.geojson:
+        gf.to_file(f'/tmp/{burstID}.geojson', driver='GeoJSON')
+
+    if args.show_plot:
+        slcs.slippy_map(gf, gfB)
+        slcs.timeline(gf, burstID)
+
+
+def plan_pairs(args):
+    from fufiters import actions
+
+    if args.forward:
+        from fufiters import forward
+
+        outputs, state = actions.forward_pairs(burst_ids=args.burst, aoi=args.aoi, polarization=args.polarization,
+                                               npairs=args.npairs, offsets_dt=args.offsets_dt, looks=args.looks,
+                                               inventory=args.inventory, force=args.force,
+                                               pairs_per_job=args.pairs_per_job, watermarks=args.watermarks,
+                                               since=args.since, max_jobs=args.max_jobs)
+        actions.write_outputs(outputs, args.github_output)
+        if args.pending_watermarks:
+            print('Pending', forward.save(state, args.pending_watermarks))
+        else:
+            print('Saved', forward.save(state, args.watermarks))
+        return
+
+    if args.offsets_dt is None and args.year is None:
+        raise SystemExit('plan-pairs: --year is required unless --offsets-dt or --forward is set')
+    outputs = actions.plan_pairs(burst_ids=args.burst, aoi=args.aoi, polarization=args.polarization,
+                                 year=args.year, npairs=args.npairs, offsets_dt=args.offsets_dt,
+                                 looks=args.looks, inventory=args.inventory, force=args.force,
+                                 pairs_per_job=args.pairs_per_job, max_jobs=args.max_jobs)
+    actions.write_outputs(outputs, args.github_output)
+
+
+def random_pair(args):
+    from fufiters import actions
+
+    outputs = actions.random_pair(args.aoi, stratify=args.stratify)
+    actions.write_outputs(outputs, args.github_output)
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(prog='fufiters', description="Sentinel-1 burst InSAR time series tools")
+    parser.add_argument("--version", action="version", version=f"fufiters {__version__}")
+    subparsers = parser.add_subparsers(dest='command', required=True, metavar='command')
+
+    p = subparsers.add_parser('find-bursts', help='Find burstIDs that cover a point')
+    p.add_argument("lon", type=float, help="Longitude")
+    p.add_argument("lat", type=float, help="Latitude")
+    p.add_argument("-p", "--show-plot", default=False, action="store_true", help="Plot burstIDs on a map")
+    p.add_argument("-a", "--asf", default=False, action="store_true", help="Search ASF instead of local burst map")
+    p.set_defaults(func=find_bursts)
+
+    p = subparsers.add_parser('find-slcs', help='Find SLCs containing burst(s)')
+    p.add_argument("burstID", type=str, nargs='+', help="BurstID(s) (e.g. 106_227373_IW2)")
+    p.add_argument("-s", "--start", default=None, type=str, help="Start date (e.g. 2017-01-01)")
+    p.add_argument("-e", "--end", default=None, type=str, help="End date (e.g. 2023-01-01)")
+    p.add_argument("-g", "--geojson", default=False, action="store_true", help="Save GeoJSON metadata")
+    p.add_argument("-p", "--show-plot", default=False, action="store_true", help="Show map of SLC footprints")
+    p.add_argument("-c", "--max-concurrent", default=8, type=int, help="Concurrent requests for several burstIDs")
+    p.add_argument("-t", "--timeout", default=60, type=int, help="Per-request timeout in seconds for several burstIDs")
+    p.set_defaults(func=find_slcs)
+
+    p = subparsers.add_parser('plan-pairs', help='Plan burst pairs as GitHub Actions matrix jobs')
+    p.add_argument("--burst", nargs='+', default=[], help="Burst IDs (e.g. 012_023790_IW1)")
+    p.add_argument("--aoi", default=None, help="Plan every burst in an AOI polygon file instead")
+    p.add_argument("--polarization", default='VV', help="Polarization")
+    p.add_argument("--year", type=int, default=None, help="Year of reference acquisitions")
+    p.add_argument("--npairs", type=int, default=3, help="n+1..n+npairs pairs per reference")
+    p.add_argument("--offsets-dt", type=int, default=None, help="Offset pairs DT years apart instead")
+    p.add_argument("--looks", default=None, help="Looks (e.g. 20x4) for finding existing products")
+    p.add_argument("--inventory", default=None, help="Skip pairs with complete products in this store, catalog or manifest")
+    p.add_argument("--force", nargs='+', default=[], help="Pair names to re-process anyway")
+    p.add_argument("--pairs-per-job", type=int, default=None, help="Also output packed jobs sharing acquisitions")
+    p.add_argument("--max-jobs", type=int, default=None, help="Cap on packed jobs (more pairs per job if needed)")
+    p.add_argument("--forward", default=False, action="store_true",
+                   help="Only pairs completed by acquisitions after each burst's watermark, then advance it")
+    p.add_argument("--watermarks", default=None, help="Watermarks JSON file or URL (default: cache)")
+    p.add_argument("--since", default=None, help="Watermark for bursts without one (default: newest acquisition)")
+    p.add_argument("--pending-watermarks", default=None,
+                   help="Write advanced watermarks here, save them after processing with `watermarks --update`")
+    p.add_argument("--github-output", default=os.environ.get('GITHUB_OUTPUT'),
+                   help="Append outputs to this file (default $GITHUB_OUTPUT, or print)")
+    p.set_defaults(func=plan_pairs)
+
+    p = subparsers.add_parser('random-pair', help='Pick a random burst pair in an AOI (nightly test)')
+    p.add_argument("--aoi", default='nepal.geojson', help="AOI polygon file")
+    p.add_argument("--stratify", default='track', help="Sample bursts evenly across 'track', 'subswath' or 'track-subswath'")
+    p.add_argument("--github-output", default=os.environ.get('GITHUB_OUTPUT'),
+                   help="Append outputs to this file (default $GITHUB_OUTPUT, or print)")
+    p.set_defaults(func=random_pair)
+
+    for name, (_, description) in MODULE_COMMANDS.items():
+        subparsers.add_parser(name, help=description, add_help=False)
+
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in MODULE_COMMANDS:
+        module = importlib.import_module(MODULE_COMMANDS[argv[0]][0])
+        sys.argv[0] = f'fufiters {argv[0]}'
+        return module.main(argv[1:])
+
+    args = get_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+"""
+Convert product rasters to Cloud Optimized GeoTIFFs, validate their layout and benchmark reads
+
+All GeoTIFFs of a product folder are converted concurrently with the GDAL COG driver
+(tile BLOCKSIZE, DEFLATE/ZSTD/LERC compression, predictor and overview count are
+configurable), replacing each file atomically. Validation reads the TIFF structure
+directly: every image must be tiled, rasters larger than one tile must have overviews,
+and IFDs must come first with overview data before full resolution data, so a reader
+gets the header and any overview with a few range requests. Benchmarks time opening,
+random block-aligned windows and a decimated overview read, to compare settings (sweep)
+for the time series reads.
+
+Example:
+    results = cog.convert_product('S1_023790_IW1_20230621_20230703_VV_INT80', compress='zstd')
+    cog.validate('S1_..._unw_phase.tif')
+    python -m fufiters.cog S1_023790_IW1_20230621_20230703_VV_INT80 --compress zstd --benchmark
+    python -m fufiters.cog --sweep S1_..._unw_phase.tif
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import glob
+import os
+import shutil
+import struct
+import tempfile
+import time
+
+BLOCKSIZE = 512
+COMPRESSION = ['deflate', 'zstd', 'lerc', 'lerc_deflate', 'lerc_zstd']
+WORKERS = 4
+# Overviews of discrete rasters (and wrapped phase) are not averaged
+NEAREST = ('_conncomp.tif', '_wrapped_phase.tif', '_water_mask.tif')
+# Settings compared by sweep()
+SWEEP = [
+    dict(compress='deflate'),
+    dict(compress='zstd'),
+    dict(compress='lerc'),
+    dict(compress='lerc_zstd', max_z_error=0.001),
+    dict(compress='zstd', blocksize=256),
+    dict(compress='zstd', blocksize=1024),
+]
+
+# TIFF tags used by validate()
+NEW_SUBFILE_TYPE = 254
+TILE_WIDTH = 322
+TILE_OFFSETS = 324
+STRIP_OFFSETS = 273
+# Mask IFDs have bit 4 of NewSubfileType set
+MASK = 4
+TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8, 16: 8, 17: 8, 18: 8}
+TYPE_FORMATS = {1: 'B', 3: 'H', 4: 'I', 16: 'Q'}
+
+
+def creation_options(href, blocksize=BLOCKSIZE, compress='deflate', predictor='auto', overviews='auto',
+                     max_z_error=0, level=None, threads='ALL_CPUS'):
+    """GDAL COG driver options for one file"""
+    options = dict(BLOCKSIZE=blocksize, COMPRESS=compress.upper(), NUM_THREADS=threads,
+                   OVERVIEW_RESAMPLING='NEAREST' if href.endswith(NEAREST) else 'AVERAGE')
+    if compress.startswith('lerc'):
+        options['MAX_Z_ERROR'] = max_z_error
+    else:
+        # YES: horizontal differencing for integers, floating point predictor for floats
+        options['PREDICTOR'] = {'auto': 'YES', 'none': 'NO', None: 'NO', '2': 'STANDARD', 2: 'STANDARD',
+                                '3': 'FLOATING_POINT', 3: 'FLOATING_POINT'}[predictor]
+    if level is not None:
+        options['LEVEL'] = level
+    if overviews == 'none' or overviews == 0:
+        options['OVERVIEWS'] = 'NONE'
+    elif overviews != 'auto':
+        options['OVERVIEW_COUNT'] = int(overviews)
+    return options
+
+
+def convert(href, dest=None, **settings):
+    """Write href as a COG to dest (default: replace href), returns dest"""
+    import rasterio
+    import rasterio.shutil
+
+    dest = dest or href
+    tmp = f'{dest}.{os.getpid()}.tmp'
+    with rasterio.Env(GDAL_NUM_THREADS='ALL_CPUS'):
+        rasterio.shutil.copy(href, tmp, driver='COG', **creation_options(href, **settings))
+    os.replace(tmp, dest)
+    return dest
+
+
+def _read_ifds(f):
+    """(offset, NewSubfileType, tiled, first data offset) of every IFD in an open TIFF file"""
+    header = f.read(16)
+    order = {b'II': '<', b'MM': '>'}[header[:2]]
+    bigtiff = struct.unpack(order + 'H', header[2:4])[0] == 43
+    if bigtiff:
+        count_fmt, entry_fmt, entry_size, next_fmt = 'Q', 'HHQ8s', 20, 'Q'
+        offset = struct.unpack(order + 'Q', header[8:16])[0]
+    else:
+        count_fmt, entry_fmt, entry_size, next_fmt = 'H', 'HHI4s', 12, 'I'
+        offset = struct.unpack(order + 'I', header[4:8])[0]
+
+    ifds = []
+    while offset:
+        f.seek(offset)
+        count_size = struct.calcsize(count_fmt)
+        count = struct.unpack(order + count_fmt, f.read(count_size))[0]
+        entries = f.read(count * entry_size + struct.calcsize(next_fmt))
+        tags = {}
+        for i in range(count):
+            tag, dtype, n, value = struct.unpack(order + entry_fmt, entries[i * entry_size:(i + 1) * entry_size])
+            tags[tag] = (dtype, n, value)
+
+        def first(tag):
+            dtype, n, value = tags[tag]
+            size = TYPE_SIZES[dtype]
+            if size * n > len(value):
+                # Values stored elsewhere, value is their offset
+                f.seek(struct.unpack(order + ('Q' if bigtiff else 'I'), value)[0])
+                value = f.read(size)
+            return struct.unpack(order + TYPE_FORMATS[dtype], value[:size])[0]
+
+        data_tag = TILE_OFFSETS if TILE_OFFSETS in tags else STRIP_OFFSETS
+        ifds.append(dict(offset=offset, subfile=first(NEW_SUBFILE_TYPE) if NEW_SUBFILE_TYPE in tags else 0,
+                         tiled=TILE_WIDTH in tags, data=first(data_tag)))
+        offset = struct.unpack(order + next_fmt, entries[count * entry_size:])[0]
+    return ifds
+
+
+def validate(href, blocksize=None):
+    """Layout problems of a (local or remote) GeoTIFF as a list of messages, empty for a valid COG"""
+    import fsspec
+    import rasterio
+
+    from fufiters.rasterinfo import GDAL_ENV
+
+    errors = []
+    with rasterio.Env(**GDAL_ENV), rasterio.open(href) as src:
+        block_rows, block_cols = src.block_shapes[0]
+        if blocksize is not None and (block_rows, block_cols) != (blocksize, blocksize):
+            errors.append(f'blocks are {block_rows}x{block_cols}, expected {blocksize}x{blocksize}')
+        # Striped files have full width blocks, so compare against the COG tile size
+        if max(src.width, src.height) > (blocksize or BLOCKSIZE) and not src.overviews(1):
+            errors.append(f'no overviews for {src.width}x{src.height} raster')
+
+    with fsspec.open(href, 'rb') as f:
+        ifds = _read_ifds(f)
+    if not all(ifd['tiled'] for ifd in ifds):
+        errors.append('not tiled')
+    if max(ifd['offset'] for ifd in ifds) > min(ifd['data'] for ifd in ifds):
+        errors.append('IFDs are not all before image data')
+    images = [ifd['data'] for ifd in ifds if not ifd['subfile'] & MASK]
+    # Full resolution first in the IFD chain, its data last: data offsets decrease along the chain
+    if any(a < b for a, b in zip(images, images[1:])):
+        errors.append('overview data is not before full resolution data')
+    return errors
+
+
+def benchmark(href, window=BLOCKSIZE, samples=20, overview_size=1024, seed=0):
+    """Median milliseconds to open, read random block-aligned windows and a decimated overview"""
+    import numpy as np
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.windows import Window
+
+    from fufiters.rasterinfo import GDAL_ENV
+
+    rng = np.random.default_rng(seed)
+    opens, windows, overviews = [], [], []
+    with rasterio.Env(**GDAL_ENV):
+        for _ in range(samples):
+            start = time.perf_counter()
+            with rasterio.open(href) as src:
+                opens.append(time.perf_counter() - start)
+                rows, cols = src.block_shapes[0]
+                row = rng.integers(0, max(1, src.height // rows)) * rows
+                col = rng.integers(0, max(1, src.width // cols)) * cols
+                start = time.perf_counter()
+                src.read(1, window=Window(col, row, min(window, src.width - col), min(window, src.height - row)))
+                windows.append(time.perf_counter() - start)
+        with rasterio.open(href) as src:
+            scale = max(src.width, src.height) / overview_size
+            out_shape = (max(1, round(src.height / scale)), max(1, round(src.width / scale)))
+            for _ in range(samples):
+                start = time.perf_counter()
+                src.read(1, out_shape=out_shape, resampling=Resampling.nearest)
+                overviews.append(time.perf_counter() - start)
+    return dict(open_ms=1000 * np.median(opens), window_ms=1000 * np.median(windows),
+                overview_ms=1000 * np.median(overviews))
+
+
+def rasters(product_dir):
+    """GeoTIFFs in a product folder"""
+    return sorted(glob.glob(os.path.join(product_dir, '*.tif')))
+
+
+def convert_product(product_dir, workers=WORKERS, validate_files=True, run_benchmark=False, **settings):
+    """Convert every GeoTIFF of a product folder concurrently, one row of results per file"""
+    import pandas as pd
+
+    def run(href):
+        size = os.path.getsize(href)
+        start = time.perf_counter()
+        convert(href, **settings)
+        row = dict(file=os.path.basename(href), input_mb=size / 1024**2,
+                   output_mb=os.path.getsize(href) / 1024**2, seconds=time.perf_counter() - start)
+        if validate_files:
+            row['errors'] = '; '.join(validate(href, settings.get('blocksize', BLOCKSIZE)))
+        if run_benchmark:
+            row.update(benchmark(href))
+        return row
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return pd.DataFrame(list(executor.map(run, rasters(product_dir))))
+
+
+def sweep(href, settings=SWEEP):
+    """Size, write time and read latency of one raster for each settings dict"""
+    import pandas as pd
+
+    rows = []
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for i, options in enumerate(settings):
+            dest = os.path.join(tmpdir, f'{i}_{os.path.basename(href)}')
+            start = time.perf_counter()
+            convert(href, dest, **options)
+            rows.append(dict(**{'compress': 'deflate', 'blocksize': BLOCKSIZE, **options},
+                             mb=os.path.getsize(dest) / 1024**2, write_s=time.perf_counter() - start,
+                             errors='; '.join(validate(dest, options.get('blocksize', BLOCKSIZE))),
+                             **benchmark(dest)))
+    finally:
+        shutil.rmtree(tmpdir)
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert product rasters to COGs, validate layout and benchmark reads")
+    parser.add_argument("paths", nargs='+', help="Product folders or GeoTIFF files")
+    parser.add_argument("-b", "--blocksize", default=BLOCKSIZE, type=int, help="Tile size in pixels")
+    parser.add_argument("-c", "--compress", default='deflate', choices=COMPRESSION, help="Compression")
+    parser.add_argument("-p", "--predictor", default='auto', choices=['auto', 'none', '2', '3'],
+                        help="Predictor (auto: 2 for integers, 3 for floats, ignored by LERC)")
+    parser.add_argument("-o", "--overviews", default='auto',
+                        help="Number of overview levels ('auto': until smaller than a tile, 'none')")
+    parser.add_argument("-z", "--max-z-error", default=0, type=float, help="LERC maximum error (0 is lossless)")
+    parser.add_argument("-w", "--workers", default=WORKERS, type=int, help="Files converted concurrently")
+    parser.add_argument("--validate-only", default=False, action="store_true", help="Only check the layout")
+    parser.add_argument("--benchmark", default=False, action="store_true", help="Time window and overview reads")
+    parser.add_argument("--sweep", default=False, action="store_true",
+                        help="Compare settings on copies of each file (files are not changed)")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+
+    files = [f for path in args.paths for f in (rasters(path) if os.path.isdir(path) else [path])]
+    pd.set_option('display.width', 200)
+    if args.sweep:
+        for href in files:
+            print(href)
+            print(sweep(href).round(2).to_string(index=False))
+        return
+    if args.validate_only:
+        invalid = 0
+        for href in files:
+            errors = validate(href)
+            invalid += bool(errors)
+            print(href, '; '.join(errors) if errors else 'valid COG')
+        if invalid:
+            raise SystemExit(f'{invalid} of {len(files)} files are not valid COGs')
+        return
+
+    overviews = args.overviews if args.overviews in ('auto', 'none') else int(args.overviews)
+    settings = dict(blocksize=args.blocksize, compress=args.compress, predictor=args.predictor,
+                    overviews=overviews, max_z_error=args.max_z_error)
+    for path in args.paths:
+        if os.path.isdir(path):
+            results = convert_product(path, args.workers, run_benchmark=args.benchmark, **settings)
+        else:
+            convert(path, **settings)
+            results = pd.DataFrame([dict(file=path, errors='; '.join(validate(path, args.blocksize)),
+                                         **(benchmark(path) if args.benchmark else {}))])
+        print(results.round(2).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+"""
+Shared settings for fufiters modules
+"""
+import os
+from pathlib import Path
+
+
+def get_cache_dir(*subdirs):
+    """Local cache directory, override root with FUFITERS_CACHE environment variable"""
+    root = Path(os.environ.get('FUFITERS_CACHE', Path.home() / '.cache' / 'fufiters'))
+    path = root.joinpath(*subdirs)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
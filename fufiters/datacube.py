@@ -0,0 +1,243 @@
+"""
+Chunked Zarr time series cube of one burst from STAC Items
+
+Unwrapped phase, coherence and azimuth/range offsets of every pair are written to a
+(pair, y, x) Zarr group with reference/secondary dates, temporal and perpendicular baseline
+as pair coordinates. The cube grid is the union of the product grids (same CRS and pixel
+spacing). COGs are read concurrently, one pair per worker, in row strips aligned to the
+cube chunks, so memory stays at about workers x CHUNK_Y rows. Running again with new
+Items appends their pairs along the pair dimension without rewriting existing chunks
+(pairs are in order of addition, products outside the cube grid are clipped).
+
+Requires zarr>=3 (and xarray to open the cube).
+
+Example:
+    datacube.build(items, 'cubes/012_023790_IW1.zarr')
+    ds = xarray.open_dataset('cubes/012_023790_IW1.zarr', engine='zarr')
+    python -m fufiters.datacube catalog/collection.json --burst 012_023790_IW1 -o cube.zarr
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+
+# Cube variable for each STAC asset key
+VARIABLES = {
+    'unwrapped': 'unwrapped_phase',
+    'corr': 'coherence',
+    'azimuth_offsets': 'azimuth_offsets',
+    'range_offsets': 'range_offsets',
+}
+CHUNK_Y = 512
+CHUNK_X = 512
+WORKERS = 8
+EPOCH = '1970-01-01'
+PAIR_COORDS = ['reference', 'secondary', 'dt_days', 'baseline']
+# Assets written by each product type (for Items without raster:bands)
+PRODUCT_ASSETS = {'insar': ['unwrapped', 'corr'], 'offsets': ['azimuth_offsets', 'range_offsets']}
+
+
+def data_assets(item):
+    """Keys of VARIABLES assets with data: those with raster:bands, or by product type"""
+    keys = [key for key in VARIABLES if key in item['assets']]
+    if any('raster:bands' in asset for asset in item['assets'].values()):
+        return [key for key in keys if 'raster:bands' in item['assets'][key]]
+    from fufiters.catalog import product_type
+    return [key for key in keys if key in PRODUCT_ASSETS[product_type(item)]]
+
+
+def pair_table(items):
+    """One row per Item (pair) with dates, baselines, grid and asset hrefs, sorted by dates"""
+    import numpy as np
+    import pandas as pd
+
+    rows = []
+    for item in items:
+        item = item if isinstance(item, dict) else item.to_dict()
+        props = item['properties']
+        epsg = props.get('proj:epsg') or int(str(props.get('proj:code', ':0')).split(':')[-1])
+        keys = data_assets(item)
+        rows.append(dict(
+            id=item['id'],
+            burstId=props.get('burstId'),
+            reference=pd.Timestamp(props['start_datetime']).tz_localize(None).floor('D'),
+            secondary=pd.Timestamp(props['end_datetime']).tz_localize(None).floor('D'),
+            baseline=float(props.get('perpendicularBaseline', np.nan)),
+            epsg=epsg,
+            transform=tuple(props['proj:transform'][:6]),
+            shape=tuple(props['proj:shape']),
+            **{var: item['assets'][key]['href'] if key in keys else None for key, var in VARIABLES.items()},
+        ))
+    df = pd.DataFrame(rows)
+    if len(df) == 0:
+        return df
+    df['name'] = df.reference.dt.strftime('%Y%m%d') + '_' + df.secondary.dt.strftime('%Y%m%d')
+    df['dt_days'] = (df.secondary - df.reference).dt.days
+    return df.sort_values(by=['reference', 'secondary']).drop_duplicates(subset='name', keep='last').reset_index(drop=True)
+
+
+def union_grid(pairs):
+    """(epsg, transform, height, width) covering every product grid"""
+    if pairs.epsg.nunique() > 1:
+        raise ValueError(f'Products are in several CRS: {sorted(pairs.epsg.unique())}')
+    res = {(t[0], t[4]) for t in pairs['transform']}
+    if len(res) > 1:
+        raise ValueError(f'Products have different pixel spacing: {sorted(res)}')
+    (xres, yres), = res
+    x0 = min(t[2] for t in pairs['transform'])
+    y0 = max(t[5] for t in pairs['transform'])
+    x1 = max(t[2] + s[1] * xres for t, s in zip(pairs['transform'], pairs['shape']))
+    y1 = min(t[5] + s[0] * yres for t, s in zip(pairs['transform'], pairs['shape']))
+    width = int(round((x1 - x0) / xres))
+    height = int(round((y1 - y0) / yres))
+    return int(pairs.epsg.iloc[0]), (xres, 0.0, x0, 0.0, yres, y0), height, width
+
+
+def create(path, pairs, variables, chunks=(CHUNK_Y, CHUNK_X)):
+    """Empty cube (no pairs yet) on the union grid of pairs"""
+    import numpy as np
+    import zarr
+
+    epsg, transform, height, width = union_grid(pairs)
+    xres, _, x0, _, yres, y0 = transform
+    group = zarr.open_group(path, mode='w')
+    group.attrs.update(crs=f'EPSG:{epsg}', transform=list(transform), burstId=pairs.burstId.iloc[0],
+                       coordinates=' '.join(PAIR_COORDS))
+
+    # Pixel centers
+    x = group.create_array('x', shape=(width,), chunks=(width,), dtype='float64', dimension_names=['x'])
+    x[:] = x0 + (np.arange(width) + 0.5) * xres
+    y = group.create_array('y', shape=(height,), chunks=(height,), dtype='float64', dimension_names=['y'])
+    y[:] = y0 + (np.arange(height) + 0.5) * yres
+
+    group.create_array('pair', shape=(0,), chunks=(4096,), dtype=str, dimension_names=['pair'])
+    for name in ['reference', 'secondary']:
+        group.create_array(name, shape=(0,), chunks=(4096,), dtype='int32', dimension_names=['pair'],
+                           attributes=dict(units=f'days since {EPOCH}', calendar='proleptic_gregorian'))
+    group.create_array('dt_days', shape=(0,), chunks=(4096,), dtype='int16', dimension_names=['pair'])
+    group.create_array('baseline', shape=(0,), chunks=(4096,), dtype='float32', dimension_names=['pair'],
+                       attributes=dict(long_name='perpendicular baseline', units='m'))
+    for var in variables:
+        group.create_array(var, shape=(0, height, width), chunks=(1, *chunks), dtype='float32',
+                           fill_value=np.nan, dimension_names=['pair', 'y', 'x'])
+    return group
+
+
+def _grid(group):
+    xres, _, x0, _, yres, y0 = group.attrs['transform']
+    height, width = group['y'].shape[0], group['x'].shape[0]
+    return x0, y0, xres, yres, height, width
+
+
+def write_pair(group, index, row, variables, gdal_env=None):
+    """Copy the COGs of one pair into cube index, reading row strips aligned to cube chunks"""
+    import numpy as np
+    import rasterio
+    from rasterio.windows import Window
+    from fufiters.rasterinfo import GDAL_ENV
+
+    x0, y0, xres, yres, height, width = _grid(group)
+    with rasterio.Env(**(gdal_env or GDAL_ENV)):
+        for var in variables:
+            href = row[var]
+            if href is None:
+                continue
+            array = group[var]
+            chunk_y = array.chunks[1]
+            with rasterio.open(href) as src:
+                # Product origin in cube pixels (products share the cube pixel spacing)
+                col = int(round((src.transform.c - x0) / xres))
+                row0 = int(round((src.transform.f - y0) / yres))
+                c0, c1 = max(col, 0), min(col + src.width, width)
+                r0, r1 = max(row0, 0), min(row0 + src.height, height)
+                # Strips end on cube chunk boundaries so each write fills whole chunk rows
+                bounds = list(range((r0 // chunk_y + 1) * chunk_y, r1, chunk_y))
+                for start, stop in zip([r0] + bounds, bounds + [r1]):
+                    window = Window(c0 - col, start - row0, c1 - c0, stop - start)
+                    data = src.read(1, window=window, masked=True).astype('float32').filled(np.nan)
+                    array[index, start:stop, c0:c1] = data
+    return row['name']
+
+
+def build(items, path, variables=None, chunks=(CHUNK_Y, CHUNK_X), workers=WORKERS, gdal_env=None):
+    """Create or append to the cube at path with pairs not already in it, returns number of new pairs"""
+    import numpy as np
+    import zarr
+
+    pairs = pair_table(items)
+    if len(pairs) == 0:
+        print('No Items')
+        return 0
+    if pairs.burstId.nunique() > 1:
+        raise ValueError(f'Items from several bursts: {sorted(pairs.burstId.unique())}, build one cube per burst')
+
+    try:
+        group = zarr.open_group(path, mode='r+')
+    except FileNotFoundError:
+        group = None
+    if group is None or 'pair' not in group:
+        if variables is None:
+            variables = [var for var in VARIABLES.values() if pairs[var].notna().any()]
+        group = create(path, pairs, variables, chunks)
+    else:
+        if group.attrs['burstId'] != pairs.burstId.iloc[0]:
+            raise ValueError(f"Cube is for {group.attrs['burstId']}, Items are for {pairs.burstId.iloc[0]}")
+        variables = [var for var in VARIABLES.values() if var in group]
+        existing = set(group['pair'][:].tolist())
+        pairs = pairs[~pairs.name.isin(existing)].reset_index(drop=True)
+
+    if len(pairs) == 0:
+        print('Cube is up to date')
+        return 0
+
+    # Grow every pair-dimension array, data chunks of new pairs are written independently
+    start = group['pair'].shape[0]
+    stop = start + len(pairs)
+    for var in variables:
+        group[var].resize((stop, *group[var].shape[1:]))
+
+    print(f'Writing {len(pairs)} pairs ({", ".join(variables)}) to {path}')
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(write_pair, group, start + i, row, variables, gdal_env)
+                   for i, row in pairs.iterrows()]
+        for future in futures:
+            future.result()
+
+    # Coordinates last, so an interrupted append leaves no pair names without data
+    epoch = np.datetime64(EPOCH, 'D')
+    values = dict(pair=pairs.name.to_numpy(dtype=str),
+                  reference=((pairs.reference.values.astype('datetime64[D]') - epoch).astype('int32')),
+                  secondary=((pairs.secondary.values.astype('datetime64[D]') - epoch).astype('int32')),
+                  dt_days=pairs.dt_days.values.astype('int16'),
+                  baseline=pairs.baseline.values.astype('float32'))
+    for name, value in values.items():
+        group[name].resize((stop,))
+        group[name][start:stop] = value
+    return len(pairs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or extend a Zarr time series cube for one burst")
+    parser.add_argument("source", help="collection.json, Item JSON, or stac-geoparquet inventory directory")
+    parser.add_argument("-b", "--burst", default=None, help="Burst ID (required if source has several bursts)")
+    parser.add_argument("-o", "--output", required=True, help="Zarr store (local path or fsspec URL)")
+    parser.add_argument("-v", "--variables", nargs='+', default=None, choices=list(VARIABLES.values()),
+                        help="Variables for a new cube (default: all with assets)")
+    parser.add_argument("-c", "--chunks", nargs=2, type=int, default=[CHUNK_Y, CHUNK_X], help="y x chunk size")
+    parser.add_argument("-w", "--workers", default=WORKERS, type=int, help="Pairs read concurrently")
+    args = parser.parse_args(argv)
+
+    if args.source.endswith('.json'):
+        import pystac
+        obj = pystac.read_file(args.source)
+        items = [item.to_dict() for item in (obj.get_items(recursive=True) if isinstance(obj, pystac.Catalog) else [obj])]
+        if args.burst:
+            items = [item for item in items if item['properties'].get('burstId') == args.burst]
+    else:
+        from fufiters import catalog
+        items = catalog.to_items(catalog.query(args.source, burst=args.burst))
+
+    n = build(items, args.output, args.variables, tuple(args.chunks), args.workers)
+    print(f'{n} pairs added')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Forward planning of the pairs completed by newly arrived acquisitions
+
+Every tracked burst has a watermark: the newest acquisition already planned, plus the
+last npairs acquisitions before it (the references of future n+k pairs). A run searches
+only for SLCs after the oldest watermark on each relative orbit (offset plans search from
+DT years earlier, where the new references are), plans the n+1..n+k pairs whose secondary
+is new or the DT-year pairs whose reference became eligible, paired exactly as the batch
+planner would pair them, and then advances the watermarks. Bursts without a watermark
+start at `since`, or at the newest acquisition (the first run then plans nothing).
+
+Watermarks of each plan (e.g. insar_n3, offsets_dt1) are kept in one JSON file, locally
+(replaced atomically) or at an fsspec URL (written with a single PUT). Workflows write the
+advanced watermarks to a pending file and only save them once every planned pair has been
+processed (`--update`), so a failed run plans the same pairs again.
+
+Example:
+    table, state = forward.plan(gfb, forward.load('watermarks.json'), npairs=3)
+    forward.save(state, 'watermarks.json')
+    fufiters plan-pairs --forward --aoi nepal.geojson --npairs 3
+    python -m fufiters.forward s3://fufiters/forward/watermarks.json --update watermarks_pending.json
+"""
+import argparse
+import datetime
+import json
+import os
+
+from fufiters.config import get_cache_dir
+
+# Acquisitions searched before `since` for the references of bursts without a watermark
+INIT_LOOKBACK = datetime.timedelta(days=90)
+# Extra search before the first new offset reference
+OFFSETS_MARGIN = datetime.timedelta(days=30)
+
+
+def default_path():
+    return str(get_cache_dir('forward') / 'watermarks.json')
+
+
+def plan_key(npairs=3, dt=None):
+    """Watermarks are kept separately for each kind of plan"""
+    return f'offsets_dt{dt}' if dt else f'insar_n{npairs}'
+
+
+def load(path=None):
+    """{plan key: {burstId: watermark}} from a local or remote JSON file ({} if there is none)"""
+    import fsspec
+
+    try:
+        with fsspec.open(path or default_path(), 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save(state, path=None):
+    """Write watermarks, replacing the previous file in one step"""
+    import fsspec
+    from fsspec.implementations.local import LocalFileSystem
+
+    path = path or default_path()
+    text = json.dumps(state, indent=1, sort_keys=True)
+    fs, fs_path = fsspec.core.url_to_fs(path)
+    if isinstance(fs, LocalFileSystem):
+        tmp = f'{fs_path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            f.write(text)
+        os.replace(tmp, fs_path)
+    else:
+        fs.pipe_file(fs_path, text.encode())
+    return path
+
+
+def _timestamp(value):
+    import pandas as pd
+
+    return pd.to_datetime(value, utc=True)
+
+
+def _watermark(times, names, npairs):
+    """Watermark entry for a burst stack planned up to its newest acquisition"""
+    import pandas as pd
+
+    recent = [[name, t.isoformat()] for name, t in zip(names[-npairs:], times[-npairs:])] if npairs else []
+    return dict(watermark=times[-1].isoformat(), recent=recent, updated=pd.Timestamp.now('UTC').isoformat())
+
+
+def search_start(entry, since, now, dt=None):
+    """Oldest acquisition time a burst needs (its watermark, or `since` minus lookback)"""
+    import pandas as pd
+
+    if entry is not None:
+        start = _timestamp(entry['watermark'])
+    else:
+        start = (_timestamp(since) if since is not None else now) - INIT_LOOKBACK
+    if dt:
+        start -= pd.Timedelta(days=365 * dt) + OFFSETS_MARGIN
+    return start
+
+
+def plan_burst(gf, entry, since=None, npairs=3, dt=None):
+    """Pairs completed by acquisitions after the watermark of one burst (gf sorted by datetime)
+
+    Returns the pair table (indices into the returned stack), the stack and the new watermark entry
+    """
+    import numpy as np
+    import pandas as pd
+
+    from fufiters import pairs
+
+    names = list(gf.sceneName)
+    times = list(pd.to_datetime(gf.datetime, utc=True))
+    # Earlier acquisitions remembered with the watermark (may be older than the search)
+    if entry is not None:
+        known = set(names)
+        for name, t in entry.get('recent', []):
+            if name not in known:
+                names.append(name)
+                times.append(_timestamp(t))
+    stack = pd.DataFrame(dict(sceneName=names, datetime=times)).sort_values(by='datetime', ignore_index=True)
+    empty = pairs.pair_table([], [], np.array([], dtype=int), np.array([], dtype=int))
+
+    if entry is None and since is None:
+        if len(stack) == 0:
+            return empty, stack, None
+        print('Starting at', stack.datetime.iloc[-1])
+        return empty, stack, _watermark(stack.datetime.tolist(), stack.sceneName.tolist(), 0 if dt else npairs)
+
+    watermark = _timestamp(entry['watermark']) if entry is not None else _timestamp(since)
+    new = stack.datetime > watermark
+    if not new.any():
+        return empty, stack, entry
+
+    times = stack.datetime.values
+    if dt:
+        # References become eligible once the newest acquisition is DT years later
+        ref, sec = pairs.offsets(times, dt)
+        keep = (stack.datetime.iloc[ref] > watermark - pd.Timedelta(days=365 * dt)).values
+    else:
+        ref, sec = pairs.nplusk(times, npairs)
+        keep = new.values[sec]
+    table = pairs.pair_table(stack.sceneName.values, times, ref[keep], sec[keep])
+    return table, stack, _watermark(stack.datetime.tolist(), stack.sceneName.tolist(), 0 if dt else npairs)
+
+
+def plan(bursts, state, npairs=3, dt=None, since=None, now=None):
+    """Pair table of new pairs for every burst and the advanced watermarks
+
+    One SLC search per relative orbit from the oldest watermark of its bursts.
+    """
+    import numpy as np
+    import pandas as pd
+
+    from fufiters import pairs, planning
+
+    key = plan_key(npairs, dt)
+    watermarks = dict(state.get(key, {}))
+    now = _timestamp(now) if now is not None else pd.Timestamp.now('UTC')
+
+    tables = []
+    for relorb, group in bursts.groupby('relative_orbit_number'):
+        start = min(search_start(watermarks.get(burst_id), since, now, dt) for burst_id in group.burstID)
+        acq = planning.find_acquisitions(bursts=group.reset_index(drop=True), start=start.isoformat())
+        for burst_id in group.burstID:
+            gf = acq[acq.burstID == burst_id].reset_index(drop=True)
+            table, stack, entry = plan_burst(gf, watermarks.get(burst_id), since, npairs, dt)
+            print(f'{burst_id}: {len(stack)} acquisitions, {len(table)} new pairs')
+            if entry is not None:
+                watermarks[burst_id] = entry
+            table.insert(0, 'burstId', burst_id)
+            tables.append(table)
+
+    state = dict(state, **{key: watermarks})
+    if not tables:
+        empty = np.array([], dtype=int)
+        return pairs.pair_table([], [], empty, empty).assign(burstId=[]), state
+    return pd.concat(tables, ignore_index=True), state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show, reset or update forward planning watermarks")
+    parser.add_argument("path", nargs='?', default=None, help="Watermarks JSON file or URL (default: cache)")
+    parser.add_argument("--reset", nargs='+', default=[], help="Forget the watermarks of these bursts")
+    parser.add_argument("--update", default=None,
+                        help="Save the pending watermarks of a planning run (after its pairs are processed)")
+    args = parser.parse_args(argv)
+    args.path = args.path or None
+
+    if args.update:
+        print('Saved', save(load(args.update), args.path))
+    state = load(args.path)
+    if args.reset:
+        for watermarks in state.values():
+            for burst_id in args.reset:
+                watermarks.pop(burst_id, None)
+        print('Saved', save(state, args.path))
+    for key, watermarks in state.items():
+        for burst_id, entry in sorted(watermarks.items()):
+            print(key, burst_id, entry['watermark'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Content-hash manifests of product folders, and uploads of changed files only
+
+Every file in a product folder is hashed while streaming (sha2-256 multihash, as used by
+the STAC file extension file:checksum) and listed with its size in MANIFEST_FILE. An
+upload compares the local manifest with the one at the destination and copies only new
+or changed files, several at once (s3fs splits large files into multipart uploads), and
+writes the manifest last so an interrupted upload is completed by the next run.
+
+Destinations are fsspec URLs, so uploads can be tested against memory:// or a local path,
+or against a moto S3 server with FSSPEC_S3_ENDPOINT_URL=http://127.0.0.1:5000.
+
+Example:
+    files = manifest.build('S1_023790_IW1_20230621_20230703_VV_INT80')
+    python -m fufiters.manifest S1_023790_IW1_20230621_20230703_VV_INT80 s3://fufiters/insar/012_023790_IW1/20230621_20230703/S1_023790_IW1_20230621_20230703_VV_INT80
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import hashlib
+import json
+import os
+
+MANIFEST_FILE = 'manifest.json'
+# sha2-256 multihash prefix (function code 0x12, digest length 0x20)
+MULTIHASH_PREFIX = '1220'
+CHUNK_SIZE = 8 * 1024 * 1024
+WORKERS = 8
+# Checksums of local files by (path, size, mtime), so repeated builds only hash new files
+_checksums = {}
+
+
+def multihash(file, chunk_size=CHUNK_SIZE):
+    """sha2-256 multihash (hex) and size of an open binary file, read in chunks"""
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: file.read(chunk_size), b''):
+        digest.update(chunk)
+        size += len(chunk)
+    return MULTIHASH_PREFIX + digest.hexdigest(), size
+
+
+def file_checksum(path):
+    """{'checksum', 'size'} of a local file"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _checksums:
+        with open(path, 'rb') as f:
+            checksum, size = multihash(f)
+        _checksums[key] = dict(checksum=checksum, size=size)
+    return _checksums[key]
+
+
+def build(product_dir, workers=WORKERS):
+    """{filename: {'checksum', 'size'}} for every file in a local product folder"""
+    names = sorted(name for name in os.listdir(product_dir)
+                   if name != MANIFEST_FILE and os.path.isfile(os.path.join(product_dir, name)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        entries = executor.map(lambda name: file_checksum(os.path.join(product_dir, name)), names)
+        return dict(zip(names, entries))
+
+
+def write(product_dir, files):
+    """Write files as MANIFEST_FILE in a local product folder"""
+    path = os.path.join(product_dir, MANIFEST_FILE)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(dict(files=files), f, indent=1)
+    os.replace(tmp, path)
+    return path
+
+
+def read(url):
+    """Files of the manifest in a local or remote folder ({} if there is none)"""
+    import fsspec
+
+    fs, path = fsspec.core.url_to_fs(url)
+    try:
+        with fs.open(f'{path.rstrip("/")}/{MANIFEST_FILE}', 'r') as f:
+            return json.load(f)['files']
+    except FileNotFoundError:
+        return {}
+
+
+def changed(local, remote):
+    """Filenames in local that are missing from remote or have a different checksum"""
+    return [name for name, entry in local.items()
+            if remote.get(name, {}).get('checksum') != entry['checksum']]
+
+
+def upload(product_dir, dest, workers=WORKERS, dry_run=False):
+    """Copy new or changed files of a local product folder to dest, returns uploaded filenames"""
+    import fsspec
+
+    local = build(product_dir, workers)
+    write(product_dir, local)
+    todo = changed(local, read(dest))
+    print(f'{len(todo)} of {len(local)} files changed, '
+          f'{sum(local[name]["size"] for name in todo) / 1024**2:.1f} MB to upload')
+    if dry_run:
+        return todo
+
+    fs, path = fsspec.core.url_to_fs(dest)
+    path = path.rstrip('/')
+    fs.makedirs(path, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda name: fs.put_file(os.path.join(product_dir, name), f'{path}/{name}'), todo))
+    # Manifest last: it only lists files that are complete at dest
+    fs.put_file(os.path.join(product_dir, MANIFEST_FILE), f'{path}/{MANIFEST_FILE}')
+    return todo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Upload new or changed files of a product folder")
+    parser.add_argument("product_dir", help="Local product folder (e.g. S1_023790_IW1_20230621_20230703_VV_INT80)")
+    parser.add_argument("dest", nargs='?', default=None,
+                        help="Destination folder URL (omit to only write the manifest)")
+    parser.add_argument("-w", "--workers", default=WORKERS, type=int, help="Concurrent hashes and uploads")
+    parser.add_argument("-n", "--dry-run", default=False, action="store_true", help="Only list changed files")
+    args = parser.parse_args(argv)
+
+    if args.dest is None:
+        print('Saved', write(args.product_dir, build(args.product_dir, args.workers)))
+        return
+    for name in upload(args.product_dir, args.dest, args.workers, args.dry_run):
+        print(name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Small web maps of large SLC stacks and burst sets
+
+A 10 year stack has hundreds of almost identical SLC footprints for each track/frame.
+They are dissolved into one footprint per track/frame with acquisition counts, timespan,
+platforms and polarizations, and all geometries are simplified and rounded to the
+resolution of a map WIDTH pixels wide before being written to HTML, keeping only
+the columns shown in popups.
+
+Example:
+    frames = maps.footprints(gf)
+    m = maps.simplify(frames).explore()
+"""
+import numpy as np
+import pandas as pd
+import shapely
+
+# Width in pixels of the rendered map
+WIDTH = 1000
+# Larger categorical legends are slow to render and unreadable
+MAX_LEGEND = 20
+FRAME_COLUMNS = ['pathNumber', 'frameNumber']
+
+
+def grid_size(gf, width=WIDTH):
+    """Decimal grid (e.g. 0.001 degrees) finer than one pixel of gf drawn width pixels wide"""
+    xmin, ymin, xmax, ymax = gf.total_bounds
+    pixel = max(xmax - xmin, ymax - ymin, 1e-6) / width
+    return 10.0 ** np.floor(np.log10(pixel))
+
+
+def simplify(gf, width=WIDTH):
+    """Geometries simplified and snapped to screen resolution"""
+    grid = grid_size(gf, width)
+    geom = shapely.simplify(gf.geometry.values, grid, preserve_topology=True)
+    return gf.set_geometry(shapely.set_precision(geom, grid), crs=gf.crs)
+
+
+def slim(gf, columns):
+    """Only the given (popup) columns and geometry"""
+    return gf.loc[:, [c for c in columns if c in gf.columns] + [gf.geometry.name]]
+
+
+def footprints(gf, by=FRAME_COLUMNS, width=WIDTH):
+    """One dissolved footprint per track/frame with acquisition count, timespan, platforms and polarizations
+
+    Without track/frame columns footprints that are identical at screen resolution are grouped
+    """
+    by = [c for c in by if c in gf.columns]
+    if not by:
+        grid = grid_size(gf, width)
+        gf = gf.assign(footprint=shapely.to_wkb(shapely.set_precision(gf.geometry.values, grid)))
+        by = ['footprint']
+
+    grouped = gf.groupby(by, sort=True)
+    frames = gf.loc[:, by + [gf.geometry.name]].dissolve(by=by)
+    frames['count'] = grouped.size()
+    if 'startTime' in gf.columns:
+        times = pd.to_datetime(gf.startTime, utc=True).groupby([gf[c] for c in by])
+        frames['first'] = times.min().dt.strftime('%Y-%m-%d')
+        frames['last'] = times.max().dt.strftime('%Y-%m-%d')
+    for column, name in [('flightDirection', 'flightDirection'), ('platform', 'platforms'),
+                         ('polarization', 'polarizations')]:
+        if column in gf.columns:
+            frames[name] = grouped[column].agg(lambda x: ','.join(sorted(x.dropna().unique())))
+    frames = frames.reset_index().drop(columns='footprint', errors='ignore')
+    return frames
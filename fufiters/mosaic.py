@@ -0,0 +1,231 @@
+"""
+Regional per-date mosaics of burst products as GDAL VRTs or MosaicJSON
+
+STAC Items of all bursts and relative orbits are grouped by pair dates (reference_secondary),
+and each group becomes one small VRT per asset and CRS that points at the existing COGs
+(/vsis3/, /vsicurl/ or local paths). Grids, data types and nodata come from the Items
+(proj:transform, proj:shape, raster:bands) and are written as VRT SourceProperties, so
+building and opening a mosaic reads no rasters, and GDAL only fetches the COG tiles in
+view (zoomed out reads are served from the COG overviews of each source). Products
+in several UTM zones get one VRT per zone, or one MosaicJSON (quadkey index of COG URLs
+for tile servers such as TiTiler) across all of them.
+
+Example:
+    paths = mosaic.build(items, 'mosaics')
+    python -m fufiters.mosaic catalog/collection.json -o mosaics --assets unwrapped corr
+    gdalinfo mosaics/20230621_20230703/unwrapped_32645.vrt
+"""
+import argparse
+import json
+import math
+import os
+from xml.sax.saxutils import escape
+
+# Tiles of the MosaicJSON quadkey index (about 300 km at the equator)
+QUADKEY_ZOOM = 7
+EARTH_CIRCUMFERENCE = 40075016.686
+TILE_SIZE = 256
+GDAL_TYPES = {'uint8': 'Byte', 'int8': 'Int8', 'uint16': 'UInt16', 'int16': 'Int16', 'uint32': 'UInt32',
+              'int32': 'Int32', 'float32': 'Float32', 'float64': 'Float64'}
+
+
+def gdal_path(href):
+    """GDAL virtual file system path for a local, s3:// or http(s):// href"""
+    if href.startswith('s3://'):
+        return '/vsis3/' + href[len('s3://'):]
+    if href.startswith(('http://', 'https://')):
+        return '/vsicurl/' + href
+    return os.path.abspath(href)
+
+
+def _epsg(props):
+    return props.get('proj:epsg') or int(str(props.get('proj:code', ':0')).split(':')[-1])
+
+
+def source_table(items, assets=None):
+    """One row per (Item, asset) with pair name, CRS, grid, data type, nodata and href"""
+    import pandas as pd
+
+    from fufiters.datacube import data_assets
+
+    rows = []
+    for item in items:
+        item = item if isinstance(item, dict) else item.to_dict()
+        props = item['properties']
+        self_href = next((link['href'] for link in item.get('links', []) if link['rel'] == 'self'), None)
+        reference = pd.Timestamp(props['start_datetime'])
+        secondary = pd.Timestamp(props['end_datetime'])
+        for key in assets or data_assets(item):
+            asset = item['assets'].get(key)
+            if asset is None:
+                continue
+            href = asset['href']
+            if '://' not in href and not os.path.isabs(href) and self_href:
+                href = os.path.join(os.path.dirname(self_href), href)
+            band = (asset.get('raster:bands') or [{}])[0]
+            rows.append(dict(
+                name=f'{reference:%Y%m%d}_{secondary:%Y%m%d}',
+                asset=key,
+                id=item['id'],
+                burstId=props.get('burstId'),
+                epsg=_epsg(props),
+                transform=tuple(asset.get('proj:transform', props['proj:transform'])[:6]),
+                shape=tuple(asset.get('proj:shape', props['proj:shape'])),
+                dtype=band.get('data_type', 'float32'),
+                nodata=band.get('nodata'),
+                bbox=tuple(item['bbox']),
+                href=href,
+            ))
+    return pd.DataFrame(rows)
+
+
+def _srs(epsg):
+    from rasterio.crs import CRS
+    return CRS.from_epsg(epsg).to_wkt()
+
+
+def vrt_xml(sources, srs=None):
+    """VRT mosaic of sources (rows of source_table in one CRS) on their union grid, finest resolution"""
+    import pandas as pd
+
+    xres = min(t[0] for t in sources['transform'])
+    yres = max(t[4] for t in sources['transform'])
+    x0 = min(t[2] for t in sources['transform'])
+    y0 = max(t[5] for t in sources['transform'])
+    x1 = max(t[2] + s[1] * t[0] for t, s in zip(sources['transform'], sources['shape']))
+    y1 = min(t[5] + s[0] * t[4] for t, s in zip(sources['transform'], sources['shape']))
+    width = int(round((x1 - x0) / xres))
+    height = int(round((y1 - y0) / yres))
+    dtype = GDAL_TYPES[sources.dtype.iloc[0]]
+    nodata = sources.nodata.dropna()
+
+    lines = [f'<VRTDataset rasterXSize="{width}" rasterYSize="{height}">']
+    if srs is not None:
+        lines.append(f'  <SRS dataAxisToSRSAxisMapping="1,2">{escape(srs)}</SRS>')
+    lines.append(f'  <GeoTransform>{x0!r}, {xres!r}, 0.0, {y0!r}, 0.0, {yres!r}</GeoTransform>')
+    lines.append(f'  <VRTRasterBand dataType="{dtype}" band="1">')
+    if len(nodata):
+        lines.append(f'    <NoDataValue>{nodata.iloc[0]!r}</NoDataValue>')
+    for row in sources.itertuples():
+        (rows, cols), t = row.shape, row.transform
+        xoff, yoff = (t[2] - x0) / xres, (t[5] - y0) / yres
+        xsize, ysize = cols * t[0] / xres, rows * t[4] / yres
+        lines += [
+            '    <ComplexSource>',
+            f'      <SourceFilename relativeToVRT="0">{escape(gdal_path(row.href))}</SourceFilename>',
+            '      <SourceBand>1</SourceBand>',
+            f'      <SourceProperties RasterXSize="{cols}" RasterYSize="{rows}" '
+            f'DataType="{GDAL_TYPES[row.dtype]}" />',
+            f'      <SrcRect xOff="0" yOff="0" xSize="{cols}" ySize="{rows}" />',
+            f'      <DstRect xOff="{xoff:.10g}" yOff="{yoff:.10g}" xSize="{xsize:.10g}" ySize="{ysize:.10g}" />',
+        ]
+        if row.nodata is not None and not pd.isna(row.nodata):
+            lines.append(f'      <NODATA>{row.nodata!r}</NODATA>')
+        lines.append('    </ComplexSource>')
+    lines += ['  </VRTRasterBand>', '</VRTDataset>']
+    return '\n'.join(lines) + '\n'
+
+
+def tile(lon, lat, zoom):
+    """Web Mercator tile x, y containing lon, lat"""
+    n = 2 ** zoom
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = int((lon + 180) / 360 * n)
+    y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+    return min(x, n - 1), min(y, n - 1)
+
+
+def quadkey(x, y, zoom):
+    digits = []
+    for z in range(zoom, 0, -1):
+        mask = 1 << (z - 1)
+        digits.append(str((1 if x & mask else 0) + (2 if y & mask else 0)))
+    return ''.join(digits)
+
+
+def mosaicjson(sources, name=None, quadkey_zoom=QUADKEY_ZOOM, overview_levels=3):
+    """MosaicJSON 0.0.3 document listing the COG URLs of sources for every quadkey they touch"""
+    tiles = {}
+    for row in sources.itertuples():
+        xmin, ymin, xmax, ymax = row.bbox
+        x0, y0 = tile(xmin, ymax, quadkey_zoom)
+        x1, y1 = tile(xmax, ymin, quadkey_zoom)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                tiles.setdefault(quadkey(x, y, quadkey_zoom), []).append(row.href)
+    # Native zoom from the pixel spacing, COG overviews cover a few levels below it
+    resolution = min(t[0] for t in sources['transform'])
+    maxzoom = int(round(math.log2(EARTH_CIRCUMFERENCE / TILE_SIZE / resolution)))
+    bounds = [min(b[0] for b in sources.bbox), min(b[1] for b in sources.bbox),
+              max(b[2] for b in sources.bbox), max(b[3] for b in sources.bbox)]
+    return dict(mosaicjson='0.0.3', name=name, version='1.0.0',
+                minzoom=max(0, maxzoom - overview_levels), maxzoom=maxzoom, quadkey_zoom=quadkey_zoom,
+                bounds=bounds, center=[(bounds[0] + bounds[2]) / 2, (bounds[1] + bounds[3]) / 2, maxzoom - overview_levels],
+                tiles=tiles)
+
+
+def intersects(bbox, other):
+    """Whether two (xmin, ymin, xmax, ymax) boxes overlap or touch"""
+    return bbox[0] <= other[2] and bbox[2] >= other[0] and bbox[1] <= other[3] and bbox[3] >= other[1]
+
+
+def _write(path, text):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        f.write(text)
+    os.replace(tmp, path)
+    return path
+
+
+def build(items, dest, assets=None, pairs=None, formats=('vrt',)):
+    """Write dest/{pair}/{asset}_{epsg}.vrt (and {asset}.json MosaicJSON) for every pair date, returns paths"""
+    sources = source_table(items, assets)
+    if len(sources) == 0:
+        print('No Items')
+        return []
+    if pairs:
+        sources = sources[sources.name.isin(pairs)]
+
+    srs = {epsg: _srs(epsg) for epsg in sources.epsg.unique()}
+    paths = []
+    for (name, asset), group in sources.groupby(['name', 'asset']):
+        os.makedirs(os.path.join(dest, name), exist_ok=True)
+        if 'vrt' in formats:
+            for epsg, zone in group.groupby('epsg'):
+                paths.append(_write(os.path.join(dest, name, f'{asset}_{epsg}.vrt'), vrt_xml(zone, srs[epsg])))
+        if 'mosaicjson' in formats:
+            doc = mosaicjson(group, name=f'{name} {asset}')
+            paths.append(_write(os.path.join(dest, name, f'{asset}.json'), json.dumps(doc)))
+    print(f'{sources.name.nunique()} pair dates, {sources.burstId.nunique()} bursts, '
+          f'{len(sources)} COGs in {len(paths)} mosaics under {dest}')
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-date regional VRT mosaics (or MosaicJSON) of burst products")
+    parser.add_argument("source", help="collection.json, Item JSON, or stac-geoparquet inventory directory")
+    parser.add_argument("-o", "--output", default="mosaics", help="Output directory")
+    parser.add_argument("-a", "--assets", nargs='+', default=None,
+                        help="Asset keys (default: data assets, e.g. unwrapped corr)")
+    parser.add_argument("-p", "--pairs", nargs='+', default=None, help="Only these pair dates (e.g. 20230621_20230703)")
+    parser.add_argument("--bbox", nargs=4, type=float, metavar=('XMIN', 'YMIN', 'XMAX', 'YMAX'),
+                        help="Only products intersecting bbox")
+    parser.add_argument("-f", "--format", nargs='+', default=['vrt'], choices=['vrt', 'mosaicjson'])
+    args = parser.parse_args(argv)
+
+    if args.source.endswith('.json'):
+        import pystac
+        obj = pystac.read_file(args.source)
+        items = [item.to_dict() for item in (obj.get_items(recursive=True) if isinstance(obj, pystac.Catalog) else [obj])]
+        if args.bbox:
+            items = [item for item in items if intersects(item['bbox'], args.bbox)]
+    else:
+        from fufiters import catalog
+        items = catalog.to_items(catalog.query(args.source, bbox=args.bbox))
+
+    for path in build(items, args.output, args.assets, args.pairs, args.format):
+        print(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Pack pairs into jobs that share acquisitions
+
+With n+k networks each acquisition appears in up to 2k pairs. Pairs are ordered
+chronologically per burst (so neighbouring pairs share references and secondaries) and
+cut into contiguous jobs of nearly equal estimated runtime, with at most max_pairs_per_job
+pairs per job unless max_jobs caps the total. A pair is estimated to take PAIR_MINUTES plus
+DOWNLOAD_MINUTES for each acquisition no earlier pair of the burst uses, so stretches of
+pairs that share few acquisitions get shorter jobs. Jobs never mix bursts. Jobs are split
+into GitHub Actions matrices of at most MATRIX_LIMIT entries.
+
+Example:
+    jobs = packing.pack(table, max_pairs_per_job=6, max_jobs=256, looks='20x4')
+    packing.report(table, jobs)
+    matrices = packing.to_matrix_chunks(jobs)
+"""
+import heapq
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+# GitHub Actions limit of jobs per matrix
+MATRIX_LIMIT = 256
+# Approximate size of one extracted burst SLC + orbit file
+ACQUISITION_MB = 150
+# Approximate minutes to download one acquisition and process one pair
+DOWNLOAD_MINUTES = 2.0
+PAIR_MINUTES = {'20x4': 8.0, '10x2': 12.0, '5x1': 25.0}
+
+
+def jobs_per_burst(npairs, max_pairs_per_job=6, max_jobs=None):
+    """Number of jobs for each burst (jobs never mix bursts)
+
+    Every burst gets ceil(npairs / max_pairs_per_job) jobs. With max_jobs, jobs are instead handed
+    out one at a time to the burst with the most pairs per job, so pairs per job grow evenly.
+    """
+    npairs = np.asarray(npairs, dtype=int)
+    counts = -(-npairs // max_pairs_per_job)
+    if max_jobs is None or counts.sum() <= max_jobs:
+        return counts
+    if max_jobs < len(npairs):
+        raise ValueError(f'max_jobs={max_jobs} is less than the number of bursts ({len(npairs)}), '
+                         'jobs process a single burst')
+    counts = np.ones(len(npairs), dtype=int)
+    heap = [(-n, i) for i, n in enumerate(npairs)]
+    heapq.heapify(heap)
+    for _ in range(max_jobs - len(npairs)):
+        _, i = heapq.heappop(heap)
+        counts[i] += 1
+        heapq.heappush(heap, (-math.ceil(npairs[i] / counts[i]), i))
+    return counts
+
+
+def pair_costs(table, looks='20x4'):
+    """Estimated minutes of each pair: processing plus downloads of acquisitions new to its burst
+
+    Pairs are taken in table order, so sort them chronologically per burst first
+    """
+    acquisitions = pd.DataFrame(dict(burstId=np.repeat(table.burstId.values, 2),
+                                     scene=np.column_stack([table.reference, table.secondary]).ravel()))
+    new = (~acquisitions.duplicated().values).reshape(-1, 2).sum(axis=1)
+    return PAIR_MINUTES[looks] + new * DOWNLOAD_MINUTES
+
+
+def chunk_bounds(costs, count, limit):
+    """Edges of count contiguous chunks of costs with nearly equal sums and at most limit items each"""
+    cumulative = np.concatenate([[0], np.cumsum(costs)])
+    targets = cumulative[-1] * np.arange(1, count) / count
+    # Nearest item boundary to each target
+    right = np.searchsorted(cumulative, targets).clip(1, len(costs))
+    nearer = targets - cumulative[right - 1] < cumulative[right] - targets
+    edges = np.concatenate([[0], np.where(nearer, right - 1, right), [len(costs)]])
+    # Every chunk gets at least one and at most limit items
+    for j in range(1, count):
+        edges[j] = min(max(edges[j], edges[j - 1] + 1), edges[j - 1] + limit)
+    for j in range(count - 1, 0, -1):
+        edges[j] = max(min(edges[j], edges[j + 1] - 1), edges[j + 1] - limit)
+    return edges
+
+
+def pack(table, max_pairs_per_job=6, max_jobs=None, looks='20x4'):
+    """Group pairs of each burst into contiguous jobs of nearly equal estimated runtime
+
+    The number of jobs per burst comes from pair counts (see jobs_per_burst), job boundaries
+    from pair_costs(). max_jobs caps the total number of jobs (pairs per job grow beyond
+    max_pairs_per_job if needed), raises ValueError if it is less than the number of bursts
+    """
+    if len(table) == 0:
+        return pd.DataFrame(columns=['job', 'burstId', 'pairs', 'references', 'secondaries',
+                                     'acquisitions', 'npairs', 'est_minutes'])
+    pair_minutes = PAIR_MINUTES[looks]
+    # Chronological order by acquisition start time in the SLC names
+    order = pd.DataFrame(dict(burstId=table.burstId, ref=table.reference.str[17:32],
+                              sec=table.secondary.str[17:32]))
+    table = table.loc[order.sort_values(by=['burstId', 'ref', 'sec']).index].reset_index(drop=True)
+    costs = pair_costs(table, looks)
+
+    sizes = table.groupby('burstId', sort=False).size()
+    counts = jobs_per_burst(sizes.values, max_pairs_per_job, max_jobs)
+    job = np.empty(len(table), dtype=int)
+    first, start = 0, 0
+    for size, count in zip(sizes.values, np.minimum(counts, sizes.values)):
+        # Contiguous chunks of nearly equal runtime, at most max_pairs_per_job pairs unless max_jobs binds
+        limit = max_pairs_per_job if count * max_pairs_per_job >= size else size
+        edges = chunk_bounds(costs[start:start + size], count, limit)
+        job[start:start + size] = first + np.repeat(np.arange(count), np.diff(edges))
+        first, start = first + count, start + size
+
+    table = table.assign(job=job)
+    jobs = table.groupby('job').agg(burstId=('burstId', 'first'),
+                                    pairs=('name', list),
+                                    references=('reference', list),
+                                    secondaries=('secondary', list))
+    jobs['acquisitions'] = [len(set(r) | set(s)) for r, s in zip(jobs.references, jobs.secondaries)]
+    jobs['npairs'] = jobs.pairs.str.len()
+    jobs['est_minutes'] = jobs.npairs * pair_minutes + jobs.acquisitions * DOWNLOAD_MINUTES
+    return jobs.reset_index()
+
+
+def report(table, jobs):
+    """Print download volume of packed jobs compared to one pair per job"""
+    unpacked = 2 * len(table)
+    packed = int(jobs.acquisitions.sum())
+    saved_gb = (unpacked - packed) * ACQUISITION_MB / 1024
+    print(f'Jobs: {len(jobs)} for {len(table)} pairs, '
+          f'max estimated runtime {jobs.est_minutes.max():.0f} min')
+    print(f'Acquisition downloads: {packed} packed vs {unpacked} one pair per job '
+          f'(~{saved_gb:.1f} GB saved)')
+    return dict(jobs=len(jobs), pairs=len(table), downloads=packed,
+                downloads_unpacked=unpacked, saved_gb=round(saved_gb, 2))
+
+
+def to_matrix_chunks(jobs, limit=MATRIX_LIMIT):
+    """GitHub Actions matrix JSON strings with at most limit jobs each
+
+    Pair lists are space-separated so a job can loop over them in bash
+    """
+    chunks = []
+    for start in range(0, len(jobs), limit):
+        include = [dict(job=f'{row.burstId}_{row.job:04d}',
+                        burstId=row.burstId,
+                        pairs=' '.join(row.pairs),
+                        references=' '.join(row.references),
+                        secondaries=' '.join(row.secondaries))
+                   for row in jobs.iloc[start:start + limit].itertuples()]
+        chunks.append(f'{{"include":{json.dumps(include)}}}')
+    return chunks
@@ -0,0 +1,147 @@
+"""
+Pair networks for a chronological stack of acquisitions
+
+All networks are built from the sorted acquisition times with NumPy (no per-acquisition
+Python loops) and returned as index arrays (reference, secondary) into the stack.
+pair_table() turns those into the columnar table used for GitHub Actions matrix jobs.
+
+Example:
+    times = gf.datetime.values
+    ref, sec = pairs.nplusk(times, 3, ref_mask=pairs.year_mask(times, 2020))
+    table = pairs.pair_table(gf.sceneName.values, times, ref, sec)
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def _as_datetime64(times):
+    """Naive UTC datetime64 array"""
+    index = pd.DatetimeIndex(times)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.values
+
+
+def year_mask(times, year):
+    """Boolean mask of acquisitions within a calendar year"""
+    return pd.DatetimeIndex(times).year.values == int(year)
+
+
+def nplusk(times, k, ref_mask=None):
+    """n+1..n+k sequential pairs, optionally only for references in ref_mask"""
+    n = len(times)
+    refs = np.arange(n) if ref_mask is None else np.flatnonzero(ref_mask)
+    steps = np.arange(1, k + 1)
+    ref = np.repeat(refs, k)
+    sec = ref + np.tile(steps, len(refs))
+    keep = sec < n
+    missing = ref[~keep]
+    if len(missing):
+        print(f'No n+k secondary for {len(np.unique(missing))} references at end of stack')
+    return ref[keep], sec[keep]
+
+
+def offsets(times, dt_years):
+    """Pair each acquisition with the one nearest to DT years later (one searchsorted over the stack)"""
+    t = _as_datetime64(times)
+    if len(t) == 0:
+        return np.array([], dtype=int), np.array([], dtype=int)
+    # Only references with a full DT years of acquisitions after them
+    refs = np.flatnonzero(t[-1] - t >= np.timedelta64(365 * dt_years, 'D'))
+    targets = (pd.DatetimeIndex(t[refs]) + pd.DateOffset(years=dt_years)).values
+    right = np.clip(np.searchsorted(t, targets, side='left'), 0, len(t) - 1)
+    left = np.clip(right - 1, 0, len(t) - 1)
+    # Same tie-breaking as Index.get_indexer(method='nearest'): prefer later acquisition
+    use_left = np.abs(targets - t[left]) < np.abs(t[right] - targets)
+    sec = np.where(use_left, left, right)
+    return refs, sec
+
+
+def sbas(times, max_days, min_days=0, ref_mask=None):
+    """All pairs with min_days < temporal baseline <= max_days"""
+    t = _as_datetime64(times)
+    n = len(t)
+    refs = np.arange(n) if ref_mask is None else np.flatnonzero(ref_mask)
+    first = np.searchsorted(t, t[refs] + np.timedelta64(int(min_days * 86400), 's'), side='right')
+    first = np.maximum(first, refs + 1)
+    last = np.searchsorted(t, t[refs] + np.timedelta64(int(max_days * 86400), 's'), side='right')
+    counts = np.maximum(last - first, 0)
+    ref = np.repeat(refs, counts)
+    # Offset of each pair within its reference's block of secondaries
+    within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    sec = np.repeat(first, counts) + within
+    return ref, sec
+
+
+def connectivity(n, ref, sec):
+    """Label connected components of the pair graph (label propagation with pointer jumping)
+
+    Returns array of component labels per acquisition, acquisitions not in any pair
+    are their own component.
+    """
+    labels = np.arange(n)
+    if len(ref) == 0:
+        return labels
+    while True:
+        m = np.minimum(labels[ref], labels[sec])
+        new = labels.copy()
+        np.minimum.at(new, ref, m)
+        np.minimum.at(new, sec, m)
+        new = new[new]
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def pair_table(names, times, ref, sec):
+    """Columnar pair table with reference, secondary, name and temporal baseline"""
+    names = np.asarray(names, dtype=object)
+    t = _as_datetime64(times)
+    reference = names[ref]
+    secondary = names[sec]
+    table = pd.DataFrame(dict(
+        reference=reference,
+        secondary=secondary,
+        name=[f'{r[17:25]}_{s[17:25]}' for r, s in zip(reference, secondary)],
+        ref_idx=ref,
+        sec_idx=sec,
+        dt_days=((t[sec] - t[ref]) / np.timedelta64(1, 'D')).round().astype(int),
+    ))
+    return table
+
+
+def summarize(table, n):
+    """Print number of pairs and connectivity of the pair network"""
+    labels = connectivity(n, table.ref_idx.values, table.sec_idx.values)
+    used = np.zeros(n, dtype=bool)
+    used[table.ref_idx.values] = True
+    used[table.sec_idx.values] = True
+    ncomponents = len(np.unique(labels[used]))
+    print(f'Number of pairs: {len(table)}')
+    print(f'Acquisitions in network: {used.sum()} of {n}, connected components: {ncomponents}')
+    return ncomponents
+
+
+def plan_insar(gf, year, npairs):
+    """n+1..n+npairs pairs for references acquired in a given year (gf sorted by datetime)"""
+    times = gf.datetime.values
+    ref, sec = nplusk(times, npairs, ref_mask=year_mask(times, year))
+    return pair_table(gf.sceneName.values, times, ref, sec)
+
+
+def plan_offsets(gf, dt_years):
+    """Offset pairs separated by dt_years (gf sorted by datetime)"""
+    times = gf.datetime.values
+    ref, sec = offsets(times, dt_years)
+    return pair_table(gf.sceneName.values, times, ref, sec)
+
+
+def to_matrix(table, burst_id=False):
+    """GitHub Actions matrix JSON for a pair table (includes burstId if planning several bursts, or always with burst_id)"""
+    columns = ['reference', 'secondary', 'name']
+    if 'burstId' in table and (burst_id or table.burstId.nunique() > 1):
+        columns = ['burstId'] + columns
+    pairs = table.loc[:, columns].to_dict(orient='records')
+    return f'{{"include":{json.dumps(pairs)}}}'
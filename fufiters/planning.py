@@ -0,0 +1,152 @@
+"""
+Plan burst pairs for one or many bursts
+
+Bursts are grouped by relative orbit, pass direction and contiguous footprints so
+that one ASF SLC search covers every burst in a group. SLC footprints are matched to bursts with one STRtree join
+and kept where they contain at least MIN_OVERLAP of the burst area, then
+fufiters.pairs builds a pair table for every burst.
+
+Example:
+    acq = planning.find_acquisitions(aoi='nepal.geojson', start='2020-01-01', end='2021-03-01')
+    table = planning.plan_pairs(acq, year=2020, npairs=3)
+"""
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.geometry.polygon import orient
+
+from fufiters import arrowsearch, burstdb, pairs, searchcache
+from fufiters.config import get_cache_dir
+
+# Fraction of burst area an SLC frame must cover (frames overlap along track)
+MIN_OVERLAP = 0.80
+# Bursts further apart (degrees) on a relative orbit get separate searches
+MAX_GAP = 0.5
+
+
+def get_bursts(burst_ids=None, aoi=None):
+    """Burst map rows for a list of full burst IDs (e.g. 012_023790_IW1) or an AOI polygon"""
+    if aoi is not None:
+        from fufiters import aoi as aois
+        return aois.coverage(aoi)
+
+    gfb = [burstdb.lookup(*burstdb.parse_burst_id(x)[1:]) for x in burst_ids]
+    return pd.concat(gfb, ignore_index=True)
+
+
+def burst_groups(bursts, max_gap=MAX_GAP):
+    """Group labels for bursts on one track: same pass direction and footprints within max_gap degrees"""
+    labels = np.zeros(len(bursts), dtype=int)
+    passes = bursts.orbit_pass.values if 'orbit_pass' in bursts else np.zeros(len(bursts))
+    geoms = bursts.geometry.values
+    ngroups = 0
+    for orbit_pass in pd.unique(passes):
+        index = np.flatnonzero(passes == orbit_pass)
+        parts = shapely.get_parts(shapely.union_all(shapely.buffer(geoms[index], max_gap / 2)))
+        ib, ipart = shapely.STRtree(parts).query(shapely.centroid(geoms[index]), predicate='within')
+        labels[index[ib]] = ngroups + ipart
+        ngroups += len(parts)
+    return labels
+
+
+def search_geometry(bursts):
+    """Search geometry covering a contiguous group of bursts (centroid for a single burst)"""
+    centroids = shapely.centroid(bursts.geometry.values)
+    if len(bursts) == 1:
+        return centroids[0].wkt
+    # CMR expects counter-clockwise polygons
+    hull = shapely.MultiPoint(centroids).convex_hull
+    if hull.geom_type != 'Polygon':
+        # Bursts in a single line along track
+        hull = hull.buffer(0.01, cap_style='square', join_style='mitre')
+    return orient(hull, 1.0).wkt
+
+
+def search_geometries(bursts):
+    """One search geometry per pass direction and contiguous group of bursts"""
+    return [search_geometry(group) for _, group in bursts.groupby(burst_groups(bursts))]
+
+
+def search_orbit(relorb, bursts, start=None, end=None):
+    """Cached SLC searches for all bursts on a relative orbit (streamed into Arrow by year)
+
+    Bursts far apart or on different pass directions are searched separately, so the
+    search polygon never spans the ground between them.
+    """
+    import asf_search as asf
+
+    results = [searchcache.search(search_fn=arrowsearch.search,
+                                  cache_dir=get_cache_dir('asf', 'arrow'),
+                                  platform=[asf.PLATFORM.SENTINEL1],
+                                  processingLevel=asf.PRODUCT_TYPE.SLC,
+                                  beamMode=asf.BEAMMODE.IW,
+                                  intersectsWith=wkt,
+                                  relativeOrbit=int(relorb),
+                                  start=start,
+                                  end=end,
+                                  )
+               for wkt in search_geometries(bursts)]
+    if len(results) == 1:
+        return results[0]
+    gf = pd.concat(results, ignore_index=True)
+    return gf.drop_duplicates(subset='sceneName', ignore_index=True)
+
+
+def overlap_join(slcs, bursts, min_overlap=MIN_OVERLAP):
+    """Match SLC frames to bursts they cover (STRtree join + vectorized intersection areas)
+
+    Returns (burst index, slc index, overlap fraction) for matches >= min_overlap
+    """
+    burst_geoms = bursts.geometry.values
+    slc_geoms = slcs.geometry.values
+    tree = shapely.STRtree(slc_geoms)
+    ib, islc = tree.query(burst_geoms, predicate='intersects')
+    overlap = shapely.area(shapely.intersection(burst_geoms[ib], slc_geoms[islc])) / shapely.area(burst_geoms[ib])
+    keep = overlap >= min_overlap
+    return ib[keep], islc[keep], overlap[keep]
+
+
+def find_acquisitions(burst_ids=None, aoi=None, start=None, end=None, bursts=None):
+    """SLCs covering each burst, one row per (burst, SLC), sorted by burst and datetime"""
+    if bursts is None:
+        bursts = get_bursts(burst_ids, aoi)
+    print(f'Bursts: {len(bursts)} on {bursts.relative_orbit_number.nunique()} relative orbits')
+
+    matches = []
+    for relorb, group in bursts.groupby('relative_orbit_number'):
+        group = group.reset_index(drop=True)
+        slcs = search_orbit(relorb, group, start, end)
+        print(f'Relative orbit {relorb}: {len(group)} bursts, {len(slcs)} SLCs')
+        if len(slcs) == 0:
+            continue
+        ib, islc, overlap = overlap_join(slcs, group)
+        gf = slcs.iloc[islc].reset_index(drop=True)
+        gf['burstID'] = group.burstID.values[ib]
+        gf['overlap'] = overlap
+        matches.append(gf)
+
+    if not matches:
+        return gpd.GeoDataFrame(columns=['burstID', 'sceneName', 'datetime'], geometry=[], crs=4326)
+    gf = pd.concat(matches, ignore_index=True)
+    gf['datetime'] = pd.to_datetime(gf.startTime)
+    gf = gf.drop_duplicates(subset=['burstID', 'sceneName'])
+    return gf.sort_values(by=['burstID', 'datetime'], ignore_index=True)
+
+
+def plan_pairs(acq, year=None, npairs=3, dt=None):
+    """Pair table for every burst: n+1..n+npairs InSAR pairs for a year, or dt-year offset pairs"""
+    tables = []
+    for burst_id, gf in acq.groupby('burstID', sort=False):
+        gf = gf.reset_index(drop=True)
+        if dt:
+            table = pairs.plan_offsets(gf, dt)
+        else:
+            table = pairs.plan_insar(gf, year, npairs)
+        table.insert(0, 'burstId', burst_id)
+        tables.append(table)
+
+    if not tables:
+        empty = np.array([], dtype=int)
+        return pairs.pair_table([], [], empty, empty).assign(burstId=[])
+    return pd.concat(tables, ignore_index=True)
@@ -0,0 +1,178 @@
+"""
+DEM tiles and precise orbit windows needed by a whole pair plan
+
+Adjacent bursts and subswaths share most Copernicus GLO-30 DEM tiles, and every pair of a
+burst stack needs the same orbit files, so the planner lists the unique 1x1 degree DEM tiles
+(burst bounds plus the DEM buffer used by hyp3-isce2) and one precise orbit window per
+platform and acquisition day. Everything is computed offline from burst geometries and
+the SLC names in the pair table. The manifest can be used to fill a shared tile-keyed
+cache once before the pair jobs run.
+
+Example:
+    m = prefetch.manifest(gfb, table)
+    python -m fufiters.prefetch manifest.json --dest dem_tiles
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+
+# hyp3-isce2 download_dem_for_isce2 pads the burst extent by 0.4 degrees
+DEM_BUFFER = 0.4
+DEM_URL = 'https://copernicus-dem-30m.s3.amazonaws.com/{name}/{name}.tif'
+# Padding around acquisitions for orbit interpolation
+ORBIT_MARGIN = datetime.timedelta(minutes=10)
+# Precise orbit (POEORB) files cover 22:59:42 the day before to 00:59:42 the day after
+ORBIT_VALIDITY_START = datetime.timedelta(days=-1, hours=22, minutes=59, seconds=42)
+ORBIT_VALIDITY_STOP = datetime.timedelta(days=1, minutes=59, seconds=42)
+
+
+def tile_name(lon, lat):
+    """Copernicus DEM tile with lower left corner at integer lon, lat"""
+    ns = 'N' if lat >= 0 else 'S'
+    ew = 'E' if lon >= 0 else 'W'
+    return f'Copernicus_DSM_COG_10_{ns}{abs(lat):02d}_00_{ew}{abs(lon):03d}_00_DEM'
+
+
+def tile_url(name):
+    return DEM_URL.format(name=name)
+
+
+def burst_bounds(geoms):
+    """xmin, ymin, xmax, ymax per geometry, with xmax > 180 for bursts crossing the antimeridian"""
+    import pandas as pd
+    import shapely
+
+    coords, index = shapely.get_coordinates(geoms, return_index=True)
+    df = pd.DataFrame(dict(x=coords[:, 0], y=coords[:, 1], i=index))
+    width = df.groupby('i').x.agg(lambda x: x.max() - x.min())
+    crossing = df.i.map(width > 180).values
+    df.loc[crossing & (df.x < 0), 'x'] += 360
+    return df.groupby('i').agg(xmin=('x', 'min'), ymin=('y', 'min'), xmax=('x', 'max'), ymax=('y', 'max'))
+
+
+def dem_tiles(bursts, buffer=DEM_BUFFER):
+    """Sorted unique DEM tile names covering every burst extent plus buffer"""
+    import numpy as np
+
+    bounds = burst_bounds(bursts.geometry.values)
+    x0 = np.floor(bounds.xmin - buffer).astype(int)
+    x1 = np.ceil(bounds.xmax + buffer).astype(int)
+    y0 = np.floor(bounds.ymin - buffer).clip(-90, 89).astype(int)
+    y1 = np.ceil(bounds.ymax + buffer).clip(-89, 90).astype(int)
+    tiles = set()
+    for xa, xb, ya, yb in zip(x0, x1, y0, y1):
+        for lon in range(xa, xb):
+            for lat in range(ya, yb):
+                tiles.add(((lon + 180) % 360 - 180, lat))
+    return sorted(tile_name(lon, lat) for lon, lat in tiles)
+
+
+def acquisitions(table):
+    """Platform and start/stop time of every SLC in a pair table"""
+    import numpy as np
+    import pandas as pd
+
+    names = pd.Series(pd.unique(np.concatenate([table.reference.values, table.secondary.values])), dtype=object)
+    return pd.DataFrame(dict(
+        sceneName=names,
+        platform=names.str[:3],
+        start=pd.to_datetime(names.str[17:32], format='%Y%m%dT%H%M%S', utc=True),
+        stop=pd.to_datetime(names.str[33:48], format='%Y%m%dT%H%M%S', utc=True),
+    ))
+
+
+def orbit_windows(table, margin=ORBIT_MARGIN):
+    """One precise orbit time window per platform and acquisition day
+
+    validity_start/stop are the coverage of the precise orbit file that contains the window
+    """
+    import pandas as pd
+
+    acq = acquisitions(table)
+    if len(acq) == 0:
+        return pd.DataFrame(columns=['platform', 'date', 'start', 'stop', 'validity_start', 'validity_stop'])
+    acq['date'] = acq.start.dt.floor('D')
+    windows = acq.groupby(['platform', 'date']).agg(start=('start', 'min'), stop=('stop', 'max')).reset_index()
+    windows['start'] -= margin
+    windows['stop'] += margin
+    windows['validity_start'] = windows.date + ORBIT_VALIDITY_START
+    windows['validity_stop'] = windows.date + ORBIT_VALIDITY_STOP
+    return windows
+
+
+def manifest(bursts, table, buffer=DEM_BUFFER):
+    """DEM tiles (with a cache key) and orbit windows for all bursts and pairs in a plan"""
+    if 'burstId' in table.columns and 'burstID' in bursts.columns:
+        bursts = bursts[bursts.burstID.isin(table.burstId.unique())]
+    tiles = dem_tiles(bursts, buffer) if len(table) else []
+    windows = orbit_windows(table)
+    fmt = '%Y-%m-%dT%H:%M:%SZ'
+    orbits = [dict(platform=w.platform, date=w.date.strftime('%Y-%m-%d'),
+                   start=w.start.strftime(fmt), stop=w.stop.strftime(fmt),
+                   validity_start=w.validity_start.strftime(fmt), validity_stop=w.validity_stop.strftime(fmt))
+              for w in windows.itertuples()]
+    key = hashlib.sha1(','.join(tiles).encode()).hexdigest()[:12]
+    return dict(dem_tiles=tiles, dem_cache_key=f'dem-tiles-{key}', orbits=orbits)
+
+
+def to_json(manifest):
+    """Compact JSON for a workflow output"""
+    return json.dumps(manifest, separators=(',', ':'))
+
+
+def download_dem(tiles, dest, workers=8):
+    """Download DEM tiles missing from dest (ocean tiles do not exist and are skipped)"""
+    import pandas as pd
+    import urllib.error
+    import urllib.request
+    from concurrent.futures import ThreadPoolExecutor
+
+    os.makedirs(dest, exist_ok=True)
+
+    def fetch(name):
+        path = os.path.join(dest, f'{name}.tif')
+        if os.path.exists(path):
+            return 'cached'
+        tmp = f'{path}.{os.getpid()}.tmp'
+        try:
+            urllib.request.urlretrieve(tile_url(name), tmp)
+        except urllib.error.HTTPError as e:
+            if e.code in (403, 404):
+                return 'missing'
+            raise
+        os.replace(tmp, path)
+        return 'downloaded'
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        status = pd.Series(list(pool.map(fetch, tiles)), dtype=object)
+    print(status.value_counts().to_string())
+    return status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prefetch DEM tiles listed in a planner manifest")
+    parser.add_argument("manifest", help="PREFETCH_MANIFEST JSON file or string")
+    parser.add_argument("-d", "--dest", default=None, help="Download DEM tiles to this directory")
+    parser.add_argument("-w", "--workers", default=8, type=int, help="Concurrent downloads")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.manifest):
+        with open(args.manifest) as f:
+            m = json.load(f)
+    else:
+        m = json.loads(args.manifest)
+
+    print(f"{len(m['dem_tiles'])} DEM tiles (cache key {m['dem_cache_key']}), "
+          f"{len(m['orbits'])} orbit windows")
+    if args.dest:
+        download_dem(m['dem_tiles'], args.dest, args.workers)
+    else:
+        print('\n'.join(m['dem_tiles']))
+        for orbit in m['orbits']:
+            print(orbit['platform'], orbit['start'], orbit['stop'])
+
+
+if __name__ == '__main__':
+    main()
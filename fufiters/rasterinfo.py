@@ -0,0 +1,120 @@
+"""
+Header-only raster metadata for STAC assets
+
+Each COG is opened once, concurrently across assets, and only its header and the
+coarsest overview are read: dtype, nodata, shape and transform come from the header and
+approximate statistics from the overview. Remote files (s3://, https://) are read with
+GDAL range requests. Results are cached on disk keyed by href and a file fingerprint
+(S3 ETag, or size and modification time) so unchanged files are never re-read.
+
+Example:
+    info = rasterinfo.get_raster_info_many({'corr': 's3://fufiters/.../..._corr.tif'})
+"""
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+
+import numpy as np
+import rasterio
+from pystac.extensions.raster import DataType, RasterBand, Statistics
+
+from fufiters.config import get_cache_dir
+
+# Read only headers and the requested byte ranges from remote COGs
+GDAL_ENV = dict(
+    GDAL_DISABLE_READDIR_ON_OPEN='EMPTY_DIR',
+    GDAL_HTTP_MULTIRANGE='YES',
+    GDAL_HTTP_MERGE_CONSECUTIVE_RANGES='YES',
+    GDAL_INGESTED_BYTES_AT_OPEN=32768,
+    CPL_VSIL_CURL_ALLOWED_EXTENSIONS='.tif',
+    VSI_CACHE='TRUE',
+)
+
+
+def fingerprint(href):
+    """Cheap file identity: S3 ETag (MD5 for single-part uploads) or size and mtime"""
+    import fsspec
+
+    fs, path = fsspec.core.url_to_fs(href)
+    info = fs.info(path)
+    etag = info.get('ETag') or info.get('etag')
+    if etag:
+        return etag.strip('"')
+    return f"{info['size']}-{info.get('mtime', info.get('LastModified', ''))}"
+
+
+def _cache_path(href, checksum):
+    key = hashlib.sha1(f'{href}:{checksum}'.encode()).hexdigest()
+    return get_cache_dir('rasterinfo') / f'{key}.json'
+
+
+def read_raster_info(href):
+    """Header info and overview statistics for the first band of a raster"""
+    with rasterio.open(href) as src:
+        overviews = src.overviews(1)
+        info = {
+            'shape': [src.height, src.width],
+            'transform': list(src.transform)[:6],
+            'epsg': src.crs.to_epsg() if src.crs else None,
+            'overviews': overviews,
+            'blocksize': list(src.block_shapes[0]),
+        }
+        nodata = src.nodata
+        dtype = src.dtypes[0]
+        resolution = src.res[0]
+
+    # Coarsest overview (or full resolution if there are none)
+    level = len(overviews) - 1
+    kwargs = dict(overview_level=level) if level >= 0 else {}
+    with rasterio.open(href, **kwargs) as src:
+        data = src.read(1, masked=True)
+    if nodata is not None and np.isnan(nodata):
+        data = np.ma.masked_invalid(data)
+
+    valid = data.compressed()
+    stats = None
+    if valid.size:
+        stats = Statistics.create(minimum=float(valid.min()), maximum=float(valid.max()),
+                                  mean=float(valid.mean()), stddev=float(valid.std()),
+                                  valid_percent=round(100 * valid.size / data.size, 2))
+    band = RasterBand.create(nodata=None if nodata is None or np.isnan(nodata) else nodata,
+                             data_type=DataType(dtype), statistics=stats,
+                             spatial_resolution=resolution)
+    info['raster:bands'] = [band.to_dict()]
+    return info
+
+
+def is_cog(info):
+    """Tiled, with overviews unless the raster fits in one tile (fufiters.cog validates the full layout)"""
+    rows, cols = info['blocksize']
+    tiled = rows == cols and rows % 16 == 0
+    return tiled and (bool(info['overviews']) or max(info['shape']) <= cols)
+
+
+def get_raster_info(href, use_cache=True):
+    """Cached read_raster_info, returns None if the file does not exist"""
+    try:
+        checksum = fingerprint(href)
+    except FileNotFoundError:
+        return None
+
+    path = _cache_path(href, checksum)
+    if use_cache and path.exists():
+        with open(path) as f:
+            return json.load(f)
+
+    with rasterio.Env(**GDAL_ENV):
+        info = read_raster_info(href)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(info, f)
+    os.replace(tmp, path)
+    return info
+
+
+def get_raster_info_many(hrefs, workers=11, use_cache=True):
+    """Raster info for {asset name: href} read concurrently"""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda href: get_raster_info(href, use_cache), hrefs.values())
+        return dict(zip(hrefs.keys(), results))
@@ -0,0 +1,164 @@
+"""
+Stack completeness and revisit gaps for every burst in an AOI
+
+Works on the long acquisition table from planning.find_acquisitions (one row per burst and
+SLC, answered from the search cache when possible). Everything is computed with grouped
+columnar operations over all bursts at once: per-year acquisition counts, revisit gap
+histograms (12-day S1A+S1B, 12/24+ day gaps after the S1B loss, 6-day with S1C), and the
+number of n+1..n+k pairs getBurstPairs could form for each burst and year.
+
+Example:
+    python -m fufiters.report --aoi nepal.geojson --start 2017-01-01 --npairs 3 --heatmap report.png
+"""
+import argparse
+
+GAP_BINS = [0, 7, 13, 25, 37, 73, float('inf')]
+GAP_LABELS = ['<=6d', '7-12d', '13-24d', '25-36d', '37-72d', '>72d']
+# getBurstPairs searches each year up to March of the next year
+YEAR_END = '03-01'
+
+
+def prepare(acq, polarization=None):
+    """Sorted burstID/datetime/platform table, optionally for one polarization (e.g. 'VV')"""
+    import pandas as pd
+
+    df = acq.loc[:, ['burstID', 'datetime', 'platform', 'polarization']]
+    if polarization is not None:
+        df = df[df.polarization.str.contains(polarization, regex=False)]
+    df = df.assign(datetime=pd.to_datetime(df.datetime, utc=True))
+    df = df.drop_duplicates(subset=['burstID', 'datetime']).sort_values(by=['burstID', 'datetime'])
+    df['year'] = df.datetime.dt.year
+    df['gap_days'] = df.groupby('burstID').datetime.diff().dt.round('1D').dt.days
+    return df.reset_index(drop=True)
+
+
+def counts(df):
+    """Acquisitions per burst (rows) and year (columns)"""
+    return df.groupby(['burstID', 'year']).size().unstack(fill_value=0)
+
+
+def gap_histogram(df):
+    """Number of revisit gaps per burst in GAP_BINS"""
+    import pandas as pd
+
+    bins = pd.cut(df.gap_days, GAP_BINS, labels=GAP_LABELS, right=False)
+    return pd.crosstab(df.burstID, bins).reindex(columns=GAP_LABELS, fill_value=0)
+
+
+def burst_summary(df):
+    """Count, timespan, min/mode/max gap and platforms per burst"""
+    g = df.groupby('burstID')
+    summary = g.agg(count=('datetime', 'size'), first=('datetime', 'min'), last=('datetime', 'max'),
+                    gap_min=('gap_days', 'min'), gap_max=('gap_days', 'max'))
+    # Mode: most frequent gap per burst (smallest on ties)
+    gaps = df.dropna(subset=['gap_days']).groupby(['burstID', 'gap_days']).size().rename('n').reset_index()
+    gaps = gaps.sort_values(by=['burstID', 'n', 'gap_days'], ascending=[True, False, True])
+    summary['gap_mode'] = gaps.drop_duplicates(subset='burstID').set_index('burstID').gap_days
+    summary['platforms'] = (df.drop_duplicates(subset=['burstID', 'platform'])
+                            .groupby('burstID').platform.agg(lambda x: ','.join(sorted(x))))
+    summary[['first', 'last']] = summary[['first', 'last']].apply(lambda x: x.dt.strftime('%Y-%m-%d'))
+    return summary
+
+
+def pairability(df, npairs=3):
+    """n+1..n+npairs pairs possible per burst and year (references in the year, secondaries up to March)
+
+    Returns (pairs, complete) where complete means every reference has npairs secondaries
+    """
+    import numpy as np
+
+    table = counts(df)
+    years = table.columns
+    # Acquisitions per burst before the end of each year's search window
+    early = (df[df.datetime.dt.strftime('%m-%d') < YEAR_END]
+             .assign(year=lambda x: x.year - 1)
+             .groupby(['burstID', 'year']).size().unstack(fill_value=0)
+             .reindex(index=table.index, columns=years, fill_value=0))
+    window_end = table.cumsum(axis=1) + early
+
+    # Position of each acquisition in its burst stack, and acquisitions after it in the window
+    df = df.assign(position=df.groupby('burstID').cumcount() + 1)
+    stacked = window_end.stack().rename('window_end')
+    later = df.join(stacked, on=['burstID', 'year']).eval('window_end - position')
+    df = df.assign(pairs=np.minimum(later.clip(lower=0), npairs))
+
+    pairs = df.groupby(['burstID', 'year']).pairs.sum().unstack(fill_value=0).reindex(columns=years, fill_value=0)
+    complete = pairs == table * npairs
+    return pairs.astype(int), complete & (table > 0)
+
+
+def report(acq, npairs=3, polarization=None):
+    """Per-burst summary with gap histogram, and per-burst/year acquisitions and pairs"""
+    import pandas as pd
+
+    df = prepare(acq, polarization)
+    summary = burst_summary(df).join(gap_histogram(df))
+    pairs, complete = pairability(df, npairs)
+    summary['complete_years'] = complete.sum(axis=1)
+    yearly = pd.concat(dict(acquisitions=counts(df), pairs=pairs, complete=complete), axis=1)
+    return summary, yearly
+
+
+def heatmap(yearly, path, value='acquisitions'):
+    """Bursts x years heatmap of acquisitions (or pairs), years without all n+k pairs marked"""
+    import numpy as np
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    data = yearly[value]
+    fig, ax = plt.subplots(figsize=(1 + 0.45 * data.shape[1], 1 + 0.12 * data.shape[0]))
+    im = ax.imshow(data.values, aspect='auto', cmap='viridis', interpolation='nearest')
+    incomplete = ~yearly['complete'].values
+    yy, xx = np.nonzero(incomplete)
+    ax.scatter(xx, yy, marker='x', color='r', s=6, linewidths=0.5, label='cannot form all n+k pairs')
+    ax.set_xticks(range(data.shape[1]), data.columns, rotation=90, fontsize=7)
+    ax.set_yticks(range(data.shape[0]), data.index, fontsize=max(3, min(7, 400 // max(data.shape[0], 1))))
+    fig.colorbar(im, ax=ax, label=value, shrink=0.6)
+    ax.legend(loc='upper left', bbox_to_anchor=(0, -0.05), fontsize=7, frameon=False)
+    fig.tight_layout()
+    fig.savefig(path, dpi=150)
+    print('heatmap saved to', path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stack completeness and revisit gaps for many bursts")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--aoi", help="AOI polygon file (e.g. nepal.geojson)")
+    source.add_argument("--burst", nargs='+', help="Burst IDs (e.g. 012_023790_IW1)")
+    source.add_argument("--acquisitions", help="Acquisition table (.parquet) from planning.find_acquisitions")
+    parser.add_argument("-s", "--start", default="2017-01-01", help="Start date")
+    parser.add_argument("-e", "--end", default=None, help="End date")
+    parser.add_argument("-n", "--npairs", type=int, default=3, help="n+k pairs per reference")
+    parser.add_argument("-p", "--polarization", default=None, help="Only count acquisitions with this polarization")
+    parser.add_argument("-o", "--output", default=None, help="Save per-burst summary (.csv or .parquet)")
+    parser.add_argument("--heatmap", default=None, help="Save bursts x years heatmap (.png)")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+
+    if args.acquisitions:
+        acq = pd.read_parquet(args.acquisitions)
+    else:
+        from fufiters import planning
+        acq = planning.find_acquisitions(burst_ids=args.burst, aoi=args.aoi, start=args.start, end=args.end)
+
+    summary, yearly = report(acq, args.npairs, args.polarization)
+    with pd.option_context('display.width', 200, 'display.max_columns', 30):
+        print(summary.to_string())
+        print(yearly['acquisitions'].to_string())
+    print(f"{int(yearly['complete'].values.sum())} of {int((yearly['acquisitions'] > 0).values.sum())} "
+          f"burst-years can form all n+{args.npairs} pairs")
+
+    if args.output:
+        table = summary.join(yearly.set_axis([f'{m}_{y}' for m, y in yearly.columns], axis=1))
+        if args.output.endswith('.parquet'):
+            table.to_parquet(args.output)
+        else:
+            table.to_csv(args.output)
+    if args.heatmap:
+        heatmap(yearly, args.heatmap)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""
+Run a pair matrix locally on a bounded pool of worker processes
+
+The matrix JSON written by getBurstPairs.py / plan-pairs is executed on one machine instead
+of GitHub Actions. Each pair runs the pair command (hyp3-isce2 by default, any command
+template for testing) in its own scratch folder, followed by the STAC step. At most
+`workers` pairs run at once, by default as many as fit the cores (CPUS_PER_PAIR each) and
+available memory (MEMORY_GB_PER_PAIR each). DEM, orbit and calibration folders are links
+into a shared cache, and the first pair of every burst runs alone so the other pairs of
+that burst find its DEM already there. Failed pairs are retried, and the status of every
+pair is kept in a state file, so running again resumes with the pairs that are not done
+(processed pairs whose STAC step failed only repeat that step).
+
+Example:
+    state = runner.run(matrix, 'runs', burst_id='012_023790_IW1', looks='20x4')
+    python -m fufiters.runner github_outputs.txt --burst 012_023790_IW1 --workdir runs
+    python -m fufiters.runner matrix.json --command 'python stub.py {reference} {secondary}' --no-stac
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import argparse
+import datetime
+import glob
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+from fufiters.config import get_cache_dir
+
+PAIR_COMMAND = ('python -m hyp3_isce2 ++process insar_tops_fufiters {reference} {secondary} '
+                '--burstId {burstId} --polarization {polarization} --looks {looks} '
+                '--apply-water-mask False --offsets {offsets}')
+# Converts the product folder in the current directory (see scripts/hyp3isce2stac.py)
+STAC_COMMAND = f'{sys.executable} -m fufiters stac'
+# Approximate resources of one ISCE2 burst pair
+CPUS_PER_PAIR = 2
+MEMORY_GB_PER_PAIR = 4
+RETRIES = 2
+RETRY_DELAY = 30
+STATE_FILE = 'runner_state.json'
+# Folders hyp3-isce2 downloads into, linked to the shared cache ({burstId} for burst-specific data)
+SHARED = {'dem': 'dem/{burstId}', 'orbits': 'orbits', 'aux_cal': 'aux_cal'}
+
+
+def read_matrix(source):
+    """Matrix entries from a JSON file or string, or MATRIX_PARAMS_COMBINATIONS in a GITHUB_OUTPUT file"""
+    text = source
+    if os.path.exists(source):
+        with open(source) as f:
+            text = f.read()
+    for line in text.splitlines():
+        if line.startswith('MATRIX_PARAMS_COMBINATIONS='):
+            text = line.split('=', 1)[1]
+            break
+    matrix = json.loads(text)
+    return matrix['include'] if isinstance(matrix, dict) else matrix
+
+
+def default_workers(cpus_per_pair=CPUS_PER_PAIR, memory_gb_per_pair=MEMORY_GB_PER_PAIR):
+    """Pairs that fit the cores and available memory of this machine"""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+    try:
+        pages = os.sysconf('SC_AVPHYS_PAGES')
+    except (ValueError, OSError):
+        pages = os.sysconf('SC_PHYS_PAGES')
+    memory_gb = pages * os.sysconf('SC_PAGE_SIZE') / 1024**3
+    return max(1, min(cpus // cpus_per_pair, int(memory_gb // memory_gb_per_pair)))
+
+
+def pair_key(pair):
+    return f"{pair['burstId']}/{pair['name']}"
+
+
+class State:
+    """Status of every pair in a JSON file, rewritten atomically after each change"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.pairs = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.pairs = json.load(f)
+
+    def get(self, key):
+        return self.pairs.get(key, {})
+
+    def update(self, key, **fields):
+        with self.lock:
+            self.pairs[key] = dict(self.pairs.get(key, {}), **fields)
+            tmp = f'{self.path}.{os.getpid()}.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(self.pairs, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+
+
+def link_shared(workdir, cache_dir, burst_id, shared=SHARED):
+    """Link download folders of a pair scratch folder to the shared cache"""
+    for name, target in shared.items():
+        target = os.path.join(cache_dir, target.format(burstId=burst_id))
+        os.makedirs(target, exist_ok=True)
+        link = os.path.join(workdir, name)
+        if not os.path.lexists(link):
+            os.symlink(os.path.abspath(target), link)
+
+
+def run_command(command, pair, workdir, log, env=None):
+    """Run a command template for a pair in workdir, appending output to log, returns exit code"""
+    args = shlex.split(command.format(**pair))
+    with open(log, 'a') as f:
+        print(f'$ {shlex.join(args)}', file=f, flush=True)
+        return subprocess.run(args, cwd=workdir, stdout=f, stderr=subprocess.STDOUT, env=env).returncode
+
+
+def clean_scratch(workdir, shared=SHARED):
+    """Remove intermediate files, keeping the product folder(s) and logs"""
+    for path in glob.glob(os.path.join(workdir, '*')):
+        name = os.path.basename(path)
+        if name.startswith('S1_') or name.endswith('.log') or name in shared:
+            continue
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+
+
+def process_pair(pair, state, workdir, cache_dir, command=PAIR_COMMAND, stac_command=STAC_COMMAND,
+                 retries=RETRIES, retry_delay=RETRY_DELAY, threads=CPUS_PER_PAIR, clean=False):
+    """Pair command then STAC step with retries, returns final status ('done' or 'failed')"""
+    key = pair_key(pair)
+    os.makedirs(workdir, exist_ok=True)
+    link_shared(workdir, cache_dir, pair['burstId'])
+    log = os.path.join(workdir, 'runner.log')
+    env = dict(os.environ, OMP_NUM_THREADS=str(threads))
+
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(retry_delay * attempt)
+        start = time.time()
+        state.update(key, status='running', attempts=state.get(key).get('attempts', 0) + 1,
+                     started=datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'))
+        # Processed pairs (e.g. in an earlier run) only repeat the STAC step
+        if state.get(key).get('stage') != 'processed':
+            code = run_command(command, pair, workdir, log, env)
+            if code != 0:
+                state.update(key, status='failed', stage='process', returncode=code)
+                continue
+            state.update(key, stage='processed')
+        if stac_command:
+            code = run_command(stac_command, pair, workdir, log, env)
+            if code != 0:
+                state.update(key, status='failed', returncode=code)
+                continue
+        products = sorted(os.path.basename(p) for p in glob.glob(os.path.join(workdir, 'S1_*'))
+                          if os.path.isdir(p))
+        if clean:
+            clean_scratch(workdir)
+        state.update(key, status='done', stage='done', returncode=0, products=products,
+                     seconds=round(time.time() - start, 1))
+        return 'done'
+    return 'failed'
+
+
+def run(matrix, workdir, burst_id=None, polarization='VV', looks='20x4', offsets=False,
+        command=PAIR_COMMAND, stac_command=STAC_COMMAND, workers=None, cache_dir=None,
+        retries=RETRIES, retry_delay=RETRY_DELAY, threads=CPUS_PER_PAIR, clean=False):
+    """Process all pairs of matrix entries not done yet, returns the State"""
+    cache_dir = str(cache_dir or get_cache_dir('runner'))
+    workers = workers or default_workers(threads)
+    os.makedirs(workdir, exist_ok=True)
+    state = State(os.path.join(workdir, STATE_FILE))
+
+    pending = []
+    for entry in matrix:
+        pair = {'burstId': burst_id, 'polarization': polarization, 'looks': looks, 'offsets': str(offsets), **entry}
+        if pair['burstId'] is None:
+            raise ValueError(f"No burstId for {pair['name']}, set burst_id for single burst matrices")
+        if state.get(pair_key(pair)).get('status') != 'done':
+            pending.append(pair)
+    print(f'{len(matrix) - len(pending)} of {len(matrix)} pairs done, running {len(pending)} on {workers} workers')
+
+    # The first pair of a burst downloads its DEM, other pairs of the burst wait for it
+    warm, running = set(), {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            for pair in list(pending):
+                if len(running) >= workers:
+                    break
+                busy = any(p['burstId'] == pair['burstId'] for p in running.values())
+                if pair['burstId'] in warm or not busy:
+                    pending.remove(pair)
+                    pair_dir = os.path.join(workdir, pair['burstId'], pair['name'])
+                    future = pool.submit(process_pair, pair, state, pair_dir, cache_dir, command, stac_command,
+                                         retries, retry_delay, threads, clean)
+                    running[future] = pair
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                pair = running.pop(future)
+                status = future.result()
+                if status == 'done':
+                    warm.add(pair['burstId'])
+                print(f"{pair_key(pair)}: {status} ({len(pending)} pending, {len(running)} running)")
+
+    statuses = [entry.get('status') for entry in state.pairs.values()]
+    print(f"{statuses.count('done')} done, {statuses.count('failed')} failed, state in {state.path}")
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a pair matrix locally on a bounded process pool")
+    parser.add_argument("matrix", help="Matrix JSON file or string, or a GITHUB_OUTPUT file from plan-pairs")
+    parser.add_argument("-d", "--workdir", default="runs", help="Scratch folders ({burstId}/{name}) and state file")
+    parser.add_argument("-b", "--burst", default=None, help="Burst ID for matrices of a single burst")
+    parser.add_argument("-p", "--polarization", default="VV", help="Polarization")
+    parser.add_argument("-l", "--looks", default="20x4", help="Range x Azimuth looks")
+    parser.add_argument("--offsets", default=False, action="store_true", help="Pixel offset pairs")
+    parser.add_argument("-c", "--command", default=PAIR_COMMAND,
+                        help="Pair command template ({reference}, {secondary}, {burstId}, {name}, ...)")
+    parser.add_argument("--stac-command", default=STAC_COMMAND, help="Command run in the pair folder afterwards")
+    parser.add_argument("--no-stac", default=False, action="store_true", help="Skip the STAC step")
+    parser.add_argument("-w", "--workers", default=None, type=int, help="Concurrent pairs (default: fit cores and memory)")
+    parser.add_argument("-t", "--threads", default=CPUS_PER_PAIR, type=int, help="OMP threads per pair")
+    parser.add_argument("--cache", default=None, help="Shared DEM/orbit cache directory")
+    parser.add_argument("-r", "--retries", default=RETRIES, type=int, help="Retries per pair")
+    parser.add_argument("--retry-delay", default=RETRY_DELAY, type=float, help="Seconds before the first retry")
+    parser.add_argument("--clean", default=False, action="store_true", help="Remove scratch files of finished pairs")
+    args = parser.parse_args(argv)
+
+    state = run(read_matrix(args.matrix), args.workdir, args.burst, args.polarization, args.looks, args.offsets,
+                args.command, None if args.no_stac else args.stac_command, args.workers, args.cache,
+                args.retries, args.retry_delay, args.threads, args.clean)
+    failed = [key for key, entry in state.pairs.items() if entry.get('status') == 'failed']
+    if failed:
+        print('Failed:', ' '.join(sorted(failed)))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+"""
+Persistent cache of ASF search results with incremental refresh
+
+Results are stored as GeoParquet, one file per normalized query (platform,
+processingLevel, beamMode, relativeOrbit, intersectsWith, ...). The date window is
+not part of the key: each entry records the time span it covers, so a query for a
+single year is answered from a cached 2017-to-now stack and a repeat query only asks
+CMR for granules newer than the newest startTime already held.
+
+Set FUFITERS_OFFLINE=1 (or offline=True) to never contact CMR. Responses can be
+recorded with record_search() and served back with replay_search() for testing.
+
+Example:
+    from fufiters import searchcache
+    gf = searchcache.search(platform=[asf.PLATFORM.SENTINEL1], processingLevel='SLC',
+                            relativeOrbit=12, intersectsWith='POINT(86.9 27.9)', start='2017-01-01')
+"""
+import datetime
+import hashlib
+import json
+import os
+
+import geopandas as gpd
+import pandas as pd
+import shapely
+
+from fufiters.config import get_cache_dir
+
+# Don't ask CMR again for open-ended queries refreshed more recently than this
+REFRESH_INTERVAL = pd.Timedelta(hours=6)
+# Evict entries not used for this long
+TTL = pd.Timedelta(days=30)
+# Evict least recently used entries beyond this total size
+MAX_BYTES = 2 * 1024**3
+INDEX_FILE = 'index.json'
+# Columns that uniquely identify a granule when merging refreshed results
+ID_COLUMNS = ['fileID', 'sceneName']
+
+
+def _now():
+    return pd.Timestamp.now(tz='UTC')
+
+
+def _to_datetime(value):
+    """Parse dates like '2017-01-01' or '2 months ago' to a UTC timestamp"""
+    if value is None:
+        return None
+    try:
+        ts = pd.Timestamp(value)
+    except ValueError:
+        import dateparser
+        ts = pd.Timestamp(dateparser.parse(value, settings={'TIMEZONE': 'UTC',
+                                                            'RETURN_AS_TIMEZONE_AWARE': True}))
+    if ts.tzinfo is None:
+        ts = ts.tz_localize('UTC')
+    return ts.tz_convert('UTC')
+
+
+def _normalize_value(key, value):
+    if key == 'intersectsWith':
+        return shapely.to_wkt(shapely.from_wkt(value).normalize(), rounding_precision=6)
+    if isinstance(value, (list, tuple, set)):
+        return sorted(str(x) for x in value)
+    if isinstance(value, (int, float)):
+        return value
+    return str(value)
+
+
+def normalize_query(query):
+    """Normalized search parameters, excluding the date window"""
+    return {k: _normalize_value(k, v) for k, v in sorted(query.items())
+            if v is not None and k not in ('start', 'end')}
+
+
+def make_key(query):
+    """Short stable hash of a normalized query"""
+    text = json.dumps(normalize_query(query), sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+def _asf_search(**query):
+    import asf_search as asf
+
+    results = asf.search(**query)
+    return to_geodataframe(results.geojson())
+
+
+def to_geodataframe(geojson):
+    """GeoDataFrame from ASF GeoJSON FeatureCollection (empty results keep a geometry column)"""
+    if len(geojson['features']) == 0:
+        return gpd.GeoDataFrame(geometry=[], crs=4326)
+    return gpd.GeoDataFrame.from_features(geojson, crs=4326)
+
+
+def record_search(directory, search_fn=None):
+    """Wrap an ASF search so every response is also saved as GeoJSON for later replay"""
+    import asf_search as asf
+
+    os.makedirs(directory, exist_ok=True)
+    search_fn = search_fn or asf.search
+
+    def _search(**query):
+        geojson = search_fn(**query).geojson()
+        key = make_key(query)
+        path = os.path.join(directory, f'{key}.geojson')
+        # Append features if the same query is recorded for several date windows
+        if os.path.exists(path):
+            with open(path) as f:
+                features = json.load(f)['features']
+            geojson = dict(geojson, features=features + geojson['features'])
+        with open(path, 'w') as f:
+            json.dump(geojson, f)
+        return to_geodataframe(geojson)
+
+    return _search
+
+
+def replay_search(directory):
+    """Search function answering from GeoJSON recorded with record_search (no network)"""
+    def _search(**query):
+        path = os.path.join(directory, f'{make_key(query)}.geojson')
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'No recorded response for {normalize_query(query)}')
+        with open(path) as f:
+            gf = to_geodataframe(json.load(f))
+        gf = gf.drop_duplicates(subset=_id_column(gf))
+        return _filter_window(gf, _to_datetime(query.get('start')), _to_datetime(query.get('end')))
+
+    return _search
+
+
+def _id_column(gf):
+    return next((c for c in ID_COLUMNS if c in gf.columns), None)
+
+
+def _filter_window(gf, start, end):
+    if len(gf) == 0:
+        return gf
+    times = pd.to_datetime(gf.startTime, utc=True)
+    keep = pd.Series(True, index=gf.index)
+    if start is not None:
+        keep &= times >= start
+    if end is not None:
+        keep &= times <= end
+    return gf[keep]
+
+
+def _merge(gf, new):
+    """Combine cached and new results, newest first like ASF"""
+    if gf is None or len(gf) == 0:
+        gf = new
+    elif len(new) > 0:
+        gf = pd.concat([gf, new], ignore_index=True)
+    if len(gf) == 0:
+        return gf
+    gf = gf.drop_duplicates(subset=_id_column(gf), keep='last')
+    order = pd.to_datetime(gf.startTime, utc=True).sort_values(ascending=False).index
+    return gpd.GeoDataFrame(gf.loc[order].reset_index(drop=True), crs=4326)
+
+
+class SearchCache:
+    """Directory of cached search results plus a JSON index of what each entry covers"""
+
+    def __init__(self, directory=None, ttl=TTL, max_bytes=MAX_BYTES):
+        self.directory = directory or get_cache_dir('asf')
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def read_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path) as f:
+            return json.load(f)
+
+    def write_index(self, index):
+        tmp = f'{self.index_path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp, self.index_path)
+
+    def path(self, key):
+        return os.path.join(self.directory, f'{key}.parquet')
+
+    def read(self, key):
+        if not os.path.exists(self.path(key)):
+            return None
+        return gpd.read_parquet(self.path(key))
+
+    def write(self, key, gf):
+        tmp = f'{self.path(key)}.{os.getpid()}.tmp'
+        gf.to_parquet(tmp)
+        os.replace(tmp, self.path(key))
+
+    def evict(self, index=None):
+        """Remove entries unused for longer than TTL, then least recently used beyond max_bytes"""
+        index = self.read_index() if index is None else index
+        now = _now()
+        for key in list(index):
+            if now - pd.Timestamp(index[key]['last_access']) > self.ttl or not os.path.exists(self.path(key)):
+                self._remove(index, key)
+
+        total = sum(entry['nbytes'] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= index[key]['nbytes']
+            self._remove(index, key)
+
+        return index
+
+    def _remove(self, index, key):
+        entry = index.pop(key)
+        if os.path.exists(self.path(key)):
+            os.remove(self.path(key))
+        print('Evicted cached search', key, entry['query'])
+
+    def search(self, search_fn=None, offline=None, refresh_interval=REFRESH_INTERVAL, **query):
+        """ASF search answered from cache, asking CMR only for dates not covered yet"""
+        search_fn = search_fn or _asf_search
+        if offline is None:
+            offline = os.environ.get('FUFITERS_OFFLINE', '0') == '1'
+        start = _to_datetime(query.pop('start', None))
+        end = _to_datetime(query.pop('end', None))
+        key = make_key(query)
+        now = _now()
+
+        index = self.read_index()
+        entry = index.get(key)
+        gf = self.read(key) if entry else None
+
+        # Date windows (start, end) that still need to be requested from CMR
+        windows = []
+        if gf is None:
+            windows.append((start, end))
+        else:
+            covered_start = _to_datetime(entry['covered_start'])
+            covered_end = _to_datetime(entry['covered_end'])
+            if covered_start is not None and (start is None or start < covered_start):
+                windows.append((start, covered_start))
+            wanted_end = min(end, now) if end is not None else now
+            stale = end is not None or now - covered_end > refresh_interval
+            if wanted_end > covered_end and stale:
+                newest = _to_datetime(pd.to_datetime(gf.startTime, utc=True).max()) if len(gf) else covered_end
+                windows.append((newest, end))
+
+        if windows and offline:
+            if gf is None:
+                raise RuntimeError(f'Offline and no cached results for {normalize_query(query)}')
+            print('Offline: using cached results up to', entry['covered_end'])
+            windows = []
+
+        for win_start, win_end in windows:
+            print('Searching ASF', normalize_query(query), win_start, win_end)
+            new = search_fn(**query,
+                            start=win_start.isoformat() if win_start is not None else None,
+                            end=win_end.isoformat() if win_end is not None else None)
+            gf = _merge(gf, new)
+
+        if windows:
+            starts = [s for s, _ in windows] + ([_to_datetime(entry['covered_start'])] if entry else [])
+            ends = [min(e, now) if e is not None else now for _, e in windows]
+            ends += [_to_datetime(entry['covered_end'])] if entry else []
+            entry = dict(query=normalize_query(query),
+                         covered_start=None if None in starts else str(min(starts)),
+                         covered_end=str(max(ends)))
+            self.write(key, gf)
+
+        if entry is not None:
+            entry['last_access'] = str(now)
+            entry['nbytes'] = os.path.getsize(self.path(key))
+            index[key] = entry
+            self.write_index(self.evict(index))
+
+        return _filter_window(gf, start, end).reset_index(drop=True)
+
+
+def search(search_fn=None, offline=None, cache_dir=None, **query):
+    """Cached drop-in for asf.search(...) that returns a GeoDataFrame"""
+    return SearchCache(cache_dir).search(search_fn=search_fn, offline=offline, **query)
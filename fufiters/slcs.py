@@ -0,0 +1,83 @@
+"""
+Search ASF for SLCs containing a specific burst
+
+Example:
+    gfB = slcs.get_burst_metadata('135_289664_IW1')
+    gf = slcs.search_for_slcs(gfB, '2020-01-01', None)
+"""
+
+
+def get_burst_metadata(burstID):
+    import asf_search as asf
+    import geopandas as gpd
+
+    print('Searching for Burst Metdata...')
+    results = asf.granule_search([f'S1_{burstID}-BURSTMAP'])
+    gfB = gpd.GeoDataFrame.from_features(results.geojson(), crs=4326)
+    gfB["burstID"] = gfB.fileID.str[3:-9]
+    gfB = gfB.dropna(axis='columns')
+    print(gfB.iloc[0])
+
+    return gfB
+
+
+def search_for_slcs(gfB, start, end):
+    print('Searching for ASF for SLCs...')
+    import asf_search as asf
+    import pandas as pd
+    from fufiters import arrowsearch, searchcache
+    from fufiters.config import get_cache_dir
+
+    burst = gfB.iloc[0]
+    gf = searchcache.search(
+                    search_fn=arrowsearch.search,
+                    cache_dir=get_cache_dir('asf', 'arrow'),
+                    platform=[asf.PLATFORM.SENTINEL1],
+                    processingLevel='SLC', #or BURST from 2023 onwards for select paths
+                    beamMode=asf.BEAMMODE.IW,
+                    relativeOrbit=int(burst.pathNumber),
+                    intersectsWith=f"POINT({burst.centerLon} {burst.centerLat})",
+                    start=start,
+                    end=end,
+                    )
+    gf['datetime'] = pd.to_datetime(gf['startTime'])
+
+    print('BurstID:', burst.burstID)
+    print('Number of SLCs:', len(gf))
+    print('Timespan:', gf.startTime.iloc[0], gf.startTime.iloc[-1])
+    print('Polarizations:', list(gf.polarization.unique()))
+    print('platforms:', list(gf.platform.unique()))
+    s = gf.datetime.diff(-1).dt.round('1D').dt.days.dropna().astype('i2')
+    print('Temporal separation (min, mode, max days):', s.min(),  s.mode()[0], s.max())
+
+    return gf
+
+
+def slippy_map(gf, gfB):
+    """Plot SLC footprints (one per track/frame) and burst using folium and open in browser"""
+    # Interactive map from CLI
+    import webbrowser
+    import folium
+    from folium.plugins import MiniMap
+    from fufiters import maps
+    path = '/tmp/mapSLCs.html'
+    frames = maps.footprints(gf)
+    print(f'{len(gf)} SLCs on {len(frames)} unique footprints')
+    m = maps.simplify(frames).explore(tiles='Esri.WorldImagery', color='cyan', style_kwds=dict(fill=None))
+    maps.slim(gfB, ['burstID']).explore(m=m, column='burstID', cmap=['magenta'], legend=True)
+    MiniMap(position="topright").add_to(m)
+    m.save(path)
+    print('map saved to', path)
+    webbrowser.open(f'file://{path}')
+
+
+def timeline(gf, burstID):
+    """ Plot timeline of SLC acquisitions """
+    # Interactive map from CLI
+    import matplotlib.pyplot as plt
+    plt.figure(figsize=(11,4))
+    plt.scatter(gf.datetime, gf.platform, marker='|', color='k')
+    plt.title(burstID)
+    plt.plot()
+    plt.show()
+    #plt.savefig(f'/tmp/{burstID}-timeline.pdf')
@@ -0,0 +1,547 @@
+"""
+Create STAC Items and Collections for fufiters (hyp3-isce2) products
+
+hyp32stac() converts the single product folder in the current directory (as run at the
+end of a processing job). bulk() converts many product folders, local or remote
+(s3://bucket/insar/...), concurrently and adds them to a Collection whose extent and
+summaries are updated incrementally.
+
+Example:
+    python -m fufiters.stac s3://fufiters/insar/012_023790_IW1 --dest ./catalog --workers 16
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+import argparse
+import glob
+import os
+import re
+import sys
+
+import xml.etree.ElementTree as ET
+
+
+def _open(path, mode='r'):
+    """Open local or remote (fsspec) file"""
+    import fsspec
+    return fsspec.open(path, mode)
+
+
+def read_product_metadata(path):
+    """Parse hyp3 product .txt file ('Key: value' lines)"""
+    with _open(path) as f:
+        lines = [x.rstrip() for x in f if x.strip()]
+    return dict([x.split(': ', 1) for x in lines])
+
+
+def read_relative_orbit(manifest_path):
+    """Relative orbit number from manifest.safe, stops parsing at the first match"""
+    with _open(manifest_path, 'rb') as f:
+        for _, elem in ET.iterparse(f, events=('end',)):
+            if elem.tag.endswith('relativeOrbitNumber') and elem.get('type') == 'start':
+                return elem.text.zfill(3)
+    raise ValueError(f'No relativeOrbitNumber in {manifest_path}')
+
+
+def create_item(product_dir, burst_id=None, manifest_path=None, log_path=None, remote_root=None,
+                raster_info=True, browse_format=None, browse_dest=None, file_info=False):
+    ''' convert ASF HYP3 Output folder to STAC ITEM
+    product_dir is a local or remote (s3://...) folder like S1_023790_IW1_20230621_20230703_VV_INT80
+    relative orbit comes from burst_id (e.g. 012_023790_IW1), manifest.safe, or the store layout path
+    raster_info adds raster:bands (dtype, nodata, approximate statistics) to every COG asset
+    browse_format ('png' or 'webp') adds browse/thumbnail images read from COG overviews, written
+    to the product folder or to browse_dest (e.g. the Item folder of a catalog)
+    file_info adds file:checksum (sha2-256 multihash) and file:size to assets of a local product folder
+    '''
+    import pystac
+    from pystac.utils import str_to_datetime
+    import rasterio
+    from rio_stac.stac import PROJECTION_EXT_VERSION, RASTER_EXT_VERSION
+    from rio_stac.stac import bbox_to_geom, get_dataset_geom, get_projection_info
+
+    product_dir = product_dir.rstrip('/')
+    outdir = os.path.basename(product_dir)
+    prefix = outdir[14:31]
+
+    # Parse Product File
+    meta = read_product_metadata(f'{product_dir}/{outdir}.txt')
+    ref = meta['Reference Granule']
+    sec = meta['Secondary Granule']
+
+    # Get Relative Orbit for unique BurstId
+    if burst_id is None and manifest_path is None:
+        # Store layout {kind}/{burstId}/{YYYYMMDD_YYYYMMDD}/{product}/
+        burst_id = burst_id_from_path(product_dir)
+        if burst_id is None:
+            raise ValueError(f'No burst_id or manifest_path for {product_dir}, and the burst ID '
+                             'is not in its path ({kind}/{burstId}/{YYYYMMDD_YYYYMMDD}/{product})')
+    if burst_id is not None:
+        ESABurstId = burst_id
+    else:
+        relative_orbit_number = read_relative_orbit(manifest_path)
+        ESABurstId = f'{relative_orbit_number}{ref[2:13]}'
+
+    # remote files
+    if remote_root is None:
+        if '://' in product_dir:
+            remote_root = product_dir
+        else:
+            remote_root = f's3://fufiters/{ESABurstId}/{prefix}/{outdir}'
+    gdal_path = f'{remote_root}/{outdir}'
+
+    # Mapping of assets
+    assets = [
+        {"name": "conncomp", "href": gdal_path+'_conncomp.tif', "role": ['data'], "type":pystac.MediaType.COG},
+        {"name": "corr", "href": gdal_path+'_corr.tif', "role": ['data'], "type":pystac.MediaType.COG},
+        {"name": "dem", "href": gdal_path+'_dem.tif', "role": ['data'], "type":pystac.MediaType.COG},
+        {"name": "lv_phi", "href": gdal_path+'_lv_phi.tif', "role": ['data'], "type":pystac.MediaType.COG},
+        {"name": "lv_theta", "href": gdal_path+'_lv_theta.tif', "role": ['data'], "type":pystac.MediaType.COG},
+        {"name": "unwrapped", "href": gdal_path+'_unw_phase.tif', "role": ['data'], "type":pystac.MediaType.COG},
+        {"name": "wrapped", "href": gdal_path+'_wrapped_phase.tif', "role": ['data'], "type":pystac.MediaType.COG},
+        {"name": "metadata", "href": gdal_path+'.txt', "role": ['metadata'], "type":pystac.MediaType.TEXT},
+        # Add custom outputs
+        {"name": "azimuth_offsets", "href": gdal_path+'_azi_off.tif', "role": ['metadata'], "type":pystac.MediaType.COG},
+        {"name": "range_offsets", "href": gdal_path+'_rng_off.tif', "role": ['metadata'], "type":pystac.MediaType.COG},
+    ]
+
+    # Assume all tifs same dimensions (offsets-only products have no unwrapped phase)
+    grid_file = f'{product_dir}/{outdir}_unw_phase.tif'
+    if not _exists(grid_file):
+        grid_file = f'{product_dir}/{outdir}_azi_off.tif'
+    with rasterio.open(grid_file) as src_dst:
+        # Get BBOX and Footprint
+        dataset_geom = get_dataset_geom(src_dst, densify_pts=0, precision=-1)
+        bbox = dataset_geom["bbox"]
+
+        proj_info = {
+            f"proj:{name}": value
+            for name, value in get_projection_info(src_dst).items()
+        }
+
+    # Header-only reads of all COGs at once (local files, or remote range requests)
+    infos = {}
+    if raster_info:
+        from fufiters import rasterinfo
+        hrefs = {asset["name"]: f'{product_dir}/{os.path.basename(asset["href"])}'
+                 for asset in assets if asset["type"] == pystac.MediaType.COG}
+        infos = rasterinfo.get_raster_info_many(hrefs)
+        # Rasters that were not converted to COGs (see fufiters.cog) are plain GeoTIFFs
+        for asset in assets:
+            info = infos.get(asset["name"])
+            if info is not None and not rasterinfo.is_cog(info):
+                asset["type"] = pystac.MediaType.GEOTIFF
+
+    # Browse images and thumbnails from the coarsest suitable overview of each COG
+    if browse_format is not None:
+        from fufiters import browse
+        hrefs = {asset["name"]: f'{product_dir}/{os.path.basename(asset["href"])}' for asset in assets}
+        images = browse.make_browse_many(hrefs, dest=browse_dest, fmt=browse_format)
+        media_type = browse.FORMATS[browse_format][1]
+        for name, paths in images.items():
+            for kind, role in [('browse', 'overview'), ('thumbnail', 'thumbnail')]:
+                filename = os.path.basename(paths[kind])
+                href = f'./{filename}' if browse_dest else f'{remote_root}/{filename}'
+                assets.append({"name": f"{name}_{kind}", "href": href, "role": [role], "type": media_type})
+
+    # Streaming checksums of every file in the product folder
+    files = {}
+    if file_info and '://' not in product_dir:
+        from fufiters import manifest
+        files = manifest.build(product_dir)
+
+    pystac_assets = []
+
+    for asset in assets:
+        extra_fields = {}
+        info = infos.get(asset["name"])
+        if info is not None:
+            extra_fields["raster:bands"] = info["raster:bands"]
+            # Only record grid for assets that differ from the item grid
+            if info["shape"] != list(proj_info.get("proj:shape", [])):
+                extra_fields["proj:shape"] = info["shape"]
+                extra_fields["proj:transform"] = info["transform"]
+        entry = files.get(os.path.basename(asset["href"]))
+        if entry is not None:
+            extra_fields["file:checksum"] = entry["checksum"]
+            extra_fields["file:size"] = entry["size"]
+        pystac_assets.append(
+            (
+                asset["name"],
+                pystac.Asset(
+                    href=asset["href"],
+                    media_type=asset["type"],
+                    extra_fields=extra_fields,
+                    roles=asset["role"],
+                ),
+            )
+        )
+
+    start = ref.split('_')[3]
+    end = sec.split('_')[3]
+
+    # additional properties to add in the item
+    properties = dict(
+                      start_datetime=str_to_datetime(start).isoformat()+'Z',
+                      end_datetime=str_to_datetime(end).isoformat()+'Z',
+                      burstId=ESABurstId,
+                      passDirection=meta['Reference Pass Direction'],
+                      perpendicularBaseline=meta['Baseline'],
+                      demSource=meta['DEM source'],
+                      granules=[ref,sec],
+                     )
+    # Parse processing timestamps and per-step timings (isce.log is uploaded with newer products)
+    if log_path is None:
+        log_path = f'{product_dir}/isce.log'
+    timing = None
+    if _exists(log_path):
+        from fufiters import timing as isce_timing
+        timing = isce_timing.read_isce_log(log_path)
+    if timing is not None:
+        properties['processingDate'] = timing['start']
+        properties.update(isce_timing.processing_properties(timing))
+    #properties['sat:orbit_state']=row.flightDirection.lower()
+    # Add projection information
+    properties.update(proj_info)
+
+    # WARNING: only works for non-redundant time series
+    input_datetime = str_to_datetime(start)
+
+    # STAC Item Id
+    id = outdir
+
+    extensions =[
+        f"https://stac-extensions.github.io/projection/{PROJECTION_EXT_VERSION}/schema.json",
+    ]
+    if infos:
+        extensions.append(f"https://stac-extensions.github.io/raster/{RASTER_EXT_VERSION}/schema.json")
+    if timing is not None:
+        extensions.append("https://stac-extensions.github.io/processing/v1.2.0/schema.json")
+    if files:
+        extensions.append("https://stac-extensions.github.io/file/v2.1.0/schema.json")
+
+    # item
+    item = pystac.Item(
+        id=id,
+        geometry=bbox_to_geom(bbox),
+        bbox=bbox,
+        stac_extensions=extensions,
+        datetime=input_datetime,
+        properties=properties,
+    )
+
+    for key, asset in pystac_assets:
+        item.add_asset(key=key, asset=asset)
+
+    return item
+
+
+def _exists(path):
+    import fsspec
+    fs, path = fsspec.core.url_to_fs(path)
+    return fs.exists(path)
+
+
+def hyp32stac():
+    ''' convert ASF HYP3 Ouput to STAC ITEM
+    assumes single hyp3isce output folder in current directory (S1_023790_IW1_20230621_20230703_VV_INT80_6983)
+    '''
+    outdir = glob.glob('S1_*[!zip]')[0]
+    manifest_path = glob.glob('*/manifest.safe')[0]
+    item = create_item(outdir, manifest_path=manifest_path, log_path='isce.log', browse_format='png',
+                       file_info=True)
+
+    #item.validate()
+    # relative paths in item:
+    # "href": "./S1_023790_IW1_20230621_20230703_VV_INT80_4182/S1_023790_IW1_20230621_20230703_VV_INT80_4182_rng_off.tif
+    #item.set_self_href(f'{remote_root}/{outdir}.json')
+    item.save_object(dest_href=f'./{outdir}/{outdir}.json')
+
+    # Checksums of all files (including the Item) for uploads of changed files only
+    from fufiters import manifest
+    manifest.write(outdir, manifest.build(outdir))
+
+    return item
+
+
+def burst_id_from_path(product_dir):
+    """Full burst ID from store layout {kind}/{burstId}/{YYYYMMDD_YYYYMMDD}/{product}/ (or None)"""
+    parts = product_dir.rstrip('/').split('/')
+    if len(parts) >= 3 and re.fullmatch(r'\d{3}_\d{6}_IW\d', parts[-3]):
+        return parts[-3]
+    return None
+
+
+def find_products(prefix):
+    """Product folders under a local or remote prefix as (product_dir, burst_id)"""
+    import fsspec
+
+    fs, path = fsspec.core.url_to_fs(prefix)
+    protocol = prefix.split('://')[0] + '://' if '://' in prefix else ''
+    products = []
+    for file in fs.find(path):
+        parts = file.split('/')
+        if len(parts) >= 2 and parts[-1] == f'{parts[-2]}.txt' and parts[-2].startswith('S1_'):
+            product_dir = protocol + '/'.join(parts[:-1])
+            products.append((product_dir, burst_id_from_path(product_dir)))
+    return products
+
+
+def _create_item_dict(product_dir, burst_id, browse_format=None, dest=None):
+    # Items are returned as dicts so they can be sent back from worker processes
+    browse_dest = None
+    if browse_format is not None and dest is not None:
+        browse_dest = os.path.join(dest, os.path.basename(product_dir.rstrip('/')))
+        os.makedirs(browse_dest, exist_ok=True)
+    return create_item(product_dir, burst_id=burst_id, browse_format=browse_format,
+                       browse_dest=browse_dest).to_dict()
+
+
+def create_items(products, workers=8, processes=False, browse_format=None, dest=None, failed=None):
+    """Create Items for many (product_dir, burst_id) concurrently, yielding them as they complete
+
+    With browse_format, browse images are written to dest/{product}/ (next to the Item JSON).
+    Products whose Item cannot be created are reported and appended to the failed list as
+    (product_dir, error message).
+    """
+    import pystac
+
+    Executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with Executor(max_workers=workers) as executor:
+        futures = {executor.submit(_create_item_dict, d, b, browse_format, dest): d for d, b in products}
+        for future in as_completed(futures):
+            try:
+                yield pystac.Item.from_dict(future.result())
+            except Exception as e:
+                print(f'Failed to create Item for {futures[future]}: {e}')
+                if failed is not None:
+                    failed.append((futures[future], str(e)))
+
+
+def update_collection(collection, items):
+    """Expand collection extent and summaries with new items (no re-read of existing items)"""
+    import pystac
+    from pystac.utils import str_to_datetime
+
+    bboxes = [item.bbox for item in items]
+    starts = [str_to_datetime(item.properties['start_datetime']) for item in items]
+    ends = [str_to_datetime(item.properties['end_datetime']) for item in items]
+    if not bboxes:
+        return collection
+
+    if collection.extra_fields.get('fufiters:empty', False):
+        bbox = [min(b[0] for b in bboxes), min(b[1] for b in bboxes),
+                max(b[2] for b in bboxes), max(b[3] for b in bboxes)]
+        interval = [min(starts), max(ends)]
+        collection.extra_fields.pop('fufiters:empty')
+    else:
+        old = collection.extent.spatial.bboxes[0]
+        bbox = [min([old[0]] + [b[0] for b in bboxes]), min([old[1]] + [b[1] for b in bboxes]),
+                max([old[2]] + [b[2] for b in bboxes]), max([old[3]] + [b[3] for b in bboxes])]
+        old_start, old_end = collection.extent.temporal.intervals[0]
+        interval = [min([old_start] + starts), max([old_end] + ends)]
+    collection.extent.spatial.bboxes = [bbox]
+    collection.extent.temporal.intervals = [interval]
+
+    summaries = collection.summaries
+    for key in ['burstId', 'passDirection']:
+        values = set(summaries.get_list(key) or []) | {item.properties[key] for item in items}
+        summaries.add(key, sorted(values))
+    baselines = [float(item.properties['perpendicularBaseline']) for item in items]
+    old = summaries.get_range('perpendicularBaseline')
+    if old is not None:
+        baselines += [old.minimum, old.maximum]
+    summaries.add('perpendicularBaseline', pystac.RangeSummary(min(baselines), max(baselines)))
+
+    return collection
+
+
+def bulk(products, dest, collection_id='fufiters', workers=8, processes=False, batch_size=100,
+         inventory=None, browse_format=None, failed=None):
+    """Add Items for many products to a self-contained Collection at dest
+
+    An existing dest/collection.json is extended. Only new items and collection.json are written.
+    Items are also appended to the stac-geoparquet inventory at inventory (see fufiters.catalog).
+    With browse_format ('png' or 'webp') browse images and thumbnails are added next to each Item.
+    Products that fail are skipped and appended to the failed list (see create_items).
+    """
+    import pystac
+    from pystac.link import Link
+
+    collection_path = os.path.join(dest, 'collection.json')
+    if os.path.exists(collection_path):
+        collection = pystac.Collection.from_file(collection_path)
+    else:
+        collection = create_collection(collection_id)
+        # Extent is replaced by the first items rather than expanded from the global default
+        collection.extra_fields['fufiters:empty'] = True
+        collection.set_self_href(collection_path)
+
+    existing = {os.path.basename(os.path.dirname(link.href)) for link in collection.get_links('item')}
+    # Item IDs are product folder names, skip those before reading any rasters
+    new = [(d, b) for d, b in products if os.path.basename(d.rstrip('/')) not in existing]
+    if len(new) < len(products):
+        print(f'Skipping {len(products) - len(new)} products already in {collection_path}')
+    batch = []
+    nitems = 0
+    for item in create_items(new, workers, processes, browse_format, dest, failed):
+        if item.id in existing:
+            continue
+        existing.add(item.id)
+        item_href = f'./{item.id}/{item.id}.json'
+        item.collection_id = collection.id
+        item.set_self_href(os.path.join(dest, item.id, f'{item.id}.json'))
+        item.add_link(Link(rel='collection', target='../collection.json', media_type=pystac.MediaType.JSON))
+        item.save_object(include_self_link=False)
+        collection.add_link(Link(rel='item', target=item_href, media_type=pystac.MediaType.JSON))
+        batch.append(item)
+        nitems += 1
+        if len(batch) >= batch_size:
+            _save_batch(collection, batch, inventory)
+            batch = []
+
+    _save_batch(collection, batch, inventory)
+    print(f'Added {nitems} items to {collection_path}')
+    return collection
+
+
+def _save_batch(collection, items, inventory=None):
+    update_collection(collection, items)
+    collection.save_object(include_self_link=False)
+    if inventory is not None and items:
+        from fufiters import catalog
+        catalog.write(inventory, items)
+
+
+# NOTE: copied from https://github.com/stactools-packages/sentinel1/blob/main/src/stactools/sentinel1/rtc/constants.py
+# General Sentinel-1 Constants
+# Plain values, pystac objects are built in create_collection() so importing this module stays fast
+SENTINEL_LICENSE = "https://sentinel.esa.int/documents/247904/690755/Sentinel_Data_Legal_Notice"
+
+SENTINEL_INSTRUMENTS = ["c-sar"]
+SENTINEL_CONSTELLATION = "sentinel-1"
+SENTINEL_PLATFORMS = ["sentinel-1a", "sentinel-1b"]
+SENTINEL_FREQUENCY_BAND = "C"
+SENTINEL_CENTER_FREQUENCY = 5.405
+SENTINEL_OBSERVATION_DIRECTION = "right"
+
+SENTINEL_PROVIDER = dict(
+    name="ESA",
+    roles=["licensor", "producer"],
+    url="https://sentinel.esa.int/web/sentinel/missions/sentinel-1",
+)
+
+SENTINEL_LICENSE = "https://spacedata.copernicus.eu/data-offer/legal-documents"
+
+SENTINEL_BURST_PROVIDER = dict(
+    name="ASF DAAC",
+    roles=["licensor", "processor", "host"],
+    url="https://hyp3-docs.asf.alaska.edu/guides/burst_insar_product_guide/",
+    extra_fields={
+        "processing:level": "L3",
+        "processing:lineage": "ASF DAAC HyP3 2023 using the hyp3_isce2 plugin version 0.9.2 running ISCE release 2.6.3",  # noqa: E501
+        "processing:software": {"ISCE2": "2.6.3"},
+    },
+)
+
+SENTINEL_BURST_LICENSE = "https://doi.org/10.5281/zenodo.8007397"
+
+SENTINEL_BURST_DESCRIPTION = "SAR Interferometry (InSAR) products and their associated files. The source data for these products are Sentinel-1 bursts, extracted from Single Look Complex (SLC) products processed by ESA, and they were processed using InSAR Scientific Computing Environment version 2 (ISCE2) software."  # noqa: E501
+
+# NOTE: GLobal forward processing of available bursts started June 2023
+# Select areas have more available back to S1A data availability of October 2014!
+SENTINEL_BURST_START: datetime = datetime(2019, 1, 1, tzinfo=timezone.utc)
+SENTINEL_BURST_BBOX = [-180, -90, 180, 90]
+
+# NOTE: so far, just working with 10
+#utm_zones = ["10"]#, "11", "12", "13", "14", "15", "16", "17", "18", "19"]
+# SENTINEL_BURST_EPSGS = [int(f"326{x}") for x in utm_zones]
+
+SENTINEL_BURST_SAR: Dict[str, Any] = {
+    "instrument_mode": "IW",
+    "product_type": "UNW",
+    "polarizations": ["VV"],
+    "looks_range": 5,
+    "looks_azimuth": 1,
+    "gsd": 20,  # final MGRS pixel posting
+}
+
+
+def create_collection(collection_id):
+    ''' aggregate summary of items at collection level '''
+    import pystac
+    from pystac import Extent, SpatialExtent, Summaries, TemporalExtent
+    from pystac.extensions.projection import ProjectionExtension
+    from pystac.extensions.raster import RasterExtension
+    from pystac.extensions.sar import SarExtension
+    from pystac.extensions.sat import SatExtension
+
+    summary_dict = {
+        "constellation": [SENTINEL_CONSTELLATION],
+        "platform": SENTINEL_PLATFORMS,
+        "gsd": [SENTINEL_BURST_SAR["gsd"]],
+        # "proj:epsg": SENTINEL_BURST_EPSGS,
+    }
+
+    collection = pystac.Collection(
+        id=collection_id, # NOTE: required?
+        description=SENTINEL_BURST_DESCRIPTION,
+        extent=Extent(SpatialExtent(SENTINEL_BURST_BBOX), TemporalExtent([[SENTINEL_BURST_START, None]])),
+        title="ASF S1 BURST INTERFEROGRAMS",
+        stac_extensions=[
+            SarExtension.get_schema_uri(),
+            SatExtension.get_schema_uri(),
+            ProjectionExtension.get_schema_uri(),
+            RasterExtension.get_schema_uri(),
+            # Can use pystac.extensions once implemented
+            "https://stac-extensions.github.io/processing/v1.2.0/schema.json",
+            "https://stac-extensions.github.io/mgrs/v1.0.0/schema.json",
+        ],
+        keywords=["sentinel", "copernicus", "esa", "sar"],
+        providers=[pystac.Provider.from_dict(p) for p in [SENTINEL_PROVIDER, SENTINEL_BURST_PROVIDER]],
+        summaries=Summaries(summary_dict),
+    )
+
+    return collection
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Create STAC Items for many hyp3-isce2 product folders and add them to a Collection"
+    )
+    parser.add_argument("paths", nargs='*',
+                        help="Product folders, or prefixes to search (e.g. s3://fufiters/insar/012_023790_IW1). "
+                             "Without paths convert the single product in the current directory")
+    parser.add_argument("-d", "--dest", default="catalog", help="Output catalog directory")
+    parser.add_argument("-c", "--collection", default="fufiters", help="Collection ID")
+    parser.add_argument("-w", "--workers", default=8, type=int, help="Concurrent workers")
+    parser.add_argument("--processes", default=False, action="store_true", help="Use processes instead of threads")
+    parser.add_argument("-i", "--inventory", default=None, help="Also append Items to stac-geoparquet inventory (see fufiters.catalog)")
+    parser.add_argument("-b", "--browse", default=None, choices=['png', 'webp'],
+                        help="Add browse images and thumbnails (from COG overviews) next to each Item")
+    args = parser.parse_args(argv)
+
+    if not args.paths:
+        hyp32stac()
+        return
+
+    products = []
+    for path in args.paths:
+        name = os.path.basename(path.rstrip('/'))
+        if name.startswith('S1_'):
+            products.append((path, burst_id_from_path(path)))
+        else:
+            products.extend(find_products(path))
+    print(f'Found {len(products)} products')
+    failed = []
+    bulk(products, args.dest, args.collection, args.workers, args.processes, inventory=args.inventory,
+         browse_format=args.browse, failed=failed)
+    if failed:
+        print(f'Failed to create {len(failed)} Items:')
+        for product_dir, error in sorted(failed):
+            print(f'  {product_dir}: {error}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
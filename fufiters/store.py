@@ -0,0 +1,155 @@
+"""
+Inventory of completed products in the product store
+
+Products are uploaded to {root}/{kind}/{burstId}/{YYYYMMDD_YYYYMMDD}/{outdir}/ where kind is
+'insar' or 'offsets' and outdir is the static product ID, e.g.
+S1_023790_IW1_20230621_20230703_VV_INT80. A product counts as complete when all
+REQUIRED_SUFFIXES files exist. Listings are made through fsspec (s3://, local paths, memory://)
+with one recursive listing per burst, and cached locally for MAX_AGE. A stac-geoparquet
+catalog (see fufiters.catalog) can stand in for the store: its Items are read instead of
+listing objects, and every cataloged product counts as complete (like manifest entries).
+
+Example:
+    inventory = store.load_inventory('s3://fufiters', ['012_023790_IW1'], kind='insar')
+    todo = store.drop_existing(table, inventory, polarization='VV', looks='20x4')
+"""
+import hashlib
+import time
+
+import pandas as pd
+
+from fufiters.config import get_cache_dir
+
+# Files that must exist for a product to be considered complete
+REQUIRED_SUFFIXES = {
+    'insar': ['_unw_phase.tif', '_corr.tif', '_wrapped_phase.tif', '_conncomp.tif', '.txt'],
+    'offsets': ['_azi_off.tif', '_rng_off.tif', '.txt'],
+}
+# Range x azimuth looks to pixel spacing in product names (INT80)
+LOOKS_SPACING = {'20x4': 80, '10x2': 40, '5x1': 20}
+# Re-list the store if the cached listing is older than this (seconds)
+MAX_AGE = 3600
+COLUMNS = ['burstId', 'name', 'product', 'polarization', 'spacing', 'nfiles', 'complete']
+
+
+def _product_fields(product):
+    """(polarization, pixel spacing) from a product name like S1_023790_IW1_20230621_20230703_VV_INT80"""
+    fields = product.split('_')
+    polarization = fields[5] if len(fields) > 6 else None
+    spacing = int(fields[6][3:]) if len(fields) > 6 and fields[6][3:].isdigit() else None
+    return polarization, spacing
+
+
+def _parse_listing(paths, kind):
+    """Inventory table from file paths under {kind}/{burstId}/{name}/{product}/"""
+    files = {}
+    for path in paths:
+        parts = path.rstrip('/').split('/')
+        if len(parts) < 5 or parts[-5] != kind:
+            continue
+        burst_id, name, product, filename = parts[-4:]
+        files.setdefault((burst_id, name, product), set()).add(filename)
+
+    rows = []
+    for (burst_id, name, product), filenames in files.items():
+        polarization, spacing = _product_fields(product)
+        complete = all(f'{product}{suffix}' in filenames for suffix in REQUIRED_SUFFIXES[kind])
+        rows.append(dict(burstId=burst_id, name=name, product=product, polarization=polarization,
+                         spacing=spacing, nfiles=len(filenames), complete=complete))
+
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def list_burst(root, burst_id, kind='insar'):
+    """List products for one burst with a single recursive listing"""
+    import fsspec
+
+    fs, path = fsspec.core.url_to_fs(f'{root.rstrip("/")}/{kind}/{burst_id}')
+    if not fs.exists(path):
+        return pd.DataFrame(columns=COLUMNS)
+    return _parse_listing(fs.find(path), kind)
+
+
+def _cache_path(root, burst_id, kind):
+    key = hashlib.sha1(root.rstrip('/').encode()).hexdigest()[:12]
+    return get_cache_dir('store') / f'{key}_{kind}_{burst_id}.parquet'
+
+
+def list_products(root, burst_ids, kind='insar', max_age=MAX_AGE):
+    """Inventory of products for several bursts, using cached listings newer than max_age"""
+    tables = []
+    for burst_id in burst_ids:
+        path = _cache_path(root, burst_id, kind)
+        if path.exists() and time.time() - path.stat().st_mtime < max_age:
+            table = pd.read_parquet(path)
+        else:
+            print(f'Listing {root}/{kind}/{burst_id}...')
+            table = list_burst(root, burst_id, kind)
+            table.to_parquet(path)
+        tables.append(table)
+
+    return pd.concat(tables, ignore_index=True) if tables else pd.DataFrame(columns=COLUMNS)
+
+
+def is_catalog(source):
+    """True if source is a hive-partitioned stac-geoparquet catalog (burstId=.../ directories)"""
+    import fsspec
+
+    fs, path = fsspec.core.url_to_fs(source)
+    return fs.isdir(path) and len(fs.glob(f'{path.rstrip("/")}/burstId=*')) > 0
+
+
+def catalog_inventory(path, burst_ids=None, kind='insar'):
+    """Inventory from the Items of a stac-geoparquet catalog, pair names come from Item IDs"""
+    import json
+    from fufiters import catalog
+
+    gf = catalog.query(path, columns=['burstId', 'assets'], burst=burst_ids, product=kind)
+    rows = []
+    for row in gf.itertuples():
+        # S1_023790_IW1_20230621_20230703_VV_INT80
+        fields = row.id.split('_')
+        polarization, spacing = _product_fields(row.id)
+        rows.append(dict(burstId=row.burstId, name=f'{fields[3]}_{fields[4]}', product=row.id,
+                         polarization=polarization, spacing=spacing, nfiles=len(json.loads(row.assets)),
+                         complete=True))
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def load_inventory(source, burst_ids=None, kind='insar', max_age=MAX_AGE):
+    """Inventory from a store root (s3://bucket, local path), stac-geoparquet catalog or parquet/CSV manifest"""
+    if source.endswith('.parquet'):
+        inventory = pd.read_parquet(source)
+    elif source.endswith('.csv'):
+        inventory = pd.read_csv(source)
+    elif is_catalog(source):
+        return catalog_inventory(source, None if burst_ids is None else list(burst_ids), kind)
+    else:
+        return list_products(source, burst_ids, kind, max_age)
+
+    if burst_ids is not None:
+        inventory = inventory[inventory.burstId.isin(burst_ids)]
+    if 'complete' not in inventory:
+        inventory = inventory.assign(complete=True)
+    return inventory.reset_index(drop=True)
+
+
+def drop_existing(table, inventory, polarization=None, looks=None, force=None):
+    """Remove pairs with complete products from a pair table
+
+    force is a list of pair names (20230621_20230703) or burstId/name to re-process anyway.
+    Incomplete products (e.g. from cancelled runs) are kept so they are processed again.
+    """
+    done = inventory[inventory.complete.astype(bool)]
+    if polarization is not None and 'polarization' in done:
+        done = done[done.polarization == polarization]
+    if looks is not None and 'spacing' in done:
+        done = done[done.spacing == LOOKS_SPACING[looks]]
+
+    keys = table.burstId + '/' + table['name']
+    existing = keys.isin(set(done.burstId + '/' + done['name']))
+    if force:
+        existing &= ~(table['name'].isin(force) | keys.isin(force))
+
+    print(f'Skipping {existing.sum()} of {len(table)} pairs with complete products')
+    return table[~existing].reset_index(drop=True)
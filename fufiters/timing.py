@@ -0,0 +1,169 @@
+"""
+Per-step ISCE2 processing times from isce.log, and a cross-run timing table
+
+isce.log lines start with a timestamp followed by the logger name and message, e.g.
+'2024-02-14 18:44:20,396 - isce.topsinsar.runTopo - INFO - ...'. Each line is assigned
+to a processing step by its topsApp logger (isce.topsinsar.runX), lines of other loggers
+by keyword, and a step lasts until the first line of the next step.
+
+Example:
+    python -m fufiters.timing catalog/collection.json -o timings.parquet
+"""
+import argparse
+import re
+
+LINE_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})(.*)')
+COMPONENT_PATTERN = re.compile(r'\bisce\.topsinsar\.(\w+)')
+# topsApp step loggers (isce.topsinsar.runX, matched by prefix) and the step they belong to
+COMPONENTS = [
+    ('runDenseOffsets', 'denseOffsets'), ('runOffsetFilter', 'denseOffsets'),
+    ('runOffsetGeocode', 'denseOffsets'), ('runCropOffsetGeo', 'denseOffsets'),
+    ('runPrepESD', 'ESD'), ('runESD', 'ESD'),
+    ('runSubsetOverlaps', 'coregistration'), ('runCoarseOffsets', 'coregistration'),
+    ('runCoarseResamp', 'coregistration'), ('runOverlapIfg', 'coregistration'),
+    ('runRangeCoreg', 'coregistration'), ('runFineOffsets', 'coregistration'),
+    ('runFineResamp', 'coregistration'), ('runGeo2rdr', 'coregistration'),
+    ('runTopo', 'topo'),
+    ('runFilter', 'filter'),
+    ('runUnwrap', 'unwrap'),
+    ('runGeocode', 'geocode'),
+]
+# Fallback for lines of other loggers: keywords matched against logger name and message (first match wins)
+STEPS = [
+    ('denseOffsets', re.compile(r'\bdense ?offsets?\b', re.I)),
+    ('ESD', re.compile(r'\besd\b|\bspectral diversity\b', re.I)),
+    ('coregistration', re.compile(r'\b(coarse|fine)_?(offsets|resamp)\b|\bresampl\w*|\boverlaps?\b|\bgeo2rdr\b', re.I)),
+    ('topo', re.compile(r'\btopo(zero)?\b', re.I)),
+    ('filter', re.compile(r'\bfilter(ing)?\b', re.I)),
+    ('unwrap', re.compile(r'\bunwrap\w*|\bsnaphu\b|\bicu\b', re.I)),
+    ('geocode', re.compile(r'\bgeocod\w*', re.I)),
+]
+STEP_NAMES = [name for name, _ in STEPS]
+# Product names use pixel spacing (INT80) rather than looks
+SPACING_LOOKS = {80: '20x4', 40: '10x2', 20: '5x1'}
+
+
+def _step(text):
+    match = COMPONENT_PATTERN.search(text)
+    if match:
+        component = match.group(1)
+        # Other topsApp steps (preprocessing, burst interferograms, merging) are 'other'
+        return next((step for prefix, step in COMPONENTS if component.startswith(prefix)), 'other')
+    for name, pattern in STEPS:
+        if pattern.search(text):
+            return name
+    return None
+
+
+def parse_isce_log(lines):
+    """Processing start time, total and per-step durations (seconds) from isce.log lines"""
+    import pandas as pd
+
+    times, steps = [], []
+    for line in lines:
+        match = LINE_PATTERN.match(line)
+        if match:
+            times.append(match.group(1))
+            steps.append(_step(match.group(2)))
+    if not times:
+        return None
+
+    df = pd.DataFrame(dict(time=pd.to_datetime(times), step=steps))
+    # Lines without a step keyword belong to the step before them
+    df['step'] = df.step.ffill().fillna('other')
+    df['duration'] = df.time.diff().shift(-1).dt.total_seconds().fillna(0)
+    durations = df.groupby('step').duration.sum()
+
+    return {
+        'start': df.time.iloc[0].isoformat() + 'Z',
+        'duration': (df.time.iloc[-1] - df.time.iloc[0]).total_seconds(),
+        'steps': {name: float(durations.get(name, 0.0)) for name in STEP_NAMES + ['other']},
+    }
+
+
+def read_isce_log(path):
+    """Stream and parse a local or remote isce.log"""
+    import fsspec
+
+    with fsspec.open(path, 'r', errors='replace') as f:
+        return parse_isce_log(f)
+
+
+def processing_properties(timing):
+    """STAC properties from parse_isce_log output
+
+    processing:datetime is defined by the processing extension (v1.2.0), which has no fields
+    for runtimes, so total and per-step seconds are fufiters:duration and fufiters:steps.
+    """
+    return {
+        'processing:datetime': timing['start'],
+        'fufiters:duration': timing['duration'],
+        'fufiters:steps': timing['steps'],
+    }
+
+
+def timings_table(items):
+    """One row per product with step durations, looks, polarization, burst and offsets on/off"""
+    import pandas as pd
+
+    rows = []
+    for item in items:
+        item = item if isinstance(item, dict) else item.to_dict()
+        props = item['properties']
+        # Items created before timings were namespaced have processing:steps/duration
+        steps = props.get('fufiters:steps', props.get('processing:steps'))
+        if steps is None:
+            continue
+        # S1_023790_IW1_20230621_20230703_VV_INT80
+        fields = item['id'].split('_')
+        spacing = int(fields[6][3:]) if len(fields) > 6 and fields[6][3:].isdigit() else None
+        rows.append(dict(
+            id=item['id'],
+            burstId=props.get('burstId'),
+            looks=SPACING_LOOKS.get(spacing),
+            polarization=fields[5] if len(fields) > 5 else None,
+            offsets=steps.get('denseOffsets', 0) > 0,
+            processing_datetime=props['processing:datetime'],
+            total=props.get('fufiters:duration', props.get('processing:duration')),
+            **steps,
+        ))
+    return pd.DataFrame(rows)
+
+
+def summarize(table, by=('looks', 'polarization', 'offsets')):
+    """Median minutes per step for each group, with number of products"""
+    columns = [c for c in STEP_NAMES + ['other', 'total'] if c in table]
+    summary = (table.groupby(list(by))[columns].median() / 60).round(1)
+    summary.insert(0, 'products', table.groupby(list(by)).size())
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate ISCE2 step timings from STAC Items")
+    parser.add_argument("source", help="collection.json, Item JSON, or stac-geoparquet inventory directory")
+    parser.add_argument("-b", "--by", nargs='+', default=['looks', 'polarization', 'offsets'],
+                        help="Group by columns (looks, polarization, offsets, burstId)")
+    parser.add_argument("-o", "--output", default=None, help="Save per-product timings (.parquet or .csv)")
+    args = parser.parse_args(argv)
+
+    if args.source.endswith('.json'):
+        import pystac
+        obj = pystac.read_file(args.source)
+        items = obj.get_items() if isinstance(obj, pystac.Catalog) else [obj]
+    else:
+        from fufiters import catalog
+        items = catalog.to_items(catalog.query(args.source))
+
+    table = timings_table(items)
+    print(f'{len(table)} products with timings')
+    if len(table):
+        print(summarize(table, args.by).to_string())
+    if args.output:
+        if args.output.endswith('.csv'):
+            table.to_csv(args.output, index=False)
+        else:
+            table.to_parquet(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,106 +5,67 @@ This script is intended to be run as part of a GitHub Actions workflow, but you
 run it locally setting inputs as environment variables:
 
 GITHUB_OUTPUT=github_outputs.txt Polarization=VV BurstId=156_334153_IW1 NPairs=1 Year=2024 python getBurstPairs.py
+
+BurstId can be a comma-separated list of bursts, or set AOI to a polygon file (e.g. AOI=nepal.geojson)
+to plan every burst in it. Bursts on the same relative orbit share a single ASF search, and matrix
+entries then include a burstId.
+
+Set Inventory to the product store (e.g. s3://fufiters, or a parquet/CSV manifest) to skip pairs
+with complete products, and Force to a comma-separated list of pair names to re-process anyway.
+
+PREFETCH_MANIFEST lists the unique DEM tiles and precise orbit windows needed by all pairs.
+
+Set Forward=1 to only plan pairs completed by acquisitions after each burst's watermark (Year is
+not needed), then advance the watermarks kept in Watermarks (a JSON file or URL, default in the
+fufiters cache). Bursts without a watermark start at Since, or at their newest acquisition.
+Set PendingWatermarks to a local file to write the advanced watermarks there instead, and save
+them once the pairs are processed with `python -m fufiters.forward $Watermarks --update $PendingWatermarks`.
+
+The same planning is available as `fufiters plan-pairs`.
+
+Set PairsPerJob to also output packed jobs that share acquisitions (PACKED_MATRIX_0, PACKED_MATRIX_1, ...
+with at most 256 jobs each, and NUM_PACKED_MATRICES). MaxJobs caps the number of packed jobs (e.g. 256 for
+a single matrix, see insar_packed.yml), packing more pairs into each job if needed.
 '''
-import asf_search as asf
-import fsspec
-import geopandas as gpd
-import json
 import os
 
+from fufiters import actions
+
 # Parse Workflow inputs from environment variables
 POL = os.environ['Polarization']
-FULLBURSTID = os.environ['BurstId']
+FULLBURSTIDS = [x.strip() for x in os.environ.get('BurstId', '').split(',') if x.strip()]
+FORCE = [x.strip() for x in os.environ.get('Force', '').split(',') if x.strip()]
+FORWARD = os.environ.get('Forward', '0').lower() in ('1', 'true')
 
 # If we're doing offset pairs DT is set in workflow (could also read GitHub context vars)
 try:
     DT = int(os.environ['Offsets_DT'])
-    START = "2017-01-01"
-    END = None
+    START_YEAR = NPAIRS = None
 except:
     NPAIRS = int(os.environ['NPairs'])
-    START_YEAR = int(os.environ['Year'])
-    START = f"{START_YEAR}-01-01",
-    END = f"{START_YEAR+1}-03-01"
+    START_YEAR = int(os.environ['Year']) if not FORWARD else None
     DT = None
 
-RELORB,BURSTID,SUBSWATH = FULLBURSTID.split('_')
-print(RELORB,BURSTID,SUBSWATH)
-
-# Get centroid of burst from database 
-url = 'https://github.com/relativeorbit/s1burstids/raw/main/burst_map_IW_000001_375887_brotli.parquet'
-with fsspec.open(url) as file:
-    gfb = gpd.read_parquet(file,
-                            filters=[('burst_id', '=', int(BURSTID)),
-                                    ('subswath_name', '=', SUBSWATH)]
-                            )
-print(gfb)
+if FORWARD:
+    from fufiters import forward
 
-# Search for SLCs
-results = asf.search(platform=[asf.PLATFORM.SENTINEL1], 
-                    processingLevel=asf.PRODUCT_TYPE.SLC, 
-                    beamMode=asf.BEAMMODE.IW,
-                    intersectsWith=gfb.iloc[0].geometry.centroid.wkt,
-                    relativeOrbit=int(RELORB),
-                    start=START,
-                    end=END, #march to ensure we get some overlapping coverage for each year
-                    )
-gf = gpd.GeoDataFrame.from_features(results.geojson(), crs=4326)
-print('Results:', len(gf))
-
-# For case of frame overlap, ensure SLCs contain full burst
-def get_overlap_area(gf, gfREF):
-    frame_area = gfREF.iloc[0].geometry.area
-    overlaps = gf.geometry.map(lambda x: x.intersection(gfREF.geometry.iloc[0]).area/frame_area)
-
-    return overlaps
-
-gf['overlap'] = get_overlap_area(gf, gfb)
-gf = gf.query('overlap >= 0.80').reset_index(drop=True)
-
-# Sort chronological ascending
-gf['datetime'] = gpd.pd.to_datetime(gf.startTime)
-gf = gf.sort_values(by='datetime', ignore_index=True)
-
-print('Number of Acquisitions: ', len(gf))
-burstIDs = gf.sceneName.to_list()
-print('\n'.join(burstIDs))
-
-pairs = []
-if DT:
-    # OFFSET PAIRS
-    gf.set_index('datetime', inplace=True, drop=False)
-    for index,row in gf.iterrows():
-        dt = gf.index[-1] - index
-        if dt < gpd.pd.Timedelta(days=365*DT):
-            print(f'{refname} within {DT} years of last acquisition')
-            break
-        else:
-            refname = row.sceneName
-            ts = index + gpd.pd.DateOffset(years=DT)
-            idx = gf.index.get_indexer([ts], method='nearest')[0]
-            sec = gf.iloc[idx]
-            secname = sec.sceneName
-            shortname = f'{refname[17:25]}_{secname[17:25]}'
-            pairs.append({'reference': refname, 'secondary': secname, 'name':shortname})
+    outputs, state = actions.forward_pairs(burst_ids=FULLBURSTIDS, aoi=os.environ.get('AOI') or None, polarization=POL,
+                                           npairs=NPAIRS, offsets_dt=DT, looks=os.environ.get('Looks'),
+                                           inventory=os.environ.get('Inventory'), force=FORCE,
+                                           pairs_per_job=os.environ.get('PairsPerJob'),
+                                           watermarks=os.environ.get('Watermarks') or None,
+                                           since=os.environ.get('Since') or None,
+                                           max_jobs=os.environ.get('MaxJobs') or None)
+    actions.write_outputs(outputs, os.environ['GITHUB_OUTPUT'])
+    if os.environ.get('PendingWatermarks'):
+        # Saved by a later job once the pairs are processed (python -m fufiters.forward --update)
+        forward.save(state, os.environ['PendingWatermarks'])
+    else:
+        forward.save(state, os.environ.get('Watermarks') or None)
 else:
-    # InSAR Pairs
-    idx_end_of_year = gf.index[gf.datetime.dt.year == START_YEAR][-1]
-    for r in range(idx_end_of_year + 1):
-        for s in range(1, NPAIRS + 1 ):
-            try:
-                ref = burstIDs[r]
-                sec = burstIDs[r+s]
-                shortname = f'{ref[17:25]}_{sec[17:25]}'
-                pairs.append({'reference': ref, 'secondary': sec, 'name':shortname})
-            except IndexError as e:
-                print(f'ASF Search did not return a n+{s} pair for {ref}')
-
-# Save JSON for GitHub Actions Matrix Job
-matrixJSON = f'{{"include":{json.dumps(pairs)}}}'
-print(f'Number of Interferograms: {len(pairs)}')
-print(matrixJSON)
-
-with open(os.environ['GITHUB_OUTPUT'], 'a') as f:
-    print(f'BURST_IDS={burstIDs}', file=f)
-    print(f'MATRIX_PARAMS_COMBINATIONS={matrixJSON}', file=f)
+    outputs = actions.plan_pairs(burst_ids=FULLBURSTIDS, aoi=os.environ.get('AOI'), polarization=POL,
+                                 year=START_YEAR, npairs=NPAIRS, offsets_dt=DT,
+                                 looks=os.environ.get('Looks'), inventory=os.environ.get('Inventory'),
+                                 force=FORCE, pairs_per_job=os.environ.get('PairsPerJob'),
+                                 max_jobs=os.environ.get('MaxJobs') or None)
+    actions.write_outputs(outputs, os.environ['GITHUB_OUTPUT'])
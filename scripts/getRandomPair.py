@@ -3,49 +3,13 @@ This script is intended to be run as part of a GitHub Actions workflow, but you
 run it locally setting inputs as environment variables:
 
 GITHUB_OUTPUT=github_outputs.txt python getRandomPair.py
+
+The same pair selection is available as `fufiters random-pair`.
 '''
-import asf_search as asf
-import geopandas as gpd
 import os
 
-print(os.getcwd())
-
-
-gfa = gpd.read_file('nepal.geojson')
-# gfa = gfa.simplify(0.1).reverse() # 58045 -> 48 coords, & CCW for NASA CMR
-# search_wkt = gfa.geometry.values[0].wkt
-
-# Searching by intersectsWith=POLYGON appears much slower than intersectsWith=POIINT
-# So get a point in the polygon with ~1m precision to search with
-search_wkt = gfa.sample_points(1).set_precision(0.00001).geometry.values[0].wkt
-
-asf.constants.INTERNAL.CMR_TIMEOUT = 120
-results = asf.search(platform=[asf.PLATFORM.SENTINEL1],
-                    processingLevel=asf.PRODUCT_TYPE.BURST,
-                    intersectsWith=search_wkt,
-                    start="2 months ago",
-                    )
-
-gf = gpd.GeoDataFrame.from_features(results.geojson(), crs=4326)
-gf['fullBurstID'] = gf.burst.str['fullBurstID']
-random_burst = gf.fullBurstID.sample(1).values[0]
-
-# Get burst stack
-results = asf.search(platform=[asf.PLATFORM.SENTINEL1],
-                    processingLevel=asf.PRODUCT_TYPE.BURST,
-                    fullBurstID=random_burst
-                    )
-
-acquisitions = gpd.GeoDataFrame.from_features(results.geojson(), crs=4326)
-random_pol = acquisitions.polarization.sample(1).values[0]
-pair = acquisitions[acquisitions.polarization == random_pol].sample(2)
-
-# Original SLC names
-reference, secondary = pair.additionalUrls.apply(lambda x: x[0].split('/')[3])
+from fufiters import actions
 
 # Save Environment Variables for Next Job
-with open(os.environ['GITHUB_OUTPUT'], 'a') as f:
-    print(f'REFERENCE={reference}', file=f)
-    print(f'SECONDARY={secondary}', file=f)
-    print(f'BURSTID={random_burst}', file=f)
-    print(f'POLARIZATION={random_pol}', file=f)
+outputs = actions.random_pair('nepal.geojson', stratify='track')
+actions.write_outputs(outputs, os.environ['GITHUB_OUTPUT'])
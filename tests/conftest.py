@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    """Every test gets an empty fufiters cache"""
+    monkeypatch.setenv('FUFITERS_CACHE', str(tmp_path / 'cache'))
+    monkeypatch.delenv('FUFITERS_OFFLINE', raising=False)
+    return tmp_path / 'cache'
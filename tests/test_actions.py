@@ -0,0 +1,45 @@
+import geopandas as gpd
+import pandas as pd
+import pytest
+
+from fufiters import actions, aoi, searchcache
+
+
+def stack(times, polarization='VV'):
+    slc = 'S1A_IW_SLC__1SDV_{:%Y%m%dT%H%M%S}_{:%Y%m%dT%H%M%S}_000000_000000_0000'
+    return pd.DataFrame(dict(
+        startTime=[t.isoformat() for t in times],
+        polarization=polarization,
+        additionalUrls=[[f'https://sentinel1-burst.asf.alaska.edu/{slc.format(t, t)}/IW1/{polarization}/1.tiff']
+                        for t in times],
+    ))
+
+
+@pytest.fixture
+def bursts(monkeypatch):
+    """Three bursts: no acquisitions, one recent acquisition, a full recent stack"""
+    now = pd.Timestamp.now(tz='UTC').floor('s')
+    stacks = {
+        '001_000001_IW1': stack([]),
+        '001_000002_IW1': stack([now - pd.Timedelta(days=400), now - pd.Timedelta(days=5)]),
+        '001_000003_IW1': stack([now - pd.Timedelta(days=12 * i) for i in range(5)]),
+    }
+    gf = gpd.GeoDataFrame(dict(burstID=list(stacks), relative_orbit_number=1, subswath_name='IW1'),
+                          geometry=gpd.points_from_xy([0, 0, 0], [0, 0, 0]), crs=4326)
+    monkeypatch.setattr(aoi, 'coverage', lambda path: gf)
+    monkeypatch.setattr(searchcache, 'search', lambda fullBurstID, **query: stacks[fullBurstID])
+    return stacks
+
+
+def test_random_pair_retries_bursts(bursts):
+    for seed in range(5):
+        outputs = actions.random_pair('aoi.geojson', stratify=None, seed=seed)
+        assert outputs['BURSTID'] == '001_000003_IW1'
+        assert outputs['POLARIZATION'] == 'VV'
+        assert outputs['REFERENCE'] != outputs['SECONDARY']
+
+
+def test_random_pair_no_eligible_burst(bursts):
+    bursts['001_000003_IW1'] = stack([])
+    with pytest.raises(RuntimeError, match='No burst'):
+        actions.random_pair('aoi.geojson', stratify=None)
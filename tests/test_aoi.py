@@ -0,0 +1,45 @@
+import json
+import os
+import sys
+
+import pytest
+import shapely
+
+from fufiters import aoi, burstdb
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+import synthetic  # noqa: E402
+
+
+@pytest.fixture
+def burst_map(cache):
+    """Synthetic burst map in the local cache"""
+    os.makedirs(cache / 'burstdb')
+    gf = synthetic.burst_map()
+    gf.to_parquet(cache / 'burstdb' / burstdb.BURST_MAP_FILE)
+    burstdb.load.cache_clear()
+    yield burstdb.add_burst_names(gf)
+    burstdb.load.cache_clear()
+
+
+def test_coverage_small_geojson(burst_map, tmp_path, monkeypatch):
+    # Detailed polygon around the synthetic point, crossing tile edges
+    lon, lat = synthetic.POINT
+    geom = shapely.Point(lon, lat).buffer(0.7, quad_segs=64)
+    path = str(tmp_path / 'aoi.geojson')
+    with open(path, 'w') as f:
+        json.dump(dict(type='FeatureCollection', features=[
+            dict(type='Feature', properties={}, geometry=shapely.geometry.mapping(geom))]), f)
+
+    gf = aoi.coverage(path)
+    expected = burst_map[burst_map.intersects(geom)]
+    assert sorted(gf.burstID) == sorted(expected.burstID)
+    assert list(gf.columns) == aoi.COLUMNS
+    assert set(gf.relative_orbit_number) == {12, 121}
+
+    # Second run reads the cached result
+    monkeypatch.setattr(aoi, 'compute_coverage', lambda *args: pytest.fail('not cached'))
+    assert aoi.coverage(path).equals(gf)
+
+    picks = aoi.sample(gf, n=2, stratify='track', seed=0)
+    assert len(picks) == 2 and set(picks.burstID) <= set(gf.burstID)
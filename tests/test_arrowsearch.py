@@ -0,0 +1,122 @@
+import json
+import os
+import threading
+
+import pytest
+import requests
+
+from fufiters import arrowsearch
+
+DATA = os.path.join(os.path.dirname(__file__), 'data')
+
+
+@pytest.fixture
+def cmr(monkeypatch):
+    """Answer every CMR request with the recorded page, returns the request log"""
+    import asf_search as asf
+
+    with open(os.path.join(DATA, 'cmr_slc_page.json')) as f:
+        recording = json.load(f)
+    requests_made = []
+
+    def post(session, url, data=None, **kwargs):
+        requests_made.append((url, data))
+        response = requests.Response()
+        response.status_code = recording['status']
+        response.headers.update(recording['headers'])
+        response._content = recording['body'].encode()
+        response.url = url
+        return response
+
+    monkeypatch.setattr(asf.ASFSession, 'post', post)
+    return requests_made
+
+
+QUERY = dict(platform=['SENTINEL-1A'], processingLevel='SLC', beamMode='IW',
+             intersectsWith='POINT(86.9 27.9)', relativeOrbit=12)
+
+
+def test_search_replays_page(cmr):
+    gf = arrowsearch.search(start='2023-06-01', end='2023-07-31', **QUERY)
+    assert len(cmr) == 1
+    assert list(gf.columns) == [field.name for field in arrowsearch.SCHEMA]
+    assert gf.sceneName.tolist() == ['S1A_IW_SLC__1SDV_20230703T001104_20230703T001131_049244_05EBD3_F1E8',
+                                     'S1A_IW_SLC__1SDV_20230621T001103_20230621T001130_049069_05E67E_8F8A']
+    assert gf.pathNumber.tolist() == [12, 12]
+    assert str(gf.startTime.dtype) == 'datetime64[us, UTC]'
+    assert gf.crs.to_epsg() == 4326
+    assert gf.geometry.is_valid.all()
+
+
+def test_search_windows_deduplicated(cmr):
+    # Every window gets the same page, each product is kept once
+    gf = arrowsearch.search(start='2021-01-01', end='2023-07-31', **QUERY)
+    assert len(cmr) == 3
+    assert len(gf) == 2
+
+
+def test_search_to_parquet(cmr, tmp_path):
+    path = tmp_path / 'stack'
+    assert arrowsearch.search_to_parquet(path, start='2023-06-01', end='2023-07-31', **QUERY) == 2
+    assert arrowsearch.search_to_parquet(path, start='2023-06-01', end='2023-07-31', **QUERY) == 2
+    assert len(list(path.glob('part-*.parquet'))) == 2
+
+    gf = arrowsearch.read_parquet(path, columns=['sceneName'], start='2023-07-01')
+    assert gf.sceneName.tolist() == ['S1A_IW_SLC__1SDV_20230703T001104_20230703T001131_049244_05EBD3_F1E8']
+
+    import pyarrow.parquet as pq
+    geo = json.loads(pq.read_schema(next(path.glob('part-*.parquet'))).metadata[b'geo'])
+    # No crs means OGC:CRS84
+    assert 'crs' not in geo['columns']['geometry']
+
+
+@pytest.fixture
+def endless(monkeypatch):
+    """search_generator yielding the recorded page until stopped, failing for the window from 2016-01-01"""
+    import asf_search as asf
+    from asf_search.search.search_generator import as_ASFProduct
+
+    with open(os.path.join(DATA, 'cmr_slc_page.json')) as f:
+        items = json.loads(json.load(f)['body'])['items']
+    pages = []
+
+    def search_generator(opts=None, start=None, **query):
+        if start.startswith('2016-01-01'):
+            raise ConnectionError('CMR unavailable')
+        while len(pages) < 10000:
+            pages.append(start)
+            yield asf.ASFSearchResults([as_ASFProduct(item, opts.session) for item in items])
+
+    monkeypatch.setattr(asf, 'search_generator', search_generator)
+    return pages
+
+
+def run_with_timeout(fn, timeout=10):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=fn()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), 'iter_pages did not return'
+    return result.get('value')
+
+
+def test_close_after_first_page(endless):
+    def first_page():
+        pages = arrowsearch.iter_pages(start='2017-01-01', end='2022-12-31', **QUERY)
+        table = next(pages)
+        pages.close()
+        return table
+
+    assert run_with_timeout(first_page).num_rows == 2
+    assert len(endless) < 10000
+
+
+def test_worker_error_raised_immediately(endless):
+    def consume():
+        with pytest.raises(ConnectionError):
+            for _ in arrowsearch.iter_pages(start='2015-01-01', end='2022-12-31', **QUERY):
+                pass
+        return True
+
+    assert run_with_timeout(consume)
+    assert len(endless) < 10000
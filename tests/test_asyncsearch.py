@@ -0,0 +1,41 @@
+import os
+import sys
+
+import asf_search as asf
+import pytest
+
+from fufiters import asyncsearch, burstdb
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+import stand_in  # noqa: E402
+import synthetic  # noqa: E402
+
+BURSTS = ['012_023790_IW1', '121_259876_IW1']
+
+
+@pytest.fixture
+def cmr():
+    """Synthetic CMR behind the stand-in for requests and aiohttp"""
+    with stand_in.StandIn(respond=synthetic.cmr_response) as server, stand_in.redirect(server.url):
+        yield server
+
+
+def test_inventory_matches_asf_search(cmr, monkeypatch):
+    monkeypatch.setattr(asf, 'REPORT_ERRORS', False)
+    # 8 years is more than one 250 item page
+    stacks, stats = asyncsearch.inventory(BURSTS + ['012_999999_IW1'], '2017-01-01', '2025-03-01')
+    assert set(stacks) == set(BURSTS)
+    assert stats.loc['012_999999_IW1', 'error'].startswith('No burst metadata')
+
+    gfb = burstdb.add_burst_names(synthetic.burst_map()).set_index('burstID', drop=False)
+    for burst_id in BURSTS:
+        burst = synthetic.burst_item(gfb.loc[burst_id])
+        attributes = {a['Name']: a['Values'][0] for a in burst['umm']['AdditionalAttributes']}
+        results = asf.search(platform=[asf.PLATFORM.SENTINEL1], processingLevel='SLC', beamMode=asf.BEAMMODE.IW,
+                             relativeOrbit=int(attributes['PATH_NUMBER']),
+                             intersectsWith=f"POINT({attributes['CENTER_LON']} {attributes['CENTER_LAT']})",
+                             start='2017-01-01', end='2025-03-01')
+        assert len(results) > 250
+        assert set(stacks[burst_id].sceneName) == {r.properties['sceneName'] for r in results}
+        assert stats.loc[burst_id, 'count'] == len(results)
+        assert stats.loc[burst_id, 'revisit_min'] == 6
@@ -0,0 +1,71 @@
+import glob
+import os
+import sys
+
+import pytest
+import rasterio
+
+from fufiters import browse, stac
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+import synthetic  # noqa: E402
+
+BURST = '012_023790_IW1'
+MAGIC = {'png': b'\x89PNG', 'webp': b'RIFF'}
+
+
+@pytest.fixture
+def product(tmp_path):
+    """Synthetic product with the top 64 rows of every COG set to nodata"""
+    folder = synthetic.make_product(str(tmp_path / 'S1_023790_IW1_20230621_20230703_VV_INT80'), BURST,
+                                    '20230621T121402', '20230703T121403', size=256)
+    for path in glob.glob(f'{folder}/*.tif'):
+        with rasterio.open(path) as src:
+            data, profile = src.read(), src.profile
+        data[:, :64] = 0
+        with rasterio.open(path, 'w', **dict(profile, driver='COG', blocksize=256)) as dst:
+            dst.write(data)
+    return folder
+
+
+def image_info(path):
+    """(file signature, driver, bands, dtype, shape, transparent fraction)"""
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+    with rasterio.open(path) as src:
+        alpha = src.read(4)
+        return magic, src.driver, src.count, src.dtypes[0], alpha.shape, (alpha == 0).mean()
+
+
+@pytest.mark.parametrize('fmt', ['png', 'webp'])
+def test_browse_size_and_format(product, tmp_path, fmt):
+    name = os.path.basename(product)
+    href = f'{product}/{name}_unw_phase.tif'
+    driver = browse.FORMATS[fmt][0]
+    # Decimated read from a 256 pixel COG
+    paths = browse.make_browse('unwrapped', href, str(tmp_path), fmt, browse_size=100, thumbnail_size=32)
+    assert paths == dict(browse=f'{tmp_path}/{name}_unw_phase_browse.{fmt}',
+                         thumbnail=f'{tmp_path}/{name}_unw_phase_thumb.{fmt}')
+    assert image_info(paths['browse']) == (MAGIC[fmt], driver, 4, 'uint8', (100, 100), 0.25)
+    assert image_info(paths['thumbnail']) == (MAGIC[fmt], driver, 4, 'uint8', (25, 25), 0.28)
+
+    # Smaller than the browse size: full resolution, written next to the COGs
+    hrefs = {'unwrapped': href, 'corr': f'{product}/{name}_corr.tif', 'wrapped': f'{product}/missing.tif',
+             'dem': f'{product}/{name}_dem.tif'}
+    images = browse.make_browse_many(hrefs, fmt=fmt)
+    assert set(images) == {'unwrapped', 'corr'}
+    for paths in images.values():
+        assert os.path.dirname(paths['browse']) == product
+        assert image_info(paths['browse']) == (MAGIC[fmt], driver, 4, 'uint8', (256, 256), 0.25)
+        assert image_info(paths['thumbnail']) == (MAGIC[fmt], driver, 4, 'uint8', (256, 256), 0.25)
+
+
+def test_item_browse_assets(product, tmp_path):
+    dest = str(tmp_path / 'item')
+    os.makedirs(dest)
+    item = stac.create_item(product, BURST, browse_format='webp', browse_dest=dest)
+    for name in ['unwrapped', 'wrapped', 'corr', 'azimuth_offsets', 'range_offsets']:
+        for kind, role in [('browse', 'overview'), ('thumbnail', 'thumbnail')]:
+            asset = item.assets[f'{name}_{kind}']
+            assert asset.media_type == 'image/webp' and asset.roles == [role]
+            assert os.path.exists(os.path.join(dest, asset.href))
@@ -0,0 +1,53 @@
+import pytest
+
+from fufiters import catalog
+
+
+def item(reference, secondary, burst='012_023790_IW1', kind='insar', baseline=10.0):
+    name = f'S1_{burst[4:]}_{reference}_{secondary}_VV_INT80'
+    return dict(
+        type='Feature', stac_version='1.0.0', id=name, collection='fufiters',
+        geometry={'type': 'Polygon', 'coordinates': [[[86.9, 27.8], [87.0, 27.8], [87.0, 27.9], [86.9, 27.9], [86.9, 27.8]]]},
+        bbox=[86.9, 27.8, 87.0, 27.9],
+        properties=dict(datetime=None, burstId=burst, perpendicularBaseline=baseline, passDirection='ASCENDING',
+                        start_datetime=f'{reference[:4]}-{reference[4:6]}-{reference[6:]}T00:00:00Z',
+                        end_datetime=f'{secondary[:4]}-{secondary[4:6]}-{secondary[6:]}T00:00:00Z'),
+        assets={'unwrapped': {'href': f's3://fufiters/{kind}/{burst}/{name}/{name}_unw_phase.tif'}},
+        links=[],
+    )
+
+
+@pytest.fixture
+def inventory(tmp_path):
+    items = [item('20181226', '20190107'),
+             item('20190301', '20190313'),
+             item('20200105', '20200117'),
+             item('20170105', '20190110', kind='offsets')]
+    catalog.write(str(tmp_path / 'inventory'), items)
+    return str(tmp_path / 'inventory')
+
+
+def test_query_pairs_overlapping_window(inventory):
+    gf = catalog.query(inventory, start='2019-01-01', end='2019-12-31')
+    assert sorted(gf.id) == ['S1_023790_IW1_20170105_20190110_VV_INT80',
+                             'S1_023790_IW1_20181226_20190107_VV_INT80',
+                             'S1_023790_IW1_20190301_20190313_VV_INT80']
+
+
+def test_query_filters(inventory):
+    assert len(catalog.query(inventory, product='offsets')) == 1
+    assert len(catalog.query(inventory, dt_days=12, end='2019-12-31')) == 2
+    assert len(catalog.query(inventory, bbox=(80, 20, 81, 21))) == 0
+    assert len(catalog.query(inventory, burst='001_000001_IW1')) == 0
+
+
+def test_latest_write_wins(inventory):
+    catalog.write(inventory, [item('20190301', '20190313', baseline=-5.0)])
+    gf = catalog.query(inventory, start='2019-03-01', end='2019-03-31')
+    assert gf.perpendicularBaseline.tolist() == [-5.0]
+
+
+def test_to_items_roundtrip(inventory):
+    items = catalog.to_items(catalog.query(inventory, product='offsets'))
+    assert items[0]['properties']['start_datetime'] == '2017-01-05T00:00:00Z'
+    assert items[0]['assets']['unwrapped']['href'].startswith('s3://fufiters/offsets/')
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from fufiters import cli
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+HEAVY = ['asf_search', 'geopandas', 'numpy', 'pandas', 'pyarrow', 'pystac', 'rasterio', 'shapely']
+
+
+@pytest.mark.parametrize('command', ['plan-pairs'] + list(cli.MODULE_COMMANDS))
+def test_help_without_heavy_imports(command):
+    code = ('import sys\nfrom fufiters import cli\n'
+            f'try:\n    cli.main([{command!r}, "--help"])\nexcept SystemExit:\n    pass\n'
+            f'print("loaded:", *[m for m in {HEAVY!r} if m in sys.modules])')
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, check=True)
+    assert 'usage:' in proc.stdout
+    assert proc.stdout.splitlines()[-1] == 'loaded:'
@@ -0,0 +1,25 @@
+import numpy as np
+import rasterio
+
+from fufiters import cog
+
+
+def write_tif(path, size, **options):
+    profile = dict(driver='GTiff', width=size, height=size, count=1, dtype='float32', crs='EPSG:32645',
+                   transform=rasterio.transform.from_origin(500000, 3100000, 80, 80), **options)
+    with rasterio.open(path, 'w', **profile) as dst:
+        dst.write(np.ones((1, size, size), dtype='float32'))
+    return str(path)
+
+
+def test_striped_without_overviews(tmp_path):
+    errors = cog.validate(write_tif(tmp_path / 'striped.tif', 1024))
+    assert 'not tiled' in errors
+    assert 'no overviews for 1024x1024 raster' in errors
+
+
+def test_cog(tmp_path):
+    href = write_tif(tmp_path / 'unw_phase.tif', 1024)
+    cog.convert(href, blocksize=256)
+    assert cog.validate(href, blocksize=256) == []
+    assert cog.validate(write_tif(tmp_path / 'small.tif', 256, tiled=True, blockxsize=256, blockysize=256)) == []
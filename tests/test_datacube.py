@@ -0,0 +1,61 @@
+import glob
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import rasterio
+
+from fufiters import datacube, stac
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+import synthetic  # noqa: E402
+
+BURST = '012_023790_IW1'
+
+
+def chunk_files(path, var, pair):
+    """{chunk file: (mtime, bytes)} of one pair of a cube variable"""
+    files = glob.glob(os.path.join(path, var, 'c', str(pair), '*', '*'))
+    return {f: (os.stat(f).st_mtime_ns, open(f, 'rb').read()) for f in files}
+
+
+def local_items(folders):
+    """Items for product folders, sorted by date, with asset hrefs pointing at the local COGs"""
+    files = {os.path.basename(f): f for folder in folders for f in glob.glob(f'{folder}/*')}
+    items = [item.to_dict() for item in stac.create_items([(folder, BURST) for folder in folders])]
+    for item in items:
+        for asset in item['assets'].values():
+            asset['href'] = files.get(os.path.basename(asset['href']), asset['href'])
+    return sorted(items, key=lambda item: item['properties']['start_datetime'])
+
+
+def test_build_and_append(tmp_path):
+    folders = synthetic.make_store(str(tmp_path / 'store'), BURST, nproducts=3, size=64)
+    items = local_items(folders)
+    path = str(tmp_path / 'cube.zarr')
+
+    assert datacube.build(items[:2], path, chunks=(32, 32), workers=2) == 2
+    before = {pair: chunk_files(path, 'unwrapped_phase', pair) for pair in [0, 1]}
+    assert all(len(files) == 4 for files in before.values())
+
+    # Pairs already in the cube are skipped, only the new one is written
+    assert datacube.build(items, path, chunks=(32, 32), workers=2) == 1
+    assert datacube.build(items, path) == 0
+    for pair, files in before.items():
+        assert chunk_files(path, 'unwrapped_phase', pair) == files
+    assert len(chunk_files(path, 'unwrapped_phase', 2)) == 4
+
+    import xarray as xr
+    ds = xr.open_dataset(path, engine='zarr')
+    dates = pd.date_range('2019-01-01', periods=4, freq='12D')
+    assert list(ds.pair.values) == [f'{r:%Y%m%d}_{s:%Y%m%d}' for r, s in zip(dates[:-1], dates[1:])]
+    assert list(ds.reference.values) == list(dates[:-1].values)
+    assert list(ds.secondary.values) == list(dates[1:].values)
+    assert list(ds.dt_days.values) == [12, 12, 12]
+    assert ds.unwrapped_phase.shape == (3, 64, 64)
+
+    name = os.path.basename(folders[2])
+    with rasterio.open(f'{folders[2]}/{name}_unw_phase.tif') as src:
+        expected = src.read(1, masked=True).astype('float32').filled(np.nan)
+    np.testing.assert_array_equal(ds.unwrapped_phase[2].values, expected)
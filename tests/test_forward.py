@@ -0,0 +1,101 @@
+import geopandas as gpd
+import pandas as pd
+import shapely
+
+from fufiters import forward, pairs, planning
+
+BURST = '012_023790_IW1'
+TIMES = pd.date_range('2023-01-05 12:14', periods=40, freq='12D', tz='UTC')
+
+
+def stack(times):
+    return pd.DataFrame(dict(sceneName=[f'S1A_IW_SLC__1SDV_{t:%Y%m%dT%H%M%S}_{t:%Y%m%dT%H%M%S}' for t in times],
+                             datetime=times))
+
+
+def batch(times, npairs=3):
+    gf = stack(times)
+    ref, sec = pairs.nplusk(gf.datetime.values, npairs)
+    return set(pairs.pair_table(gf.sceneName.values, gf.datetime.values, ref, sec).name)
+
+
+def test_first_run_without_watermark():
+    table, gf, entry = forward.plan_burst(stack(TIMES[:20]), None)
+    assert len(table) == 0
+    assert entry['watermark'] == TIMES[19].isoformat()
+    assert [name for name, _ in entry['recent']] == stack(TIMES[17:20]).sceneName.tolist()
+
+    # Starting at since plans every pair whose secondary is newer
+    table, _, entry = forward.plan_burst(stack(TIMES[:20]), None, since=TIMES[9])
+    assert (pd.to_datetime(table.secondary.str[17:32]) > TIMES[9].tz_localize(None)).all()
+    assert len(table) == 3 * 10
+    assert entry['watermark'] == TIMES[19].isoformat()
+
+
+def test_new_secondaries_complete_pairs():
+    _, _, entry = forward.plan_burst(stack(TIMES[:20]), None)
+    # Later search only returns acquisitions after the watermark, references come from the entry
+    table, gf, entry = forward.plan_burst(stack(TIMES[20:22]), entry)
+    assert set(table.name) == batch(TIMES[:22]) - batch(TIMES[:20])
+    assert len(table) == 6
+    assert len(gf) == 5
+    assert entry['watermark'] == TIMES[21].isoformat()
+
+    # Nothing new plans nothing and keeps the watermark
+    again, _, same = forward.plan_burst(stack(TIMES[20:22]), entry)
+    assert len(again) == 0
+    assert same is entry
+
+
+def test_offsets_become_eligible():
+    times = pd.date_range('2022-01-03 12:14', periods=45, freq='12D', tz='UTC')
+    _, _, entry = forward.plan_burst(stack(times[:35]), None, dt=1)
+    assert entry['recent'] == []
+    table, _, entry = forward.plan_burst(stack(times), entry, dt=1)
+    ref, sec = pairs.offsets(times, 1)
+    before, _ = pairs.offsets(times[:35], 1)
+    # References that gained a full year of acquisitions since the watermark
+    assert len(table) == len(ref) - len(before) > 0
+    assert set(table.reference) == set(stack(times).sceneName.values[ref[len(before):]])
+    assert (table.dt_days >= 360).all()
+
+    start = forward.search_start(entry, None, None, dt=1)
+    assert start == times[-1] - pd.Timedelta(days=365) - forward.OFFSETS_MARGIN
+
+
+def test_plan_searches_from_watermark(monkeypatch):
+    searches = []
+
+    def find_acquisitions(bursts, start):
+        searches.append(pd.Timestamp(start))
+        gf = stack([t for t in TIMES[:22] if t >= pd.Timestamp(start)])
+        return gpd.GeoDataFrame(gf.assign(burstID=BURST), geometry=[shapely.Point(0, 0)] * len(gf), crs=4326)
+
+    monkeypatch.setattr(planning, 'find_acquisitions', find_acquisitions)
+    bursts = pd.DataFrame(dict(burstID=[BURST], relative_orbit_number=[12]))
+    _, _, entry = forward.plan_burst(stack(TIMES[:20]), None)
+    table, state = forward.plan(bursts, {'insar_n3': {BURST: entry}}, npairs=3)
+    assert searches == [TIMES[19]]
+    assert len(table) == 6
+    assert state['insar_n3'][BURST]['watermark'] == TIMES[21].isoformat()
+
+    table, _ = forward.plan(bursts, {}, npairs=3, since='2023-06-01', now='2024-01-01')
+    assert searches[-1] == pd.Timestamp('2023-06-01', tz='UTC') - forward.INIT_LOOKBACK
+    assert set(table.name) == set(n for n in batch(TIMES[:22]) if n[9:] > '20230601')
+
+
+def test_load_save_round_trip(tmp_path):
+    state = {'insar_n3': {BURST: dict(watermark=TIMES[0].isoformat(), recent=[])}}
+    assert forward.load(str(tmp_path / 'missing.json')) == {}
+    for path in [str(tmp_path / 'watermarks.json'), 'memory://forward/watermarks.json']:
+        assert forward.save(state, path) == path
+        assert forward.load(path) == state
+
+
+def test_update_from_pending(tmp_path):
+    pending = forward.save({'insar_n3': {BURST: dict(watermark=TIMES[1].isoformat())}}, str(tmp_path / 'pending.json'))
+    forward.main([str(tmp_path / 'watermarks.json'), '--update', pending])
+    assert forward.load(str(tmp_path / 'watermarks.json'))['insar_n3'][BURST]['watermark'] == TIMES[1].isoformat()
+    # Empty path (unset workflow variable) uses the cache
+    forward.main(['', '--update', pending])
+    assert forward.load()['insar_n3'][BURST]['watermark'] == TIMES[1].isoformat()
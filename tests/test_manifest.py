@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+import uuid
+
+import fsspec
+import pytest
+
+from fufiters import manifest
+
+
+@pytest.fixture
+def product(tmp_path):
+    folder = tmp_path / 'S1_023790_IW1_20230621_20230703_VV_INT80'
+    folder.mkdir()
+    for suffix, size in [('_unw_phase.tif', 5000), ('_corr.tif', 3000), ('.txt', 100)]:
+        (folder / f'{folder.name}{suffix}').write_bytes(os.urandom(size))
+    return str(folder)
+
+
+@pytest.fixture
+def dest():
+    url = f'memory://fufiters/{uuid.uuid4().hex}/S1_023790_IW1_20230621_20230703_VV_INT80'
+    yield url
+    fs, path = fsspec.core.url_to_fs(url)
+    fs.rm(path, recursive=True)
+
+
+def test_multihash(product):
+    path = os.path.join(product, os.listdir(product)[0])
+    entry = manifest.file_checksum(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    assert entry == dict(checksum='1220' + hashlib.sha256(data).hexdigest(), size=len(data))
+
+
+def test_upload_changed_files(product, dest):
+    name = os.path.basename(product)
+    assert sorted(manifest.upload(product, dest, workers=2)) == sorted(f for f in os.listdir(product)
+                                                                       if f != manifest.MANIFEST_FILE)
+    remote = manifest.read(dest)
+    assert remote == manifest.build(product)
+
+    # Nothing changed
+    assert manifest.upload(product, dest) == []
+
+    # One changed and one new file
+    with open(os.path.join(product, f'{name}_corr.tif'), 'wb') as f:
+        f.write(os.urandom(3000))
+    with open(os.path.join(product, f'{name}_dem.tif'), 'wb') as f:
+        f.write(os.urandom(10))
+    assert manifest.upload(product, dest, dry_run=True) == [f'{name}_corr.tif', f'{name}_dem.tif']
+    assert manifest.read(dest) == remote
+    assert manifest.upload(product, dest) == [f'{name}_corr.tif', f'{name}_dem.tif']
+
+    fs, path = fsspec.core.url_to_fs(dest)
+    with open(os.path.join(product, f'{name}_corr.tif'), 'rb') as f:
+        assert fs.cat_file(f'{path}/{name}_corr.tif') == f.read()
+    assert json.loads(fs.cat_file(f'{path}/{manifest.MANIFEST_FILE}'))['files'] == manifest.build(product)
+
+
+def test_interrupted_upload_resumes(product, dest):
+    # Files copied without a manifest (interrupted run) are uploaded again
+    fs, path = fsspec.core.url_to_fs(dest)
+    name = os.path.basename(product)
+    fs.put_file(os.path.join(product, f'{name}.txt'), f'{path}/{name}.txt')
+    assert manifest.read(dest) == {}
+    assert len(manifest.upload(product, dest)) == 3
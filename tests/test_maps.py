@@ -0,0 +1,53 @@
+import os
+import sys
+import webbrowser
+
+import asf_search as asf
+import pytest
+
+from fufiters import maps, slcs
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+import stand_in  # noqa: E402
+import synthetic  # noqa: E402
+
+BURST = '012_023790_IW1'
+
+
+@pytest.fixture
+def stack(monkeypatch):
+    """Two years of synthetic SLCs covering BURST, and its burst metadata"""
+    monkeypatch.setattr(asf, 'REPORT_ERRORS', False)
+    with stand_in.StandIn(respond=synthetic.cmr_response) as server, stand_in.redirect(server.url):
+        gfb = slcs.get_burst_metadata(BURST)
+        gf = slcs.search_for_slcs(gfb, '2019-01-01', '2021-01-01')
+    return gf, gfb
+
+
+def test_footprints(stack):
+    gf, _ = stack
+    frames = maps.footprints(gf)
+    assert len(frames) == gf.groupby(maps.FRAME_COLUMNS).ngroups < len(gf)
+    assert frames['count'].sum() == len(gf)
+    assert set(frames.platforms) == {'Sentinel-1A,Sentinel-1B'}
+    assert frames['first'].min() == gf.datetime.min().strftime('%Y-%m-%d')
+
+    simple = maps.simplify(frames)
+    grid = maps.grid_size(frames)
+    assert (abs(simple.get_coordinates() / grid - (simple.get_coordinates() / grid).round()) < 1e-6).all().all()
+
+
+def test_slippy_map_written(stack, monkeypatch):
+    for module in ['folium', 'matplotlib', 'mapclassify']:
+        pytest.importorskip(module)
+    gf, gfb = stack
+    opened = []
+    monkeypatch.setattr(webbrowser, 'open', opened.append)
+    path = '/tmp/mapSLCs.html'
+    if os.path.exists(path):
+        os.remove(path)
+    slcs.slippy_map(gf, gfb)
+    assert opened == [f'file://{path}']
+    with open(path) as f:
+        html = f.read()
+    assert BURST in html and 'Sentinel-1A,Sentinel-1B' in html
@@ -0,0 +1,20 @@
+import glob
+import os
+import sys
+
+from fufiters import mosaic, stac
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+import synthetic  # noqa: E402
+
+
+def test_bbox_filters_collection(tmp_path):
+    synthetic.make_store(str(tmp_path / 'store'), nproducts=2, size=64)
+    stac.bulk(stac.find_products(str(tmp_path / 'store')), str(tmp_path / 'catalog'))
+    collection = glob.glob(str(tmp_path / 'catalog' / '**' / 'collection.json'), recursive=True)[0]
+
+    mosaic.main([collection, '-o', str(tmp_path / 'far'), '-a', 'unwrapped', '--bbox', '0', '0', '1', '1'])
+    assert not os.path.exists(tmp_path / 'far')
+
+    mosaic.main([collection, '-o', str(tmp_path / 'all'), '-a', 'unwrapped', '--bbox', '-180', '-90', '180', '90'])
+    assert len(glob.glob(str(tmp_path / 'all' / '*' / 'unwrapped_*.vrt'))) == 2
@@ -0,0 +1,67 @@
+import json
+
+import pandas as pd
+import pytest
+
+from fufiters import packing
+
+
+def pair_table(nbursts=10, nacq=29, npairs=3):
+    """n+1..n+npairs pairs of nacq acquisitions 12 days apart for each burst"""
+    times = pd.date_range('2020-01-01', periods=nacq, freq='12D')
+    names = [f'S1A_IW_SLC__1SDV_{t:%Y%m%dT%H%M%S}_{t:%Y%m%dT%H%M%S}_000000_000000_0000' for t in times]
+    rows = []
+    for burst in range(nbursts):
+        for i in range(nacq):
+            for k in range(1, npairs + 1):
+                if i + k < nacq:
+                    rows.append(dict(burstId=f'{burst:03d}_000001_IW1', reference=names[i], secondary=names[i + k],
+                                     name=f'{times[i]:%Y%m%d}_{times[i + k]:%Y%m%d}'))
+    return pd.DataFrame(rows)
+
+
+def test_max_pairs_per_job():
+    table = pair_table()
+    jobs = packing.pack(table, max_pairs_per_job=6)
+    assert len(jobs) == sum(-(-n // 6) for n in table.groupby('burstId').size())
+    assert jobs.npairs.max() == 6
+    assert jobs.npairs.sum() == len(table)
+    assert (jobs.groupby('burstId').npairs.sum() == table.groupby('burstId').size()).all()
+
+
+def test_max_jobs():
+    table = pair_table()
+    jobs = packing.pack(table, max_pairs_per_job=6, max_jobs=25)
+    assert len(jobs) == 25
+    assert jobs.npairs.sum() == len(table)
+    # 81 pairs per burst, every burst gets at least 2 jobs
+    assert jobs.npairs.max() == 41
+    # Packing shares acquisitions between pairs of a job
+    assert jobs.acquisitions.sum() < 2 * len(table)
+
+
+def test_max_jobs_below_bursts():
+    with pytest.raises(ValueError):
+        packing.pack(pair_table(), max_jobs=5)
+
+
+def test_matrix_chunks():
+    jobs = packing.pack(pair_table(), max_pairs_per_job=1)
+    chunks = packing.to_matrix_chunks(jobs)
+    assert [len(json.loads(chunk)['include']) for chunk in chunks] == [256, 256, 256, 42]
+    entry = json.loads(chunks[0])['include'][0]
+    assert len(entry['references'].split()) == len(entry['pairs'].split()) == 1
+
+
+def test_runtime_balance():
+    """A full network of 8 acquisitions then 12 pairs without shared acquisitions"""
+    times = pd.date_range('2020-01-01', periods=32, freq='6D')
+    names = [f'S1A_IW_SLC__1SDV_{t:%Y%m%dT%H%M%S}_{t:%Y%m%dT%H%M%S}_000000_000000_0000' for t in times]
+    index = [(i, j) for i in range(8) for j in range(i + 1, 8)] + [(i, i + 1) for i in range(8, 32, 2)]
+    table = pd.DataFrame(dict(burstId='000_000001_IW1', reference=[names[i] for i, _ in index],
+                              secondary=[names[j] for _, j in index], name=[f'{i}_{j}' for i, j in index]))
+    jobs = packing.pack(table, max_pairs_per_job=6, max_jobs=2)
+    # Pairs that share acquisitions are cheaper, so the first job gets more of them
+    assert jobs.npairs.tolist() == [22, 18]
+    assert jobs.est_minutes.max() - jobs.est_minutes.min() <= packing.PAIR_MINUTES['20x4']
+    assert (packing.pair_costs(table) >= packing.PAIR_MINUTES['20x4']).all()
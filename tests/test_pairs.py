@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fufiters import pairs
+
+
+def stack(times):
+    times = pd.DatetimeIndex(times)
+    return pd.DataFrame(dict(sceneName=[f'S1A_IW_SLC__1SDV_{t:%Y%m%dT%H%M%S}_{t:%Y%m%dT%H%M%S}' for t in times],
+                             datetime=times))
+
+
+def irregular(n=60, seed=0):
+    """Acquisitions 6, 12 or 24 days apart, sometimes with longer gaps"""
+    rng = np.random.default_rng(seed)
+    days = np.cumsum(rng.choice([6, 12, 12, 24, 48], size=n))
+    return pd.DatetimeIndex(pd.Timestamp('2019-12-20 12:14:03') + pd.to_timedelta(days, unit='D'))
+
+
+def loop_nplusk(n, k, refs):
+    """Loop over references and offsets as scripts/getBurstPairs.py used to"""
+    out = []
+    for r in refs:
+        for s in range(1, k + 1):
+            if r + s < n:
+                out.append((r, r + s))
+    return out
+
+
+def loop_offsets(times, dt):
+    """iterrows + Index.get_indexer(method='nearest') as scripts/getBurstPairs.py used to"""
+    index = pd.DatetimeIndex(times)
+    out = []
+    for i, t in enumerate(index):
+        if index[-1] - t < pd.Timedelta(days=365 * dt):
+            break
+        out.append((i, index.get_indexer([t + pd.DateOffset(years=dt)], method='nearest')[0]))
+    return out
+
+
+@pytest.mark.parametrize('k', [1, 3, 5])
+def test_nplusk_matches_loop(k):
+    times = irregular()
+    ref, sec = pairs.nplusk(times, k)
+    assert list(zip(ref, sec)) == loop_nplusk(len(times), k, range(len(times)))
+
+    mask = pairs.year_mask(times, 2020)
+    ref, sec = pairs.nplusk(times, k, ref_mask=mask)
+    assert list(zip(ref, sec)) == loop_nplusk(len(times), k, np.flatnonzero(mask))
+
+
+def test_nplusk_end_of_stack(capsys):
+    ref, sec = pairs.nplusk(pd.date_range('2020-01-01', periods=5, freq='12D'), 3)
+    # The last references only get the secondaries that exist
+    assert list(zip(ref, sec)) == [(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (1, 4), (2, 3), (2, 4), (3, 4)]
+    assert 'for 3 references at end of stack' in capsys.readouterr().out
+    assert len(pairs.nplusk(pd.DatetimeIndex([]), 3)[0]) == 0
+
+
+@pytest.mark.parametrize('dt', [1, 2])
+def test_offsets_match_get_indexer(dt):
+    times = irregular(n=120)
+    ref, sec = pairs.offsets(times, dt)
+    assert list(zip(ref, sec)) == loop_offsets(times, dt)
+    assert list(zip(*pairs.offsets(times.tz_localize('UTC'), dt))) == loop_offsets(times, dt)
+
+
+def test_offsets_tie_breaking():
+    # 10 day spacing puts every target (365 days later) halfway between two acquisitions
+    times = pd.date_range('2021-01-01', periods=60, freq='10D')
+    ref, sec = pairs.offsets(times, 1)
+    assert list(zip(ref, sec)) == loop_offsets(times, 1)
+    # Ties go to the later acquisition
+    assert ((times[sec] - times[ref]).days == 370).all()
+    assert len(pairs.offsets(pd.DatetimeIndex([]), 1)[0]) == 0
+
+
+def test_sbas_matches_brute_force():
+    times = irregular()
+    ref, sec = pairs.sbas(times, max_days=48, min_days=6)
+    brute = [(i, j) for i in range(len(times)) for j in range(i + 1, len(times))
+             if 6 < (times[j] - times[i]).total_seconds() / 86400 <= 48]
+    assert sorted(zip(ref, sec)) == brute
+
+
+def test_connectivity_of_disconnected_network():
+    # Two bursts of acquisitions a year apart and one isolated acquisition
+    times = pd.DatetimeIndex(list(pd.date_range('2020-01-01', periods=10, freq='12D'))
+                             + list(pd.date_range('2021-01-01', periods=10, freq='12D'))
+                             + [pd.Timestamp('2022-06-01')])
+    ref, sec = pairs.sbas(times, max_days=36)
+    labels = pairs.connectivity(len(times), ref, sec)
+    assert len(np.unique(labels[:10])) == 1
+    assert len(np.unique(labels[10:20])) == 1
+    assert len(np.unique(labels)) == 3
+    table = pairs.pair_table(stack(times).sceneName.values, times, ref, sec)
+    assert pairs.summarize(table, len(times)) == 2
+    assert (pairs.connectivity(4, np.array([], dtype=int), np.array([], dtype=int)) == np.arange(4)).all()
+
+
+def test_plan_insar_references_in_year():
+    gf = stack(pd.date_range('2019-06-01', '2021-03-01', freq='12D'))
+    table = pairs.plan_insar(gf, 2020, 3)
+    assert (gf.datetime.iloc[table.ref_idx].dt.year == 2020).all()
+    refs = np.flatnonzero(gf.datetime.dt.year == 2020)
+    assert list(zip(table.ref_idx, table.sec_idx)) == loop_nplusk(len(gf), 3, refs)
+    assert table.name.iloc[0] == f'{gf.datetime.iloc[refs[0]]:%Y%m%d}_{gf.datetime.iloc[refs[0] + 1]:%Y%m%d}'
@@ -0,0 +1,48 @@
+import geopandas as gpd
+import shapely
+
+from fufiters import planning
+
+
+def burst_frame(rows):
+    """Bursts as (burstID, orbit_pass, lon, lat) with 0.8 x 0.2 degree footprints"""
+    return gpd.GeoDataFrame(dict(burstID=[r[0] for r in rows], relative_orbit_number=12,
+                                 orbit_pass=[r[1] for r in rows]),
+                            geometry=[shapely.box(lon, lat, lon + 0.8, lat + 0.2) for _, _, lon, lat in rows],
+                            crs=4326)
+
+
+BURSTS = burst_frame([('012_023790_IW1', 'DESCENDING', 86.0, 27.8),
+                      ('012_023791_IW1', 'DESCENDING', 86.05, 27.6),
+                      ('012_023792_IW1', 'DESCENDING', 86.1, 27.4),
+                      ('012_023790_IW2', 'DESCENDING', 86.75, 27.85),
+                      ('012_025000_IW1', 'DESCENDING', 80.0, 40.0),
+                      ('012_090000_IW3', 'ASCENDING', 86.3, 27.6)])
+
+
+def test_groups_by_pass_and_distance():
+    labels = planning.burst_groups(BURSTS)
+    assert len(set(labels[:4])) == 1
+    assert len(set(labels)) == 3
+
+    wkts = planning.search_geometries(BURSTS)
+    assert len(wkts) == 3
+    geoms = shapely.from_wkt(wkts)
+    # Every burst is covered and no search spans to the far burst
+    covered = shapely.intersects(shapely.union_all(geoms), shapely.centroid(BURSTS.geometry.values))
+    assert covered.all()
+    assert max(shapely.area(geoms)) < 1
+
+
+def test_search_orbit_merges_groups(monkeypatch):
+    calls = []
+
+    def search(**query):
+        calls.append(query['intersectsWith'])
+        return gpd.GeoDataFrame(dict(sceneName=['A', f'B{len(calls)}']), geometry=[shapely.Point(0, 0)] * 2, crs=4326)
+
+    monkeypatch.setattr(planning.searchcache, 'search', search)
+    gf = planning.search_orbit(12, BURSTS)
+    assert len(calls) == 3
+    assert sorted(gf.sceneName) == ['A', 'B1', 'B2', 'B3']
+    assert len(planning.search_orbit(12, BURSTS.iloc[:1])) == 2
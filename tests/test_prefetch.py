@@ -0,0 +1,61 @@
+import math
+import os
+import sys
+
+import geopandas as gpd
+import pandas as pd
+import shapely
+
+from fufiters import burstdb, pairs, prefetch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+import synthetic  # noqa: E402
+
+
+def pair_table(burst_ids, year=2020, npairs=3):
+    """n+1..n+npairs pairs of synthetic S1A/S1B acquisitions (SLC names) for every burst"""
+    dates = synthetic.acquisition_dates(pd.Timestamp(f'{year}-01-01'), pd.Timestamp(f'{year + 1}-03-01'))
+    frame = shapely.box(86, 27, 88, 29)
+    names = [synthetic.slc_item(platform, 12, 'ASCENDING', 11, frame, date)['umm']['DataGranule']['Identifiers'][0]
+             ['Identifier'] for platform, date in dates]
+    times = pd.DatetimeIndex([d for _, d in dates])
+    ref, sec = pairs.nplusk(times.values, npairs, ref_mask=pairs.year_mask(times.values, year))
+    tables = [pairs.pair_table(names, times.values, ref, sec).assign(burstId=burst_id) for burst_id in burst_ids]
+    return pd.concat(tables, ignore_index=True), names
+
+
+def test_dem_tiles_shared():
+    gfb = burstdb.add_burst_names(synthetic.burst_map())
+    gfb = gfb[(gfb.relative_orbit_number == 12) & gfb.burst_id.between(23785, 23795)]
+    tiles = prefetch.dem_tiles(gfb)
+    per_burst = []
+    for geom in gfb.geometry:
+        xmin, ymin, xmax, ymax = geom.bounds
+        per_burst.append({prefetch.tile_name(lon, lat)
+                          for lon in range(math.floor(xmin - prefetch.DEM_BUFFER), math.ceil(xmax + prefetch.DEM_BUFFER))
+                          for lat in range(math.floor(ymin - prefetch.DEM_BUFFER), math.ceil(ymax + prefetch.DEM_BUFFER))})
+    assert tiles == sorted(set.union(*per_burst))
+    # 33 bursts need only a few distinct tiles
+    assert len(tiles) < sum(len(t) for t in per_burst) / 10
+    assert 'Copernicus_DSM_COG_10_N27_00_E086_00_DEM' in tiles
+
+    crossing = gpd.GeoSeries([shapely.Polygon([(179.8, 10), (-179.9, 10), (-179.9, 10.2), (179.8, 10.2)])])
+    assert prefetch.dem_tiles(gpd.GeoDataFrame(geometry=crossing)) == sorted(
+        prefetch.tile_name(lon, lat) for lon in [179, -180] for lat in [9, 10])
+
+
+def test_orbit_windows_per_acquisition_day():
+    table, names = pair_table(['012_023790_IW1', '012_023790_IW2', '012_023791_IW1'])
+    windows = prefetch.orbit_windows(table)
+    # Every acquisition is in up to 6 pairs of 3 bursts, but needs one orbit window
+    used = set(table.reference) | set(table.secondary)
+    assert len(windows) == len(used) < 2 * len(table)
+    assert set(windows.platform) == {'S1A', 'S1B'}
+    assert (windows.validity_start <= windows.start).all() and (windows.stop <= windows.validity_stop).all()
+
+    gfb = burstdb.add_burst_names(synthetic.burst_map())
+    manifest = prefetch.manifest(gfb, table)
+    assert len(manifest['orbits']) == len(windows)
+    # Only the bursts in the table need DEM tiles
+    assert manifest['dem_tiles'] == prefetch.dem_tiles(gfb[gfb.burstID.isin(table.burstId)])
+    assert manifest['dem_cache_key'] == prefetch.manifest(gfb, table.iloc[::-1])['dem_cache_key']
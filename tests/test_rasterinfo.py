@@ -0,0 +1,39 @@
+import os
+import sys
+
+from fufiters import rasterinfo
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+import synthetic  # noqa: E402
+
+NAME = 'S1_023790_IW1_20230621_20230703_VV_INT80'
+
+
+def test_cache_hit_and_miss(tmp_path, cache, monkeypatch):
+    folder = synthetic.make_product(str(tmp_path / NAME), '012_023790_IW1', '20230621T121402', '20230703T121403',
+                                    size=64)
+    href = f'{folder}/{NAME}_corr.tif'
+    reads = []
+    read_raster_info = rasterinfo.read_raster_info
+    monkeypatch.setattr(rasterinfo, 'read_raster_info', lambda h: reads.append(h) or read_raster_info(h))
+
+    info = rasterinfo.get_raster_info(href)
+    assert info['shape'] == [64, 64] and info['epsg'] == 32645
+    assert rasterinfo.is_cog(info)
+    assert len(list((cache / 'rasterinfo').glob('*.json'))) == 1
+    # Unchanged file: answered from the cache
+    assert rasterinfo.get_raster_info(href) == info
+    assert len(reads) == 1
+
+    # Rewritten file (new size and mtime): read again
+    synthetic.make_product(folder, '012_023790_IW1', '20230621T121402', '20230703T121403', size=32, seed=1)
+    stat = os.stat(href)
+    os.utime(href, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    changed = rasterinfo.get_raster_info(href)
+    assert len(reads) == 2
+    assert changed['shape'] == [32, 32]
+    assert changed['raster:bands'][0]['statistics'] != info['raster:bands'][0]['statistics']
+
+    assert rasterinfo.get_raster_info(f'{folder}/missing.tif') is None
+    assert rasterinfo.get_raster_info_many({'corr': href, 'missing': f'{folder}/missing.tif'}) == \
+        dict(corr=changed, missing=None)
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pandas as pd
+
+from fufiters import pairs, report
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+import synthetic  # noqa: E402
+
+
+def acquisitions():
+    """Synthetic S1A+S1B calendar for one burst, and the same stack ending in mid 2020 for another"""
+    dates = synthetic.acquisition_dates(pd.Timestamp('2018-01-01'), pd.Timestamp('2022-03-01'))
+    full = pd.DataFrame(dict(burstID='012_023790_IW1',
+                             datetime=pd.to_datetime([d for _, d in dates], utc=True) + pd.Timedelta(minutes=11),
+                             platform=[f'Sentinel-1{p[-1]}' for p, _ in dates], polarization='VV+VH'))
+    full['sceneName'] = full.platform.str[-1] + full.datetime.dt.strftime('%Y%m%dT%H%M%S')
+    short = full[full.datetime < '2020-07-01'].assign(burstID='012_023791_IW1')
+    return pd.concat([full, short], ignore_index=True)
+
+
+def planned(acq, year, npairs):
+    """Pairs getBurstPairs plans for a year: search to March of the next year, then n+k pairs"""
+    gf = acq[acq.datetime < f'{year + 1}-{report.YEAR_END}'].sort_values('datetime').reset_index(drop=True)
+    return len(pairs.plan_insar(gf, year, npairs))
+
+
+def test_pairability_matches_planner():
+    acq = acquisitions()
+    summary, yearly = report.report(acq, npairs=3, polarization='VV')
+    for burst_id, group in acq.groupby('burstID'):
+        for year in range(2018, 2023):
+            expected = planned(group, year, 3)
+            assert yearly.loc[burst_id, ('pairs', year)] == expected, (burst_id, year)
+
+    full, short = '012_023790_IW1', '012_023791_IW1'
+    # S1A+S1B every 6 days until the end of 2021, S1A only after
+    assert summary.loc[full, 'gap_min'] == 6 and summary.loc[full, 'gap_max'] == 12
+    assert summary.loc[full, 'platforms'] == 'Sentinel-1A,Sentinel-1B'
+    assert yearly.loc[full, 'complete'][[2018, 2019, 2020, 2021]].all()
+    # Last year of each stack ends before March, so its references miss secondaries
+    assert not yearly.loc[full, ('complete', 2022)]
+    assert yearly.loc[short, 'complete'][[2018, 2019]].all()
+    assert not yearly.loc[short, ('complete', 2020)]
+    assert summary.loc[short, 'complete_years'] == 2
+    assert report.gap_histogram(report.prepare(acq)).loc[full, '<=6d'] > 0
@@ -0,0 +1,109 @@
+import json
+import os
+import sys
+
+import pytest
+
+from fufiters import runner
+
+BURST = '012_023790_IW1'
+# Writes a product folder and records the call, fails for references starting with BAD
+PAIR_STUB = '''
+import os, sys
+reference, secondary, name, calls = sys.argv[1:]
+with open(calls, 'a') as f:
+    print('pair', name, file=f)
+if reference.startswith('BAD'):
+    sys.exit(3)
+os.makedirs(f'S1_023790_IW1_{name}_VV_INT80', exist_ok=True)
+'''
+# Fails while a {name}.fail file exists next to the call log
+STAC_STUB = '''
+import os, sys
+name, calls = sys.argv[1:]
+with open(calls, 'a') as f:
+    print('stac', name, file=f)
+if os.path.exists(os.path.join(os.path.dirname(calls), f'{name}.fail')):
+    sys.exit(4)
+'''
+
+
+def entry(reference, secondary):
+    return dict(reference=reference, secondary=secondary, name=f'{reference[-8:]}_{secondary[-8:]}')
+
+
+MATRIX = [entry('S1A_20230609', 'S1A_20230621'), entry('S1A_20230621', 'S1A_20230703'),
+          entry('BAD_20230703', 'S1A_20230715')]
+
+
+@pytest.fixture
+def stubs(tmp_path):
+    for name, code in [('pair_stub.py', PAIR_STUB), ('stac_stub.py', STAC_STUB)]:
+        with open(tmp_path / name, 'w') as f:
+            f.write(code)
+    calls = str(tmp_path / 'calls.txt')
+    return dict(command=f'{sys.executable} {tmp_path}/pair_stub.py {{reference}} {{secondary}} {{name}} {calls}',
+                stac_command=f'{sys.executable} {tmp_path}/stac_stub.py {{name}} {calls}',
+                calls=calls)
+
+
+def calls(stubs):
+    if not os.path.exists(stubs['calls']):
+        return []
+    with open(stubs['calls']) as f:
+        return f.read().split('\n')[:-1]
+
+
+def run(matrix, workdir, stubs):
+    return runner.run(matrix, str(workdir), burst_id=BURST, command=stubs['command'],
+                      stac_command=stubs['stac_command'], workers=2, retries=1, retry_delay=0)
+
+
+def test_state_and_retries(tmp_path, stubs):
+    state = run(MATRIX, tmp_path / 'runs', stubs)
+    with open(tmp_path / 'runs' / runner.STATE_FILE) as f:
+        saved = json.load(f)
+    assert saved == state.pairs
+
+    done = saved[f'{BURST}/20230609_20230621']
+    assert done['status'] == 'done'
+    assert done['stage'] == 'done'
+    assert done['attempts'] == 1
+    assert done['products'] == ['S1_023790_IW1_20230609_20230621_VV_INT80']
+
+    failed = saved[f'{BURST}/20230703_20230715']
+    assert failed['status'] == 'failed'
+    assert failed['stage'] == 'process'
+    assert failed['returncode'] == 3
+    assert failed['attempts'] == 2
+    assert calls(stubs).count('pair 20230703_20230715') == 2
+    assert 'stac 20230703_20230715' not in calls(stubs)
+
+
+def test_rerun_skips_done(tmp_path, stubs):
+    run(MATRIX, tmp_path / 'runs', stubs)
+    before = len(calls(stubs))
+    state = run(MATRIX, tmp_path / 'runs', stubs)
+    # Only the failed pair is attempted again
+    assert calls(stubs)[before:] == ['pair 20230703_20230715'] * 2
+    assert state.get(f'{BURST}/20230609_20230621')['attempts'] == 1
+
+
+def test_stac_failure_reruns_stac_only(tmp_path, stubs):
+    (tmp_path / '20230609_20230621.fail').touch()
+    state = run(MATRIX[:1], tmp_path / 'runs', stubs)
+    key = f'{BURST}/20230609_20230621'
+    assert state.get(key)['status'] == 'failed'
+    assert state.get(key)['stage'] == 'processed'
+    assert calls(stubs) == ['pair 20230609_20230621', 'stac 20230609_20230621', 'stac 20230609_20230621']
+
+    os.remove(tmp_path / '20230609_20230621.fail')
+    state = run(MATRIX[:1], tmp_path / 'runs', stubs)
+    assert state.get(key)['status'] == 'done'
+    assert calls(stubs)[3:] == ['stac 20230609_20230621']
+
+
+def test_main_exits_on_failure(tmp_path, stubs):
+    with pytest.raises(SystemExit):
+        runner.main([json.dumps(dict(include=MATRIX[2:])), '--workdir', str(tmp_path / 'runs'), '--burst', BURST,
+                     '--command', stubs['command'], '--no-stac', '--retries', '0', '--workers', '1'])
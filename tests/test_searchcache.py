@@ -0,0 +1,115 @@
+import json
+import os
+
+import geopandas as gpd
+import pandas as pd
+import pytest
+import shapely
+
+from fufiters import searchcache
+
+DATA = os.path.join(os.path.dirname(__file__), 'data')
+QUERY = dict(platform=['SENTINEL-1A'], processingLevel='SLC', relativeOrbit=12, intersectsWith='POINT(86.9 27.9)')
+NOW = pd.Timestamp('2024-01-01', tz='UTC')
+
+
+def granules(times):
+    return gpd.GeoDataFrame(dict(fileID=[f'S1A_{t:%Y%m%dT%H%M%S}-SLC' for t in times],
+                                 sceneName=[f'S1A_{t:%Y%m%dT%H%M%S}' for t in times],
+                                 startTime=[t.isoformat() for t in times]),
+                            geometry=[shapely.box(86, 27, 88, 29)] * len(times), crs=4326)
+
+
+class FakeCMR:
+    """Search function over a fixed list of acquisitions, recording the windows requested"""
+
+    def __init__(self, times):
+        self.times = pd.DatetimeIndex(times)
+        self.calls = []
+
+    def __call__(self, start=None, end=None, **query):
+        self.calls.append((start, end))
+        keep = pd.Series(True, index=range(len(self.times)))
+        if start is not None:
+            keep &= self.times >= pd.Timestamp(start)
+        if end is not None:
+            keep &= self.times <= pd.Timestamp(end)
+        return granules(self.times[keep.values])
+
+
+@pytest.fixture
+def cmr(monkeypatch):
+    monkeypatch.setattr(searchcache, '_now', lambda: NOW)
+    return FakeCMR(pd.date_range('2023-01-01', '2023-12-31', freq='12D', tz='UTC'))
+
+
+def test_miss_then_hit(cmr, tmp_path):
+    first = searchcache.search(cmr, cache_dir=str(tmp_path), start='2023-01-01', end='2023-06-30', **QUERY)
+    second = searchcache.search(cmr, cache_dir=str(tmp_path), start='2023-02-01', end='2023-03-31', **QUERY)
+    assert len(cmr.calls) == 1
+    assert len(first) == 16
+    times = pd.to_datetime(first.startTime)
+    assert second.fileID.tolist() == first[times.between('2023-02-01', '2023-03-31')].fileID.tolist()
+
+
+def test_incremental_refresh(cmr, tmp_path, monkeypatch):
+    searchcache.search(cmr, cache_dir=str(tmp_path), start='2023-01-01', **QUERY)
+    # Within the refresh interval open-ended queries are answered from cache
+    searchcache.search(cmr, cache_dir=str(tmp_path), start='2023-01-01', **QUERY)
+    assert len(cmr.calls) == 1
+
+    cmr.times = cmr.times.append(pd.DatetimeIndex([NOW + pd.Timedelta(days=3)]))
+    monkeypatch.setattr(searchcache, '_now', lambda: NOW + pd.Timedelta(days=4))
+    gf = searchcache.search(cmr, cache_dir=str(tmp_path), start='2023-01-01', **QUERY)
+    # Only granules from the newest cached startTime on are requested
+    assert pd.Timestamp(cmr.calls[-1][0]) == cmr.times[-2]
+    assert len(gf) == len(cmr.times)
+    assert gf.fileID.is_unique
+
+    # Earlier dates than covered are requested as a separate window
+    searchcache.search(cmr, cache_dir=str(tmp_path), start='2022-06-01', **QUERY)
+    assert pd.Timestamp(cmr.calls[-1][1]) == pd.Timestamp('2023-01-01', tz='UTC')
+
+
+def test_offline(cmr, tmp_path):
+    with pytest.raises(RuntimeError):
+        searchcache.search(cmr, cache_dir=str(tmp_path), offline=True, start='2023-01-01', **QUERY)
+    searchcache.search(cmr, cache_dir=str(tmp_path), start='2023-06-01', end='2023-12-31', **QUERY)
+    gf = searchcache.search(cmr, cache_dir=str(tmp_path), offline=True, start='2023-01-01', **QUERY)
+    assert len(cmr.calls) == 1
+    assert len(gf) == 18
+
+
+def test_eviction(cmr, tmp_path, monkeypatch):
+    cache = searchcache.SearchCache(str(tmp_path))
+    cache.search(cmr, start='2023-01-01', end='2023-06-30', **QUERY)
+    old = searchcache.make_key(QUERY)
+    assert os.path.exists(cache.path(old))
+
+    monkeypatch.setattr(searchcache, '_now', lambda: NOW + searchcache.TTL + pd.Timedelta(days=1))
+    cache.search(cmr, start='2023-01-01', end='2023-06-30', **dict(QUERY, relativeOrbit=85))
+    assert not os.path.exists(cache.path(old))
+    assert list(cache.read_index()) == [searchcache.make_key(dict(QUERY, relativeOrbit=85))]
+
+    cache.max_bytes = 0
+    assert cache.evict() == {}
+
+
+def test_record_replay(tmp_path):
+    import asf_search as asf
+    from asf_search.search.search_generator import as_ASFProduct
+
+    with open(os.path.join(DATA, 'cmr_slc_page.json')) as f:
+        page = json.loads(json.load(f)['body'])
+    results = asf.ASFSearchResults([as_ASFProduct(item, asf.ASFSession()) for item in page['items']])
+
+    record = searchcache.record_search(str(tmp_path / 'recorded'), search_fn=lambda **query: results)
+    recorded = record(**QUERY, start='2023-06-01', end='2023-07-31')
+    assert len(recorded) == 2
+
+    replay = searchcache.replay_search(str(tmp_path / 'recorded'))
+    gf = searchcache.search(replay, cache_dir=str(tmp_path / 'cache'), start='2023-06-01', end='2023-07-31', **QUERY)
+    assert sorted(gf.sceneName) == sorted(recorded.sceneName)
+    assert len(replay(**QUERY, start='2023-07-01', end='2023-07-31')) == 1
+    with pytest.raises(FileNotFoundError):
+        replay(**dict(QUERY, relativeOrbit=85))
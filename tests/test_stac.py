@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+
+from fufiters import stac
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+import synthetic  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path):
+    synthetic.make_store(str(tmp_path / 'store'), nproducts=3, size=64)
+    return stac.find_products(str(tmp_path / 'store'))
+
+
+def test_bulk_rerun_skips_existing(store, tmp_path, monkeypatch):
+    dest = str(tmp_path / 'catalog')
+    collection = stac.bulk(store, dest, workers=2)
+    assert len(list(collection.get_links('item'))) == 3
+
+    created = []
+    create_item_dict = stac._create_item_dict
+    monkeypatch.setattr(stac, '_create_item_dict', lambda d, *args: created.append(d) or create_item_dict(d, *args))
+    collection = stac.bulk(store, dest, workers=2)
+    assert created == []
+    assert len(list(collection.get_links('item'))) == 3
+
+
+def test_create_item_burst_from_path(store):
+    product_dir, burst_id = store[0]
+    assert burst_id == '012_023790_IW1'
+    item = stac.create_item(product_dir, raster_info=False)
+    assert item.properties['burstId'] == '012_023790_IW1'
+
+
+def test_create_item_without_burst(tmp_path):
+    folder = synthetic.make_product(str(tmp_path / 'S1_023790_IW1_20230621_20230703_VV_INT80'), '012_023790_IW1',
+                                    '20230621T121402', '20230703T121403', size=64)
+    with pytest.raises(ValueError, match='burst_id'):
+        stac.create_item(folder)
+
+
+def test_main_exits_on_failed_items(store, tmp_path):
+    product_dir, _ = store[1]
+    with open(os.path.join(product_dir, f'{os.path.basename(product_dir)}_unw_phase.tif'), 'w') as f:
+        f.write('not a GeoTIFF')
+    dest = str(tmp_path / 'catalog')
+    with pytest.raises(SystemExit) as e:
+        stac.main([str(tmp_path / 'store'), '--dest', dest, '--workers', '2'])
+    assert e.value.code == 1
+
+    failed = []
+    collection = stac.bulk(store, dest, workers=2, failed=failed)
+    assert [d for d, _ in failed] == [product_dir]
+    assert len(list(collection.get_links('item'))) == 2
@@ -0,0 +1,90 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+from fufiters import store
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+import synthetic  # noqa: E402
+
+BURST = '012_023790_IW1'
+
+
+@pytest.fixture
+def root(tmp_path):
+    """Local stand-in for s3://bucket with 4 products, the last one incomplete"""
+    folders = synthetic.make_store(str(tmp_path / 'bucket'), BURST, nproducts=4, size=32)
+    product = os.path.basename(folders[-1])
+    os.remove(os.path.join(folders[-1], f'{product}_unw_phase.tif'))
+    return str(tmp_path / 'bucket')
+
+
+def pair_table(names):
+    return pd.DataFrame(dict(burstId=BURST, name=names,
+                             reference=[f'S1A_IW_SLC__1SDV_{n[:8]}T121402' for n in names],
+                             secondary=[f'S1A_IW_SLC__1SDV_{n[9:]}T121403' for n in names]))
+
+
+def test_list_burst(root):
+    inventory = store.list_burst(root, BURST)
+    assert len(inventory) == 4
+    assert inventory.complete.sum() == 3
+    assert set(inventory.polarization) == {'VV'}
+    assert set(inventory.spacing) == {80}
+    assert len(store.list_burst(root, '001_000001_IW1')) == 0
+    assert len(store.list_burst(root, BURST, kind='offsets')) == 0
+
+
+def test_drop_existing(root):
+    inventory = store.load_inventory(root, [BURST])
+    names = sorted(inventory.name) + ['20190214_20190226']
+    table = pair_table(names)
+
+    todo = store.drop_existing(table, inventory, polarization='VV', looks='20x4')
+    # Incomplete product and new pair are planned
+    assert todo.name.tolist() == names[3:]
+    assert len(store.drop_existing(table, inventory, polarization='VH', looks='20x4')) == 5
+    assert len(store.drop_existing(table, inventory, polarization='VV', looks='10x2')) == 5
+    force = [names[0], f'{BURST}/{names[1]}']
+    todo = store.drop_existing(table, inventory, polarization='VV', looks='20x4', force=force)
+    assert todo.name.tolist() == names[:2] + names[3:]
+
+
+def test_cached_listing(root):
+    first = store.list_products(root, [BURST])
+    # Products uploaded after the listing are only seen once it is older than max_age
+    synthetic.make_store(root, BURST, nproducts=6, size=32)
+    assert len(store.list_products(root, [BURST])) == len(first)
+    assert len(store.list_products(root, [BURST], max_age=0)) == 6
+
+
+def test_manifest(root, tmp_path):
+    manifest = str(tmp_path / 'manifest.csv')
+    pd.DataFrame(dict(burstId=[BURST, '001_000001_IW1'],
+                      name=['20190101_20190113', '20190101_20190113'])).to_csv(manifest, index=False)
+    inventory = store.load_inventory(manifest, [BURST])
+    assert len(inventory) == 1 and inventory.complete.all()
+    assert len(store.drop_existing(pair_table(['20190101_20190113', '20190113_20190125']), inventory)) == 1
+
+
+def test_catalog(root, tmp_path):
+    from fufiters import catalog, stac
+
+    items = stac.create_items(stac.find_products(root), workers=2, failed=[])
+    catalog.write(str(tmp_path / 'inventory'), list(items))
+    assert store.is_catalog(str(tmp_path / 'inventory'))
+    assert not store.is_catalog(root)
+
+    inventory = store.load_inventory(str(tmp_path / 'inventory'), [BURST])
+    listed = store.load_inventory(root, [BURST])
+    columns = ['burstId', 'name', 'product', 'polarization', 'spacing']
+    assert (inventory.sort_values('name')[columns].reset_index(drop=True)
+            .equals(listed.sort_values('name')[columns].reset_index(drop=True)))
+    # Cataloged products count as complete, even the one missing its unwrapped phase in the store
+    assert inventory.complete.all()
+    table = pair_table(sorted(inventory.name) + ['20190214_20190226'])
+    assert store.drop_existing(table, inventory, polarization='VV', looks='20x4').name.tolist() == ['20190214_20190226']
+    assert len(store.load_inventory(str(tmp_path / 'inventory'), ['001_000001_IW1'])) == 0
+    assert len(store.load_inventory(str(tmp_path / 'inventory'), [BURST], kind='offsets')) == 0
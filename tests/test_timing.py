@@ -0,0 +1,48 @@
+from fufiters import timing
+
+LOG = '''\
+2024-02-14 18:00:00,000 - isce.topsinsar.runPreprocessor - INFO - Preprocessing reference
+2024-02-14 18:01:00,000 - isce.topsinsar.runTopo - INFO - Running topo
+2024-02-14 18:02:00,000 - isce.zerodop.topozero - INFO - Writing lat.rdr
+2024-02-14 18:05:00,000 - isce.topsinsar.runFineResamp - INFO - Resampling secondary
+2024-02-14 18:07:00,000 - isce.topsinsar.runESD - INFO - Estimating ESD offset
+2024-02-14 18:08:00,000 - isce.topsinsar.runFilter - INFO - Filtering interferogram
+2024-02-14 18:09:00,000 - isce.topsinsar.runUnwrap - INFO - Unwrapping filt_topophase.flat
+2024-02-14 18:12:00,000 - isce.contrib.snaphu - INFO - Running snaphu on filt_topophase.flat, in particular tile 1
+2024-02-14 18:14:00,000 - isce.topsinsar.runGeocode - INFO - Geocoding filt_topophase.unw
+2024-02-14 18:16:00,000 - isce.topsinsar.runGeocode - INFO - done
+'''
+
+
+def test_steps_by_component():
+    result = timing.parse_isce_log(LOG.splitlines())
+    assert result['start'] == '2024-02-14T18:00:00Z'
+    assert result['duration'] == 16 * 60
+    assert result['steps'] == dict(denseOffsets=0.0, ESD=60.0, coregistration=120.0, topo=240.0, filter=60.0,
+                                   unwrap=300.0, geocode=120.0, other=60.0)
+
+
+def test_keyword_fallback():
+    assert timing.parse_isce_log(['2024-02-14 18:00:00,000 - snaphu - INFO - tile 1',
+                                  '2024-02-14 18:01:00,000 - isce - INFO - done'])['steps']['unwrap'] == 60.0
+    # Words only containing a keyword do not match
+    assert timing._step(' - root - INFO - in particular filt_topophase.flat') is None
+    assert timing._step(' - isce.zerodop.geozero - INFO - geocoding') == 'geocode'
+
+
+def test_empty_log():
+    assert timing.parse_isce_log(['no timestamps']) is None
+
+
+def test_timings_table_namespaced_and_legacy():
+    result = timing.parse_isce_log(LOG.splitlines())
+    props = timing.processing_properties(result)
+    assert set(props) == {'processing:datetime', 'fufiters:duration', 'fufiters:steps'}
+    legacy = {'processing:datetime': result['start'], 'processing:duration': result['duration'],
+              'processing:steps': result['steps']}
+    items = [dict(id=f'S1_023790_IW1_20230621_20230703_VV_INT{spacing}', properties=dict(burstId='012_023790_IW1', **p))
+             for spacing, p in [(80, props), (40, legacy)]]
+    table = timing.timings_table(items + [dict(id='S1_023790_IW1_20230621_20230703_VV_INT20', properties={})])
+    assert table.looks.tolist() == ['20x4', '10x2']
+    assert table.total.tolist() == [16 * 60, 16 * 60]
+    assert table.unwrap.tolist() == [300.0, 300.0]